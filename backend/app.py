@@ -52,8 +52,9 @@ def dashboard_stats():
 def list_employees():
     return jsonify([])
 
-# RAG + chat orchestrator
-pipeline = RAGResumePipeline()
+# RAG + chat orchestrator (models/clients are shared via services/model_registry.py)
+from services.model_registry import get_pipeline, registry_metrics
+pipeline = get_pipeline()
 orchestrator = ChatOrchestrator()
 
 CURRENT_JD: Dict[str, Any] = {"text": ""}
@@ -579,7 +580,7 @@ def get_history(session_id):
 
 def handle_smart_rank(intent, session_id):
     """Smart ranking using the advanced screening algorithm"""
-    from services.smart_screening import smart_screen_candidate
+    from services.rank_cache import cached_shortlist
     
     sid = intent.get("sid")
     bucket = intent.get("bucket", "all")
@@ -604,117 +605,36 @@ def handle_smart_rank(intent, session_id):
                 "structured": {"type": "error"}
             })
         
-        jd_parsed = getattr(jd, "parsed", {}) or {}
-        if isinstance(jd_parsed, str):
-            try:
-                jd_parsed = json.loads(jd_parsed)
-            except Exception:
-                jd_parsed = {}
-        if not isinstance(jd_parsed, dict):
-            jd_parsed = {}
-
-        required_skills = jd_parsed.get("required_skills") or []
-        bonus_skills = jd_parsed.get("bonus_skills") or []
-
-        # Fallback: parse free-text skills column
-        if not required_skills:
-            skills_text = (getattr(jd, "skills", None) or "").strip()
-            if skills_text:
-                required_skills = [s.strip() for s in re.split(r"[,;\n]+", skills_text) if s.strip()]
-
-        # Build JD dict for screening
-        jd_dict = {
-            "required_skills": required_skills,
-            "bonus_skills": bonus_skills,
-            "competency": getattr(jd, 'competency', '') or "",
-            "designation": getattr(jd, 'designation', '') or "",
-            "job_description": getattr(jd, 'job_description', '') or "",
-        }
-        
-        # Query candidates with filters
-        query = Candidate.query
-        if bucket != "all":
-            query = query.filter(Candidate.role_bucket == bucket)
-        if bench_status == "on":
-            query = query.filter(Candidate.on_bench == True)
-        elif bench_status == "off":
-            query = query.filter(Candidate.on_bench == False)
-        
-        candidates = query.limit(50).all()
+        # Stored scores (jd_candidate_score); stale pairs are rescored first.
+        # Repeat requests are served from the ranking cache until data changes.
+        rows, total_candidates = cached_shortlist(
+            jd,
+            order="smart",
+            bucket=bucket if bucket != "all" else None,
+            on_bench={"on": True, "off": False}.get(bench_status),
+            limit=10,
+        )
         
-        if not candidates:
+        if not total_candidates:
             return jsonify({
                 "session_id": session_id or str(uuid.uuid4()),
                 "message": f"No candidates match filters for JD #{sid}",
                 "structured": {"type": "error"}
             })
         
-        # Score candidates using smart screening
-        rankings = []
-        for cand in candidates:
-            try:
-                cand_parsed = getattr(cand, "parsed", {}) or {}
-                if isinstance(cand_parsed, str):
-                    try:
-                        cand_parsed = json.loads(cand_parsed)
-                    except Exception:
-                        cand_parsed = {}
-                if not isinstance(cand_parsed, dict):
-                    cand_parsed = {}
-
-                skills = (
-                    getattr(cand, "skills", None)
-                    or cand_parsed.get("skills")
-                    or cand_parsed.get("technical_skills")
-                    or []
-                )
-                if isinstance(skills, str):
-                    skills = [s.strip() for s in re.split(r"[,;\n]+", skills) if s.strip()]
-
-                roles = (
-                    getattr(cand, "work_experiences", None)
-                    or cand_parsed.get("roles")
-                    or cand_parsed.get("work_experiences")
-                    or []
-                )
-
-                cand_dict = {
-                    "id": cand.id,
-                    "full_name": getattr(cand, 'full_name', f"Candidate {cand.id}"),
-                    "skills": skills or [],
-                    "roles": roles or [],
-                    "total_experience_years": getattr(cand, 'total_experience_years', 0) or 0,
-                }
-                
-                score_result = smart_screen_candidate(cand_dict, jd_dict)
-                rankings.append({
-                    "rank": 0,  # Will be set after sorting
-                    "candidate_id": cand.id,
-                    "candidate_name": score_result["candidate_name"],
-                    "score": score_result["final_score"],
-                    "reasoning": f"Tech: {score_result['tech_score']}%, Exp: {score_result['experience_score']}%, Matrix: {score_result['matrix_score']}%"
-                })
-            except Exception as e:
-                print(f"⚠️ Error scoring candidate {cand.id}: {e}")
-                continue
-        
-        # Sort and rank
-        rankings.sort(key=lambda x: x["score"], reverse=True)
-        for i, rank in enumerate(rankings[:15], 1):
-            rank["rank"] = i
-        
         jd_title = jd.designation or jd.competency or "JD"
 
-        rows = []
-        for r in rankings[:10]:
-            rows.append({
-                "rank": r.get("rank"),
+        rows = [
+            {
+                "rank": i,
                 "name": r.get("candidate_name") or "Unknown",
-                "score": r.get("score"),
+                "score": r.get("final_score"),
                 "experience": "",
                 "skills": "",
                 "reason": r.get("reasoning") or "",
-            })
+            }
+            for i, r in enumerate(rows, 1)
+        ]
 
         message = f"Top candidates for JD {jd.sid} ({jd_title})"
         return jsonify({
@@ -724,7 +644,7 @@ def handle_smart_rank(intent, session_id):
                 "type": "ranking",
                 "role": f"{jd.sid} - {jd_title}",
                 "rows": rows,
-                "total_candidates": len(candidates),
+                "total_candidates": total_candidates,
             }
         })
         
@@ -739,7 +659,9 @@ def handle_smart_rank(intent, session_id):
 
 def handle_candidate_rank(intent, session_id):
     """Rank all JDs against a single candidate (reverse ranking)"""
-    from services.smart_screening import smart_screen_candidate
+    from services.batch_screening import rank_jds
+    from services.candidate_features import features_for
+    from services.jd_profiles import JD_BUCKETS, open_profiles
     
     candidate_id = intent.get("candidate_id")
     bucket = intent.get("bucket", "all")
@@ -763,104 +685,43 @@ def handle_candidate_rank(intent, session_id):
                 "structured": {"type": "error"}
             })
         
-        cand_parsed = getattr(candidate, "parsed", {}) or {}
-        if isinstance(cand_parsed, str):
-            try:
-                cand_parsed = json.loads(cand_parsed)
-            except Exception:
-                cand_parsed = {}
-        if not isinstance(cand_parsed, dict):
-            cand_parsed = {}
-
-        cand_skills = (
-            getattr(candidate, "skills", None)
-            or cand_parsed.get("skills")
-            or cand_parsed.get("technical_skills")
-            or []
-        )
-        if isinstance(cand_skills, str):
-            cand_skills = [s.strip() for s in re.split(r"[,;\n]+", cand_skills) if s.strip()]
-
-        cand_roles = (
-            getattr(candidate, "work_experiences", None)
-            or cand_parsed.get("roles")
-            or cand_parsed.get("work_experiences")
-            or []
-        )
-
-        # Build candidate dict for screening
+        # Build candidate dict for screening from its stored features
+        features = features_for([candidate.id])[candidate.id]
         candidate_dict = {
             "id": candidate.id,
             "full_name": getattr(candidate, 'full_name', f"Candidate {candidate.id}"),
-            "skills": cand_skills or [],
-            "roles": cand_roles or [],
+            "skills": features["skills"],
+            "roles": features["roles"],
+            "features": features,
             "total_experience_years": getattr(candidate, 'total_experience_years', 0) or 0,
         }
         
-        # Query JDs with filters
-        query = JD.query
-        if bucket != "all":
-            # Filter JDs by competency/bucket if needed
-            if bucket == "data_scientist":
-                query = query.filter(JD.competency.ilike('%data scientist%'))
-            elif bucket == "data_practice":
-                query = query.filter(JD.competency.ilike('%data engineer%') | JD.competency.ilike('%data practice%'))
-        
-        jds = query.limit(50).all()
+        # Every open JD from the precompiled profile index; a bucket filter
+        # is a jd_profile_bucket lookup.
+        if bucket != "all" and bucket in JD_BUCKETS:
+            profiles = open_profiles(bucket)
+        else:
+            profiles = open_profiles()
         
-        if not jds:
+        if not profiles:
             return jsonify({
                 "session_id": session_id or str(uuid.uuid4()),
                 "message": f"No JDs match filters for candidate #{candidate_id}",
                 "structured": {"type": "error"}
             })
         
-        # Score JDs using smart screening (reversed)
+        # Score every JD in one batch (reversed smart screening), best first
         rankings = []
-        for jd in jds:
-            try:
-                jd_parsed = getattr(jd, "parsed", {}) or {}
-                if isinstance(jd_parsed, str):
-                    try:
-                        jd_parsed = json.loads(jd_parsed)
-                    except Exception:
-                        jd_parsed = {}
-                if not isinstance(jd_parsed, dict):
-                    jd_parsed = {}
-
-                required_skills = jd_parsed.get("required_skills") or []
-                bonus_skills = jd_parsed.get("bonus_skills") or []
-
-                if not required_skills:
-                    skills_text = (getattr(jd, "skills", None) or "").strip()
-                    if skills_text:
-                        required_skills = [s.strip() for s in re.split(r"[,;\n]+", skills_text) if s.strip()]
-
-                jd_dict = {
-                    "required_skills": required_skills,
-                    "bonus_skills": bonus_skills,
-                    "competency": getattr(jd, 'competency', '') or "",
-                    "designation": getattr(jd, 'designation', '') or "",
-                    "job_description": getattr(jd, 'job_description', '') or "",
-                }
-                
-                score_result = smart_screen_candidate(candidate_dict, jd_dict)
-                rankings.append({
-                    "rank": 0,  # Will be set after sorting
-                    "jd_id": jd.id,
-                    "jd_sid": getattr(jd, 'sid', f"JD{jd.id}"),
-                    "jd_title": score_result.get("jd_title", jd_dict["designation"]),
-                    "score": score_result["final_score"],
-                    "reasoning": f"Tech: {score_result['tech_score']}%, Exp: {score_result['experience_score']}%, Matrix: {score_result['matrix_score']}%"
-                })
-            except Exception as e:
-                print(f"⚠️ Error scoring JD {jd.id}: {e}")
-                continue
-        
-        # Sort and rank
-        rankings.sort(key=lambda x: x["score"], reverse=True)
-        for i, rank in enumerate(rankings[:15], 1):
-            rank["rank"] = i
+        for i, r in enumerate(rank_jds(candidate_dict, profiles, top_k=10), 1):
+            profile = profiles[r["jd_index"]]
+            rankings.append({
+                "rank": i,
+                "jd_id": profile["jd_id"],
+                "jd_sid": profile["sid"],
+                "jd_title": profile["designation"],
+                "score": r["final_score"],
+                "reasoning": f"Tech: {r['tech_score']}%, Exp: {r['experience_score']}%, Matrix: {r['matrix_score']}%"
+            })
         
         # Map to the same shape the frontend RankingTable expects.
         # We reuse structured.type='ranking' so MessageBubble renders RankingTable.
@@ -886,7 +747,7 @@ def handle_candidate_rank(intent, session_id):
                 "type": "ranking",
                 "role": f"JD fit for {candidate_dict['full_name']}",
                 "rows": rows,
-                "total_candidates": len(jds),
+                "total_candidates": len(profiles),
             }
         })
         
@@ -1146,6 +1007,7 @@ def chat():
             # Do not early-return a stub response here.
 
         # NORMAL ORCHESTRATOR FLOW (UNCHANGED)
+        # Per-request orchestrator is cheap: it reuses the shared pipeline/clients.
         orchestrator = ChatOrchestrator()
         response = orchestrator.handle_message(user_message, session_uuid=session_id)
 
@@ -1404,95 +1266,163 @@ def merge_candidates(existing: Candidate, new: Candidate) -> Candidate:
     
     return existing
 
+def _finalize_ingested_candidate(new_candidate: Candidate) -> dict:
+    """
+    Post-ingest step for a freshly stored candidate: merge into an existing
+    duplicate if there is one, then process/dedupe projects.
+    """
+    # ✅ CHECK FOR DUPLICATE CANDIDATE
+    existing_candidate = find_existing_candidate(new_candidate)
+
+    if existing_candidate:
+        print(f"\n🔍 DUPLICATE DETECTED: Found existing candidate '{existing_candidate.full_name}' (ID: {existing_candidate.id})")
+        print(f"   Merging with new data from upload...")
+
+        # Merge the candidates
+        merged_candidate = merge_candidates(existing_candidate, new_candidate)
+
+        # Delete the temporary new candidate
+        temp_candidate_id = new_candidate.id
+        try:
+            pipeline.vector_db.delete_candidate(new_candidate.id)
+        except Exception as e:
+            print(f"⚠️ Vector DB cleanup failed for {new_candidate.id} (non-critical): {e}")
+        db.session.delete(new_candidate)
+        db.session.commit()
+
+        # Use the existing candidate for project processing
+        candidate = merged_candidate
+        result = {
+            "candidate_id": candidate.id,
+            "full_name": candidate.full_name,
+            "outcome": "merged",
+            "message": f"Updated existing candidate with new information",
+            "projects_count": len((candidate.parsed or {}).get("projects", [])),
+            "experience_years": candidate.total_experience_years
+        }
+    else:
+        temp_candidate_id = None
+        candidate = new_candidate
+        result = {
+            "candidate_id": candidate.id,
+            "full_name": candidate.full_name,
+            "outcome": "new",
+            "projects_count": len((candidate.parsed or {}).get("projects", [])),
+            "experience_years": candidate.total_experience_years
+        }
+
+    # Process projects (works for both new and merged)
+    try:
+        if candidate.parsed and candidate.parsed.get("projects"):
+            print(f"📂 Processing projects for {candidate.full_name}")
+            process_and_save_projects(candidate)
+
+        # Run old deduplication for backward compatibility
+        deduplicate_candidate_projects(candidate)
+        print(f"✅ Deduplication complete for {candidate.full_name}")
+
+    except Exception as dedup_error:
+        print(f"⚠️ Project processing failed (non-critical): {dedup_error}")
+        import traceback
+        traceback.print_exc()
+
+    # Score against open JDs so rankings stay an indexed read
+    try:
+        from services.jd_shortlist import forget_candidates, refresh_candidates
+
+        if temp_candidate_id is not None:
+            forget_candidates([temp_candidate_id])
+        refresh_candidates([candidate.id])
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️ Shortlist refresh failed for {candidate.id} (non-critical): {e}")
+
+    return result
+
+@app.before_request
+def _ensure_ingest_worker():
+    """Resume draining the ingestion queue after a web-tier restart (INGEST_BROKER=inprocess)."""
+    from services.ingest_queue import ensure_inprocess_worker
+
+    ensure_inprocess_worker(app, lambda: pipeline, _finalize_ingested_candidate)
+
+@app.before_request
+def _ensure_vector_migration():
+    """Copy legacy vector stores into VECTOR_DB_PATH in the background (once per process)."""
+    from config.local_config import VECTOR_MIGRATE_ON_START
+    from services.vector_migration import start_background_migration
+
+    if VECTOR_MIGRATE_ON_START:
+        start_background_migration(app, lambda: pipeline)
+
+@app.before_request
+def _ensure_feature_backfill():
+    """Backfill missing or stale candidate features in the background (once per process)."""
+    from config.local_config import FEATURE_BACKFILL_ON_START
+    from services.candidate_features import start_background_backfill
+
+    if FEATURE_BACKFILL_ON_START:
+        start_background_backfill(app)
+
 @app.route("/api/upload-resumes", methods=["POST"])
 def upload_resumes():
-    """Upload resumes with candidate deduplication and automatic merging"""
+    """
+    Upload resumes with candidate deduplication and automatic merging.
+
+    Files are saved and queued as an ingestion job; the response is a job
+    handle (202) to poll at /api/ingest/jobs/<job_id>. Pass ?wait=1 to block
+    until every file has had one processing attempt.
+    """
+    from services.ingest_queue import drain_job, enqueue_uploads
+
     files = request.files.getlist("resumes")
     if not files:
         return jsonify({"error": "No files"}), 400
-    
-    results = []
-    
-    for file in files:
-        try:
-            fresh_pipeline = RAGResumePipeline()
-            candidate_id = str(uuid.uuid4())
-            
-            result = fresh_pipeline.process_resume(
-                file_obj=file,
-                candidate_id=candidate_id
-            )
-            
-            if result["success"]:
-                # Get the newly parsed candidate
-                new_candidate = db.session.get(Candidate, result["candidate_id"])
-                
-                if new_candidate:
-                    # ✅ CHECK FOR DUPLICATE CANDIDATE
-                    existing_candidate = find_existing_candidate(new_candidate)
-                    
-                    if existing_candidate:
-                        print(f"\n🔍 DUPLICATE DETECTED: Found existing candidate '{existing_candidate.full_name}' (ID: {existing_candidate.id})")
-                        print(f"   Merging with new data from upload...")
-                        
-                        # Merge the candidates
-                        merged_candidate = merge_candidates(existing_candidate, new_candidate)
-                        
-                        # Delete the temporary new candidate
-                        db.session.delete(new_candidate)
-                        db.session.commit()
-                        
-                        # Use the existing candidate for project processing
-                        candidate = merged_candidate
-                        
-                        results.append({
-                            "success": True,
-                            "candidate_id": candidate.id,
-                            "full_name": candidate.full_name,
-                            "status": "merged",
-                            "message": f"Updated existing candidate with new information",
-                            "projects_count": len(candidate.parsed.get("projects", [])),
-                            "experience_years": candidate.total_experience_years
-                        })
-                    else:
-                        candidate = new_candidate
-                        results.append({
-                            "success": True,
-                            "candidate_id": candidate.id,
-                            "full_name": candidate.full_name,
-                            "status": "new",
-                            "projects_count": len(result["parsed_data"].get("projects", [])),
-                            "experience_years": result["parsed_data"].get("total_experience_years", 0)
-                        })
-                    
-                    # Process projects (works for both new and merged)
-                    try:
-                        if candidate.parsed and candidate.parsed.get("projects"):
-                            print(f"📂 Processing projects for {candidate.full_name}")
-                            process_and_save_projects(candidate)
-                        
-                        # Run old deduplication for backward compatibility
-                        deduplicate_candidate_projects(candidate)
-                        print(f"✅ Deduplication complete for {candidate.full_name}")
-                        
-                    except Exception as dedup_error:
-                        print(f"⚠️ Project processing failed (non-critical): {dedup_error}")
-                        import traceback
-                        traceback.print_exc()
-            else:
-                results.append({"success": False, "error": result["error"]})
-                
-        except Exception as e:
-            print(f"Failed {file.filename}: {e}")
-            import traceback
-            traceback.print_exc()
-            results.append({"success": False, "filename": file.filename, "error": str(e)})
-    
-    return jsonify({
-        "successful": sum(1 for r in results if r.get("success")),
-        "failed": len(results) - sum(1 for r in results if r.get("success")),
-        "results": results
-    }), 200
+
+    wait = (request.args.get("wait") or "").lower() in ("1", "true", "yes")
+
+    job = enqueue_uploads(pipeline, files)
+    if wait:
+        drain_job(job.id, pipeline, on_candidate=_finalize_ingested_candidate)
+        db.session.refresh(job)
+
+    payload = job.to_dict()
+    payload["status_url"] = f"/api/ingest/jobs/{job.id}"
+    return jsonify(payload), (200 if wait else 202)
+
+@app.route("/api/ingest/jobs", methods=["GET"])
+def list_ingest_jobs():
+    """Most recent ingestion jobs (summary only)."""
+    from models import IngestionJob
+
+    limit = min(int(request.args.get("limit", 20)), 100)
+    jobs = IngestionJob.query.order_by(IngestionJob.created_at.desc()).limit(limit).all()
+    return jsonify({"jobs": [j.to_dict(include_items=False) for j in jobs]}), 200
+
+@app.route("/api/ingest/jobs/<string:job_id>", methods=["GET"])
+@app.route("/api/upload-resumes/<string:job_id>", methods=["GET"])
+def get_ingest_job(job_id: str):
+    """Per-file progress for an ingestion job."""
+    from models import IngestionJob
+
+    job = db.session.get(IngestionJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route("/api/ingest/jobs/<string:job_id>/retry", methods=["POST"])
+def retry_ingest_job(job_id: str):
+    """Requeue a job's failed items."""
+    from models import IngestionJob
+    from services.ingest_queue import retry_failed_items
+
+    job = db.session.get(IngestionJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    requeued = retry_failed_items(job)
+    payload = job.to_dict(include_items=False)
+    payload["requeued"] = requeued
+    return jsonify(payload), 200
 
 def deduplicate_candidate_projects(candidate: Candidate):
     """
@@ -1654,118 +1584,66 @@ def list_candidates():
     return jsonify({"candidates": [to_dict(c) for c in rows]}), 200
 
 
-def _dedupe_sorted_strings(values):
-    seen = set()
-    out = []
-    for v in values or []:
-        s = str(v or '').strip()
-        if not s:
-            continue
-        key = s.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(s)
-    out.sort(key=lambda x: x.lower())
-    return out
+@app.route("/api/filter-options", methods=["GET"])
+def filter_options():
+    """
+    Every filter option list in one read, from the facet tables
+    (services/facets.py). Query params: facets (comma-separated, default all),
+    q (key prefix), limit (top N per facet by candidate count).
+    """
+    from services.facets import FACETS, facet_etag, facet_options
+
+    facets = [f.strip() for f in (request.args.get("facets") or "").split(",") if f.strip()] or list(FACETS)
+    unknown = [f for f in facets if f not in FACETS]
+    if unknown:
+        return jsonify({"error": f"Unknown facets: {', '.join(unknown)}", "facets": list(FACETS)}), 400
+    limit = request.args.get("limit", type=int)
+    if limit is not None and limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
+    etag = facet_etag()
+    if etag is not None and request.if_none_match.contains(etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = jsonify({"facets": facet_options(facets, prefix=request.args.get("q"), limit=limit)})
+    if etag is not None:
+        resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+def _facet_values(facet):
+    """One facet's values, alphabetical, as the per-facet option endpoints return them."""
+    from services.facets import facet_options
+
+    values = [o["value"] for o in facet_options([facet])[facet]]
+    values.sort(key=lambda x: x.lower())
+    return values
 
 
 @app.route("/api/filter-options/projects", methods=["GET"])
 def filter_options_projects():
-    try:
-        from models import ProjectDB
-        rows = db.session.query(ProjectDB.name).filter(ProjectDB.name.isnot(None)).distinct().all()
-        names = [r[0] for r in rows if r and r[0]]
-        return jsonify(_dedupe_sorted_strings(names)), 200
-    except Exception:
-        # Fallback: extract from Candidate.projects JSON
-        rows = Candidate.query.with_entities(Candidate.projects).all()
-        names = []
-        for (projects,) in rows:
-            if not projects or not isinstance(projects, list):
-                continue
-            for p in projects:
-                if isinstance(p, dict):
-                    names.append(p.get('name') or '')
-                elif isinstance(p, str):
-                    names.append(p)
-        return jsonify(_dedupe_sorted_strings(names)), 200
+    return jsonify(_facet_values("project")), 200
 
 
 @app.route("/api/filter-options/skills", methods=["GET"])
 def filter_options_skills():
-    rows = Candidate.query.with_entities(Candidate.skills, Candidate.parsed).all()
-    skills = []
-    for cand_skills, parsed in rows:
-        if isinstance(cand_skills, list):
-            skills.extend([s for s in cand_skills if s])
-        if isinstance(parsed, dict):
-            ts = parsed.get('technical_skills') or parsed.get('skills') or []
-            if isinstance(ts, list):
-                skills.extend([s for s in ts if s])
-            elif isinstance(ts, str):
-                skills.extend([x.strip() for x in ts.split(',') if x.strip()])
-
-            # Also include skills from project tech stacks
-            projs = parsed.get('projects') or []
-            if isinstance(projs, list):
-                for p in projs:
-                    if not isinstance(p, dict):
-                        continue
-                    arr = (
-                        p.get('technical_tools')
-                        or p.get('technologies_used')
-                        or p.get('tools')
-                        or p.get('skills')
-                        or []
-                    )
-                    if isinstance(arr, list):
-                        skills.extend([x for x in arr if x])
-                    elif isinstance(arr, str):
-                        skills.extend([x.strip() for x in arr.split(',') if x.strip()])
-    return jsonify(_dedupe_sorted_strings(skills)), 200
+    return jsonify(_facet_values("skill")), 200
 
 
 @app.route("/api/filter-options/certifications", methods=["GET"])
 def filter_options_certifications():
-    rows = Candidate.query.with_entities(Candidate.certifications, Candidate.parsed).all()
-    certs = []
-    for cand_certs, parsed in rows:
-        if isinstance(cand_certs, list):
-            for c in cand_certs:
-                if not c:
-                    continue
-                if isinstance(c, dict):
-                    certs.append(c.get('name') or c.get('title') or '')
-                else:
-                    certs.append(c)
-        if isinstance(parsed, dict):
-            pc = parsed.get('certifications') or []
-            if isinstance(pc, list):
-                for c in pc:
-                    if not c:
-                        continue
-                    if isinstance(c, dict):
-                        certs.append(c.get('name') or c.get('title') or '')
-                    else:
-                        certs.append(c)
-            elif isinstance(pc, str):
-                certs.extend([x.strip() for x in pc.split(',') if x.strip()])
-    return jsonify(_dedupe_sorted_strings(certs)), 200
+    return jsonify(_facet_values("certification")), 200
 
 
 @app.route("/api/filter-options/buckets", methods=["GET"])
 def filter_options_buckets():
-    rows = Candidate.query.with_entities(Candidate.role_bucket).filter(Candidate.role_bucket.isnot(None)).distinct().all()
-    buckets = [r[0] for r in rows if r and r[0]]
-    return jsonify(_dedupe_sorted_strings(buckets)), 200
+    return jsonify(_facet_values("bucket")), 200
 
 
 @app.route("/api/filter-options/roles", methods=["GET"])
 def filter_options_roles():
-    rows = Candidate.query.with_entities(Candidate.primary_role).filter(Candidate.primary_role.isnot(None)).distinct().all()
-    roles = [r[0] for r in rows if r and r[0]]
-    return jsonify(_dedupe_sorted_strings(roles)), 200
+    return jsonify(_facet_values("role")), 200
 
 
 @app.route("/api/candidates/filter", methods=["POST"])
@@ -1781,6 +1659,21 @@ def candidates_filter_structured():
         return jsonify({"error": str(e)}), 400
 
 
+@app.route("/api/candidates/filter/facets", methods=["POST"])
+def candidates_filter_facets():
+    """Matched count and per-value facet counts for a structured filter request."""
+    data = request.get_json() or {}
+    try:
+        from services.candidate_filters import FACET_COUNT_LIMIT, structured_facet_counts
+        limit = int(data.pop("limit", None) or FACET_COUNT_LIMIT)
+        out = structured_facet_counts(data, limit=limit)
+        return jsonify(out), 200
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 400
+
+
 @app.route("/api/candidates/<int:cand_id>", methods=["DELETE", "OPTIONS"])
 @cross_origin()
 def delete_candidate(cand_id):
@@ -1839,6 +1732,13 @@ def delete_candidate(cand_id):
         db.session.delete(cand)
         db.session.commit()
 
+        try:
+            from services.jd_shortlist import forget_candidates
+            forget_candidates([cand_id])
+        except Exception as se:
+            db.session.rollback()
+            print(f"Warning: failed to drop stored JD scores for candidate {cand_id}: {se}")
+
         # Recompute contributor counts for affected projects
         try:
             for pid in set(affected_project_ids):
@@ -2038,7 +1938,8 @@ def _merge_lists(a, b):
 def _groq_json(prompt: str) -> Dict[str, Any]:
     if not GROQ_API_KEY:
         raise RuntimeError("GROQ_API_KEY missing")
-    client = Groq(api_key=GROQ_API_KEY)
+    from services.model_registry import get_groq_client
+    client = get_groq_client()
     resp = client.chat.completions.create(
         model="llama-3.3-70b-versatile",
         messages=[{"role": "user", "content": prompt}],
@@ -2358,6 +2259,9 @@ def reset_candidates():
         db.session.commit()
         print(f"Deleted {num_rows} candidates from SQL")
 
+        from services.jd_shortlist import forget_all
+        forget_all()
+
         try:
             pipeline.vector_db.clear_all()
             print("Cleared vector DB collection")
@@ -2371,10 +2275,11 @@ def reset_candidates():
 
 @app.route("/api/normalize-resumes", methods=["POST"])
 def normalize_resumes():
-    fresh_pipeline = RAGResumePipeline()
+    fresh_pipeline = pipeline
     rows = Candidate.query.all()
     results = {"updated": 0, "errors": 0}
 
+    updated_ids = []
     for c in rows:
         try:
             normalized = fresh_pipeline.dolphin_normalize_resume(c.raw_text or "")
@@ -2382,10 +2287,20 @@ def normalize_resumes():
             if parsed != c.parsed:
                 c.parsed = parsed
                 results["updated"] += 1
+                updated_ids.append(c.id)
         except:
             results["errors"] += 1
 
     db.session.commit()
+
+    # Features, stored scores and the ranking data version follow the new parses
+    if updated_ids:
+        try:
+            from services.jd_shortlist import refresh_candidates
+            refresh_candidates(updated_ids)
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ Shortlist refresh after normalize failed (non-critical): {e}")
     return jsonify({"message": f"âœ… Updated {results['updated']}/{len(rows)} resumes"}), 200
 
 @app.route("/api/candidate-buckets", methods=["GET"])
@@ -2417,6 +2332,9 @@ def classify_all_candidates():
             updated += 1
 
     db.session.commit()
+    if updated:
+        from services.rank_cache import bump_data_version
+        bump_data_version()
 
     return jsonify({
         "message": f"âœ… Classified {len(rows)} candidates, updated {updated}",
@@ -2442,6 +2360,14 @@ def update_bench(cand_id):
     cand.on_bench = on_bench
     db.session.add(cand)
     db.session.commit()
+
+    # The /api/llm-rank score includes a bench bonus
+    try:
+        from services.jd_shortlist import refresh_candidates
+        refresh_candidates([cand.id])
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️ Shortlist refresh failed for {cand.id} (non-critical): {e}")
     return jsonify({"id": cand.id, "on_bench": cand.on_bench}), 200
 
 @app.route('/api/chat-upload', methods=['POST'])
@@ -2632,6 +2558,9 @@ def create_jd_row():
     db.session.add(jd)
     db.session.commit()
 
+    from services.jd_profiles import refresh_jd_profiles
+    refresh_jd_profiles([jd.id])
+
     return list_jds()
 
 
@@ -2706,6 +2635,16 @@ def update_jd_row(sid: str):
     db.session.add(jd)
     db.session.commit()
 
+    from services.jd_profiles import refresh_jd_profiles
+    from services.rank_cache import bump_data_version
+    refresh_jd_profiles([jd.id])
+    bump_data_version()
+
+    # New skills: rescore this JD's stored rankings in the background
+    if "skills" in data:
+        from services.jd_shortlist import start_background_refresh
+        start_background_refresh(app, jd.id)
+
     return list_jds()
 
 @app.route("/api/debug/chroma", methods=["GET"])
@@ -2720,6 +2659,40 @@ def debug_chroma():
         info["error"] = str(e)
     return jsonify(info), 200
 
+@app.route("/api/debug/vector-store", methods=["GET"])
+def debug_vector_store():
+    """Configured path/metric/schema of the vector store and legacy migration progress."""
+    from services.vector_migration import migration_status
+
+    try:
+        return jsonify(migration_status(pipeline.vector_db)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/debug/models", methods=["GET"])
+def debug_models():
+    """Load time / lookup counts for shared models and clients."""
+    return jsonify(registry_metrics()), 200
+
+@app.route("/api/debug/parse-cache", methods=["GET"])
+def debug_parse_cache():
+    from services.groq_parser import parse_cache_stats
+
+    try:
+        return jsonify(parse_cache_stats()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/debug/rank-cache", methods=["GET"])
+def debug_rank_cache():
+    """Ranking cache entry count, hit ratio and current data version."""
+    from services.rank_cache import rank_cache_stats
+
+    try:
+        return jsonify(rank_cache_stats()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/api/projects/manage", methods=["POST"])
 def manage_project_team():
     """Add or remove a candidate from a project using proper database relationships."""
@@ -3153,77 +3126,50 @@ def get_candidate_projects_db(candidate_id):
 
 @app.route("/api/rebuild-chroma", methods=["POST"])
 def rebuild_chroma():
-    """Rebuild ChromaDB from current candidates in database"""
-    try:
-        # Import ChromaDB collection directly
-        import chromadb
-        from chromadb.config import Settings
-        
-        # Initialize ChromaDB client (match your existing setup)
-        chroma_client = chromadb.PersistentClient(
-            path="./chroma_db",
-            settings=Settings(anonymized_telemetry=False)
-        )
-        
-        # Get or create collection
-        collection = chroma_client.get_or_create_collection(
-            name="resumes",
-            metadata={"hnsw:space": "cosine"}
-        )
-        
-        # 1. Clear existing collection
+    """
+    Re-index the vector store from current candidates in database.
+
+    Incremental by default: only candidates whose embedded text or model
+    changed are re-embedded, and vectors of deleted candidates are removed.
+    ?full=1 drops everything and re-embeds all candidates.
+    ?wait=1 runs in the request instead of in the background (202 + status).
+    """
+    from services.incremental_indexer import reindex, reindex_status, start_background_reindex
+
+    full = request.args.get("full") == "1"
+    verify = request.args.get("verify") == "1"
+
+    if request.args.get("wait") == "1":
         try:
-            # Get all IDs first
-            all_ids = collection.get()['ids']
-            if all_ids:
-                collection.delete(ids=all_ids)
-                print(f"🧹 Cleared {len(all_ids)} documents from ChromaDB")
+            status = reindex(pipeline, full=full, verify=verify)
+        except RuntimeError as e:
+            return jsonify({"error": str(e), "status": reindex_status()}), 409
         except Exception as e:
-            print(f"⚠️ Collection was empty: {e}")
-        
-        # 2. Get all current candidates
-        from models import Candidate
-        candidates = Candidate.query.all()
-        
-        # 3. Re-add them to ChromaDB
-        from sentence_transformers import SentenceTransformer
-        embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-        
-        count = 0
-        for cand in candidates:
-            if cand.raw_text:
-                try:
-                    # Generate embedding
-                    embedding = embedding_model.encode(cand.raw_text).tolist()
-                    
-                    # Add to ChromaDB
-                    collection.add(
-                        ids=[f"resume_{cand.id}"],
-                        embeddings=[embedding],
-                        documents=[cand.raw_text],
-                        metadatas=[{
-                            "candidate_id": cand.id,
-                            "name": cand.full_name or "Unknown",
-                            "source": "resume"
-                        }]
-                    )
-                    count += 1
-                    print(f"✅ Added candidate {cand.id} - {cand.full_name}")
-                except Exception as e:
-                    print(f"❌ Failed to add {cand.id}: {e}")
-        
+            import traceback
+            print(f"❌ Error rebuilding ChromaDB: {e}")
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 500
         return jsonify({
             "success": True,
-            "message": f"✅ Rebuilt ChromaDB with {count} candidates",
-            "candidates_in_db": len(candidates),
-            "chunks_added": count
-        })
-        
-    except Exception as e:
-        import traceback
-        print(f"❌ Error rebuilding ChromaDB: {e}")
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+            "message": f"✅ Re-embedded {status['embedded']} of {status['scanned']} checked candidates",
+            "status": status,
+            "store": pipeline.vector_db.info(),
+        }), 200
+
+    if not start_background_reindex(app, lambda: pipeline, full=full, verify=verify):
+        return jsonify({"error": "A reindex is already running", "status": reindex_status()}), 409
+    return jsonify({
+        "success": True,
+        "message": "Reindex started",
+        "status_url": "/api/rebuild-chroma/status",
+        "status": reindex_status(),
+    }), 202
+
+@app.route("/api/rebuild-chroma/status", methods=["GET"])
+def rebuild_chroma_status():
+    from services.incremental_indexer import reindex_status
+
+    return jsonify(reindex_status()), 200
 
 @app.route("/api/upload-jds-csv", methods=["POST"])
 def upload_jds_csv():
@@ -3255,6 +3201,7 @@ def upload_jds_csv():
     
     created = 0
     skipped = 0
+    new_jds = []
     
     for index, row in df.iterrows():
         sid_raw = row.get("SID")
@@ -3289,11 +3236,16 @@ def upload_jds_csv():
         # Create JD with ALL fields
         jd = JD(**row.to_dict())
         db.session.add(jd)
+        new_jds.append(jd)
         created += 1
         print(f"DEBUG: Created JD {sid}")
     
     db.session.commit()
     print(f"DEBUG: FINAL: created={created}, skipped={skipped}, total={len(df)}")
+
+    # Compile the new JDs into the reverse-ranking profile index
+    from services.jd_profiles import refresh_jd_profiles
+    refresh_jd_profiles([jd.id for jd in new_jds])
     
     return jsonify({
         "created": created,
@@ -3301,15 +3253,25 @@ def upload_jds_csv():
         "total_rows": len(df),
     })
 
+LLM_RANK_MAX_TOP_K = 200
+
+
 @app.route("/api/llm-rank", methods=["POST"])
 def llm_rank_jd():
+    from services.rank_cache import cached_shortlist
+    
     data = request.json
     sid = data.get("sid")
     bucket = data.get("bucket", "all")
     bench_status = data.get("bench_status", "all")
+    try:
+        top_k = max(1, min(int(data.get("top_k", 10)), LLM_RANK_MAX_TOP_K))
+        offset = max(0, int(data.get("offset", 0)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k and offset must be integers"}), 400
     
     # 🐛 DEBUG LOGS
-    print(f"🤖 LLM-RANK CALLED: sid={sid}, bucket={bucket}, bench={bench_status}")
+    print(f"🤖 LLM-RANK CALLED: sid={sid}, bucket={bucket}, bench={bench_status}, top_k={top_k}, offset={offset}")
     
     # Fetch JD with ALL data
     jd = JD.query.filter_by(sid=sid).first()
@@ -3320,7 +3282,6 @@ def llm_rank_jd():
     jd_parsed = jd.parsed or {}
     required_skills = [s.lower().strip() for s in (jd_parsed.get("required_skills", []) or [])]
     bonus_skills = [s.lower().strip() for s in (jd_parsed.get("bonus_skills", []) or [])]
-    all_jd_skills = required_skills + bonus_skills
     
     # Full JD context for LLM
     jd_full_data = {
@@ -3339,221 +3300,42 @@ def llm_rank_jd():
         "account": jd.account or "",
     }
     
-    # Fetch filtered candidates
-    candidates = Candidate.query
-    
-    # Filter by bucket
+    # Stored scores (jd_candidate_score), read through the (jd_id, llm_score)
+    # index; candidates changed since they were scored are rescored first.
+    # Repeat requests are served from the ranking cache until data changes.
     if bucket != "all" and bucket != "both":
-        candidates = candidates.filter(Candidate.role_bucket == bucket)
         print(f"   ✅ Filtered by bucket: {bucket}")
+    on_bench = None
+    if bench_status == "on":
+        on_bench = True
+        print(f"   ✅ Filtered by bench: ON BENCH")
+    elif bench_status == "off":
+        on_bench = False
+        print(f"   ✅ Filtered by bench: ON PROJECT")
+    
+    rows, total_candidates = cached_shortlist(
+        jd,
+        order="llm",
+        bucket=bucket if bucket not in ("all", "both") else None,
+        on_bench=on_bench,
+        limit=top_k,
+        offset=offset,
+    )
+    print(f"📊 Found {total_candidates} candidates for ranking after filters")
     
-    # Filter by bench status (on_bench is boolean, not bench_status string)
-    if bench_status != "all" and bench_status != "both":
-        if bench_status == "on":
-            candidates = candidates.filter(Candidate.on_bench == True)
-            print(f"   ✅ Filtered by bench: ON BENCH")
-        elif bench_status == "off":
-            candidates = candidates.filter(Candidate.on_bench == False)
-            print(f"   ✅ Filtered by bench: ON PROJECT")
-    
-    candidates = candidates.all()  # Get all, not just 50
-    print(f"📊 Found {len(candidates)} candidates for ranking after filters")
-    
-    if not candidates:
+    if not total_candidates:
         return jsonify({"error": "No candidates found with these filters"}), 404
     
-    # Prepare FULL candidate data for scoring
-    candidate_full_data = []
-    for c in candidates:
-        parsed_c = c.parsed or {}
-        
-        # Extract ALL skills from multiple sources
-        skills_list = []
-        if parsed_c.get("technical_skills"):
-            skills_list.extend(parsed_c["technical_skills"])
-        if parsed_c.get("skills"):
-            skills_list.extend(parsed_c["skills"])
-        if c.skills:
-            skills_list.extend(c.skills if isinstance(c.skills, list) else [])
-        # Deduplicate and normalize
-        skills_list = [s.lower().strip() for s in skills_list if s]
-        skills_list = list(set(skills_list))
-        
-        # Extract ALL projects with full details
-        projects = parsed_c.get("projects", []) or []
-        if not projects and c.projects:
-            projects = c.projects if isinstance(c.projects, list) else []
-        
-        # Extract ALL work experiences with full details
-        work_experiences = parsed_c.get("work_experiences", []) or []
-        if not work_experiences and c.work_experiences:
-            work_experiences = c.work_experiences if isinstance(c.work_experiences, list) else []
-        
-        # Total experience
-        total_exp = (
-            parsed_c.get("total_experience_years")
-            or parsed_c.get("total_exp")
-            or c.total_experience_years
-            or 0.0
-        )
-        
-        # Bench status
-        bench_status_val = "bench" if (getattr(c, "on_bench", False) or getattr(c, "bench_status", "").lower() == "on") else "active"
-        
-        candidate_full_data.append({
-            "id": c.id,
-            "name": c.full_name or "Unknown",
-            "skills": skills_list,
-            "projects": projects,
-            "work_experiences": work_experiences,
-            "total_experience_years": float(total_exp),
-            "primary_role": c.primary_role or parsed_c.get("primary_role", ""),
-            "bench_status": bench_status_val,
-            "parsed": parsed_c,  # Full parsed data for reference
-        })
-    
-    def score_candidate(cand_data: dict) -> tuple[float, str]:
-        """
-        Advanced scoring prioritizing:
-        1. Skills match (primary, ~50%)
-        2. Relevant project experience where skills were used (~30%, counts more)
-        3. Work experience (~15%)
-        4. Bench status and other factors (~5%)
-        """
-        cand_skills = cand_data["skills"]
-        cand_projects = cand_data["projects"]
-        cand_work_exp = cand_data["work_experiences"]
-        total_exp = cand_data["total_experience_years"]
-        
-        # 1. SKILLS MATCH (Primary - 50 points max)
-        required_matches = sum(1 for skill in required_skills if any(skill in cs for cs in cand_skills))
-        bonus_matches = sum(1 for skill in bonus_skills if any(skill in cs for cs in cand_skills))
-        
-        # Weight required skills more than bonus
-        skills_score = min(50.0, (required_matches * 8.0) + (bonus_matches * 2.0))
-        skills_pct = (required_matches / len(required_skills)) * 100 if required_skills else 0
-        
-        # 2. RELEVANT PROJECT EXPERIENCE (30 points max - counts more!)
-        project_score = 0.0
-        relevant_projects = []
-        
-        for proj in cand_projects:
-            if not proj:
-                continue
-            
-            # Check if project uses JD skills
-            proj_techs = []
-            if isinstance(proj, dict):
-                proj_techs.extend(proj.get("technologies_used", []) or [])
-                proj_techs.extend(proj.get("technical_tools", []) or [])
-                proj_desc = (proj.get("description", "") or "").lower()
-                proj_name = (proj.get("name", "") or "").lower()
-            else:
-                continue
-            
-            # Normalize project techs
-            proj_techs = [t.lower().strip() for t in proj_techs if t]
-            
-            # Count how many JD skills appear in this project
-            project_skill_matches = 0
-            for jd_skill in all_jd_skills:
-                # Check in techs
-                if any(jd_skill in pt for pt in proj_techs):
-                    project_skill_matches += 1
-                # Check in description
-                elif jd_skill in proj_desc or jd_skill in proj_name:
-                    project_skill_matches += 1
-            
-            if project_skill_matches > 0:
-                # More matches = higher score, recent projects weighted more
-                project_value = min(10.0, project_skill_matches * 2.5)
-                project_score += project_value
-                relevant_projects.append({
-                    "name": proj.get("name", "Unknown"),
-                    "matches": project_skill_matches,
-                    "value": project_value
-                })
-        
-        project_score = min(30.0, project_score)  # Cap at 30
-        
-        # 3. WORK EXPERIENCE (15 points max)
-        work_exp_score = 0.0
-        relevant_work = []
-        
-        for work in cand_work_exp:
-            if not work or not isinstance(work, dict):
-                continue
-            
-            work_techs = []
-            work_techs.extend(work.get("technologies_used", []) or [])
-            work_techs.extend(work.get("technical_tools", []) or [])
-            work_techs.extend(work.get("skills", []) or [])
-            work_techs = [t.lower().strip() for t in work_techs if t]
-            
-            work_desc = (work.get("description", "") or "").lower()
-            work_title = (work.get("job_title", "") or work.get("title", "") or "").lower()
-            
-            # Count JD skill matches in work experience
-            work_skill_matches = sum(1 for jd_skill in all_jd_skills 
-                                    if any(jd_skill in wt for wt in work_techs) 
-                                    or jd_skill in work_desc 
-                                    or jd_skill in work_title)
-            
-            if work_skill_matches > 0:
-                work_value = min(5.0, work_skill_matches * 1.5)
-                work_exp_score += work_value
-                relevant_work.append({
-                    "company": work.get("company_name", "Unknown"),
-                    "title": work.get("job_title", "Unknown"),
-                    "matches": work_skill_matches
-                })
-        
-        work_exp_score = min(15.0, work_exp_score)  # Cap at 15
-        
-        # 4. EXPERIENCE YEARS BONUS (5 points max)
-        exp_bonus = min(5.0, total_exp * 0.5) if total_exp > 0 else 0.0
-        
-        # 5. BENCH STATUS (5 points)
-        bench_bonus = 5.0 if cand_data["bench_status"] == "bench" else 2.0
-        
-        # TOTAL SCORE
-        total_score = skills_score + project_score + work_exp_score + exp_bonus + bench_bonus
-        
-        # Build detailed reasoning
-        reason_parts = []
-        if required_matches > 0:
-            reason_parts.append(f"{required_matches}/{len(required_skills)} required skills ({skills_pct:.0f}%)")
-        if relevant_projects:
-            reason_parts.append(f"{len(relevant_projects)} relevant projects")
-        if relevant_work:
-            reason_parts.append(f"{len(relevant_work)} relevant work experiences")
-        if total_exp > 0:
-            reason_parts.append(f"{total_exp:.1f} yrs exp")
-        reason_parts.append(f"bench={cand_data['bench_status']}")
-        
-        reasoning = " | ".join(reason_parts) if reason_parts else "Limited match"
-        
-        return total_score, reasoning
-    
-    # Score all candidates
-    scored = []
-    for cand_data in candidate_full_data:
-        score, reasoning = score_candidate(cand_data)
-        scored.append({
-            "candidate_id": cand_data["id"],
-            "candidate_name": cand_data["name"],
-            "score": round(score, 1),
-            "reasoning": reasoning,
-        })
-    
-    # Sort by score descending
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    
-    # Assign ranks and take top 10
-    for i, r in enumerate(scored[:10], start=1):
-        r["rank"] = i
-    
-    rankings = scored[:10]
+    rankings = [
+        {
+            "candidate_id": r["candidate_id"],
+            "candidate_name": r["candidate_name"] or "Unknown",
+            "score": r["llm_score"],
+            "reasoning": r["llm_reasoning"],
+            "rank": rank,
+        }
+        for rank, r in enumerate(rows, start=offset + 1)
+    ]
     
     return jsonify({
         "jd": {
@@ -3564,7 +3346,9 @@ def llm_rank_jd():
             "location": jd.location_type
         },
         "rankings": rankings,
-        "total_candidates": len(candidates),
+        "total_candidates": total_candidates,
+        "top_k": top_k,
+        "offset": offset,
         "filters": {"bucket": bucket, "bench_status": bench_status},
         "success": True
     })
@@ -12,11 +12,60 @@ print("DEBUG GROQ_API_KEY length:", len(GROQ_API_KEY))
 
 # Local Storage
 PDF_STORAGE_PATH = "./data/resumes_pdf"
-VECTOR_DB_PATH = "./data/vector_db"
+VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH", "./data/vector_db")
 SQLITE_DB_PATH = "./data/resumes.db"
 
+# Vector store (services/vector_db.py). The distance metric is fixed when the
+# collection is created; changing it means a new collection name.
+VECTOR_COLLECTION = os.getenv("VECTOR_COLLECTION", "candidates")
+VECTOR_DISTANCE = os.getenv("VECTOR_DISTANCE", "cosine")  # cosine | l2 | ip
+# Copy pre-unification stores (chroma_db_v2, chroma_db) into VECTOR_DB_PATH
+# on a background thread after startup.
+VECTOR_MIGRATE_ON_START = os.getenv("VECTOR_MIGRATE_ON_START", "1") == "1"
+# Compute missing / stale candidate features (services/candidate_features.py)
+# on a background thread after startup.
+FEATURE_BACKFILL_ON_START = os.getenv("FEATURE_BACKFILL_ON_START", "1") == "1"
+
+# Local cache store (SQLite file shared by all worker processes)
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "./data/cache.sqlite")
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "1") == "1"
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "20000"))
+# Ranking results (services/rank_cache.py); keys carry the data version, the
+# TTL bounds staleness after writes that bypass the version bump
+RANK_CACHE_ENABLED = os.getenv("RANK_CACHE_ENABLED", "1") == "1"
+RANK_CACHE_MAX_ENTRIES = int(os.getenv("RANK_CACHE_MAX_ENTRIES", "2000"))
+RANK_CACHE_TTL_SECONDS = float(os.getenv("RANK_CACHE_TTL_SECONDS", "900"))
+
+# Skill ontology (services/skill_ontology.py)
+ONTOLOGY_PATH = os.getenv(
+    "ONTOLOGY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "docs", "ontology.json"),
+)
+
+# Certification catalog seed (services/cert_catalog.py)
+CERT_CATALOG_PATH = os.getenv(
+    "CERT_CATALOG_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "docs", "certifications.json"),
+)
+
 # Embedding Model
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))  # texts per forward pass
+
+# Bulk resume ingestion
+INGEST_PARSE_WORKERS = int(os.getenv("INGEST_PARSE_WORKERS", "4"))  # concurrent Groq parses
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "16"))  # resumes per embed/DB write batch
+
+# Ingestion job queue
+# "inprocess": the web process drains the job tables on a background thread.
+# "database" (alias "sqlite"): run `python ingest_worker.py` separately.
+INGEST_BROKER = os.getenv("INGEST_BROKER", "inprocess").lower()
+INGEST_CLAIM_SIZE = int(os.getenv("INGEST_CLAIM_SIZE", "32"))  # items claimed per worker round
+INGEST_POLL_SECONDS = float(os.getenv("INGEST_POLL_SECONDS", "2"))
+INGEST_LEASE_SECONDS = int(os.getenv("INGEST_LEASE_SECONDS", "900"))  # reclaim items from dead workers
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "5"))
+INGEST_RETRY_BASE_SECONDS = float(os.getenv("INGEST_RETRY_BASE_SECONDS", "10"))
+INGEST_RETRY_MAX_SECONDS = float(os.getenv("INGEST_RETRY_MAX_SECONDS", "600"))
 
 os.makedirs(PDF_STORAGE_PATH, exist_ok=True)
 os.makedirs(VECTOR_DB_PATH, exist_ok=True)
@@ -0,0 +1,19 @@
+"""
+Gunicorn settings picked up automatically by `cd backend && gunicorn app:app`.
+
+Set MODEL_WARMUP=1 to load the embedding model, Chroma and Groq clients in
+each worker right after fork, so the first chat/upload request does not pay
+the model load.
+"""
+import os
+
+
+def post_fork(server, worker):
+    if os.getenv("MODEL_WARMUP", "0") != "1":
+        return
+    from app import app
+    from services.model_registry import warm_up
+
+    with app.app_context():
+        result = warm_up()
+    server.log.info("Worker %s warm-up: %s", worker.pid, result)
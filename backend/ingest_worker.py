@@ -0,0 +1,41 @@
+"""
+Standalone ingestion worker.
+
+Drains the ingestion_job / ingestion_item tables when the web tier runs with
+INGEST_BROKER=database (or "sqlite"), so uploads survive web restarts and
+throughput does not depend on gunicorn workers.
+
+    cd backend && INGEST_BROKER=database python ingest_worker.py
+    cd backend && python ingest_worker.py --once     # drain due items and exit
+"""
+import argparse
+
+from app import app, pipeline, _finalize_ingested_candidate
+from services.ingest_queue import IngestWorker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume ingestion worker")
+    parser.add_argument("--once", action="store_true", help="process due items and exit")
+    args = parser.parse_args()
+
+    worker = IngestWorker(app, lambda: pipeline, _finalize_ingested_candidate)
+
+    if args.once:
+        total = 0
+        while True:
+            processed = worker.run_once()
+            if not processed:
+                break
+            total += processed
+        print(f"✅ Processed {total} item(s)")
+        return
+
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
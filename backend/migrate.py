@@ -1,3 +1,4 @@
+import click
 from flask import Flask
 from flask_migrate import Migrate
 from extensions import db
@@ -12,3 +13,21 @@ migrate = Migrate(app, db)
 @app.cli.command()
 def test():
     print("Migrations ready!")
+
+
+@app.cli.command("rebuild-search-index")
+@click.option("--reindex-only", is_flag=True, help="Reindex stored documents without recomputing them.")
+def rebuild_search_index(reindex_only):
+    """Recreate the full-text search index over candidate resumes."""
+    from services.fulltext import rebuild_search_index as rebuild
+    rebuild(recompute=not reindex_only)
+
+
+@app.cli.command("refresh-features")
+def refresh_features():
+    """Recompute missing and stale candidate features (the web app also does this after deploy)."""
+    from services.candidate_features import backfill_features
+
+    # Moves the data version per chunk; shortlists rescore on their next read.
+    done = backfill_features()
+    print(f"Refreshed features for {done} candidate(s).")
@@ -0,0 +1,59 @@
+"""filter facets
+
+Revision ID: 3f9b2d7e1c40
+Revises: a6d2f81c5e07
+Create Date: 2026-10-18 01:02:36.418290
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9b2d7e1c40'
+down_revision = 'a6d2f81c5e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    # Rows are written with candidate features (services/facets.py); the
+    # extractor version bump makes every record stale. The web app backfills
+    # them in the background after deploy (candidate_features.backfill_features,
+    # also `flask refresh-features`); reads scan candidates not reached yet.
+    existing_tables = set(insp.get_table_names())
+    if 'candidate_facet' not in existing_tables:
+        op.create_table('candidate_facet',
+        sa.Column('candidate_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('facet', sa.String(length=32), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('candidate_id', 'facet', 'key')
+        )
+        with op.batch_alter_table('candidate_facet', schema=None) as batch_op:
+            batch_op.create_index('ix_candidate_facet_facet_key', ['facet', 'key'], unique=False)
+
+    if 'filter_facet' not in existing_tables:
+        op.create_table('filter_facet',
+        sa.Column('facet', sa.String(length=32), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.Column('candidate_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('facet', 'key')
+        )
+        with op.batch_alter_table('filter_facet', schema=None) as batch_op:
+            batch_op.create_index('ix_filter_facet_facet_count', ['facet', 'candidate_count'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('filter_facet', schema=None) as batch_op:
+        batch_op.drop_index('ix_filter_facet_facet_count')
+
+    op.drop_table('filter_facet')
+    with op.batch_alter_table('candidate_facet', schema=None) as batch_op:
+        batch_op.drop_index('ix_candidate_facet_facet_key')
+
+    op.drop_table('candidate_facet')
@@ -0,0 +1,74 @@
+"""candidate skill and certification
+
+Revision ID: 5e81c3a7d420
+Revises: 9b3d6f0a2c71
+Create Date: 2026-10-17 20:31:09.614207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e81c3a7d420'
+down_revision = '9b3d6f0a2c71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'candidate_skill' not in existing_tables:
+        op.create_table('candidate_skill',
+        sa.Column('candidate_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('skill', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('candidate_id', 'skill')
+        )
+    if 'candidate_certification' not in existing_tables:
+        op.create_table('candidate_certification',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.Text(), nullable=True),
+        sa.Column('search_text', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    indexes = {ix.get('name') for ix in insp.get_indexes('candidate_skill')} if 'candidate_skill' in existing_tables else set()
+    with op.batch_alter_table('candidate_skill', schema=None) as batch_op:
+        if 'ix_candidate_skill_skill' not in indexes:
+            batch_op.create_index('ix_candidate_skill_skill', ['skill', 'candidate_id'], unique=False)
+
+    indexes = {ix.get('name') for ix in insp.get_indexes('candidate_certification')} if 'candidate_certification' in existing_tables else set()
+    with op.batch_alter_table('candidate_certification', schema=None) as batch_op:
+        if 'ix_candidate_certification_candidate_id' not in indexes:
+            batch_op.create_index(batch_op.f('ix_candidate_certification_candidate_id'), ['candidate_id'], unique=False)
+
+    # Substring certification search (LIKE '%...%') can use trigram indexes on Postgres.
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(
+            'CREATE INDEX IF NOT EXISTS ix_candidate_certification_search_trgm '
+            'ON candidate_certification USING gin (search_text gin_trgm_ops)'
+        )
+        op.execute(
+            'CREATE INDEX IF NOT EXISTS ix_candidate_certification_nospace_trgm '
+            "ON candidate_certification USING gin ((replace(search_text, ' ', '')) gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_candidate_certification_nospace_trgm')
+        op.execute('DROP INDEX IF EXISTS ix_candidate_certification_search_trgm')
+
+    with op.batch_alter_table('candidate_certification', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_candidate_certification_candidate_id'))
+    with op.batch_alter_table('candidate_skill', schema=None) as batch_op:
+        batch_op.drop_index('ix_candidate_skill_skill')
+
+    op.drop_table('candidate_certification')
+    op.drop_table('candidate_skill')
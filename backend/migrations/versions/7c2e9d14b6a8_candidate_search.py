@@ -0,0 +1,79 @@
+"""candidate search
+
+Revision ID: 7c2e9d14b6a8
+Revises: 5e81c3a7d420
+Create Date: 2026-10-17 22:12:47.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9d14b6a8'
+down_revision = '5e81c3a7d420'
+branch_labels = None
+depends_on = None
+
+SEARCH_FIELDS = ('summary', 'skills', 'projects', 'work', 'certifications', 'resume')
+FIELD_CLASSES = {'skills': 'A', 'certifications': 'A', 'projects': 'B', 'work': 'B', 'summary': 'C', 'resume': 'D'}
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'candidate_search' not in existing_tables:
+        op.create_table('candidate_search',
+        sa.Column('candidate_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('skills', sa.Text(), nullable=True),
+        sa.Column('projects', sa.Text(), nullable=True),
+        sa.Column('work', sa.Text(), nullable=True),
+        sa.Column('certifications', sa.Text(), nullable=True),
+        sa.Column('resume', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('candidate_id')
+        )
+
+    # Documents are written with candidate features (services/fulltext.py);
+    # `flask rebuild-search-index` fills them for existing candidates.
+    if bind.dialect.name == 'postgresql':
+        document = ' || '.join(
+            f"setweight(to_tsvector('simple', coalesce({f}, '')), '{FIELD_CLASSES[f]}')" for f in SEARCH_FIELDS
+        )
+        op.execute(
+            'ALTER TABLE candidate_search ADD COLUMN IF NOT EXISTS document tsvector '
+            f'GENERATED ALWAYS AS ({document}) STORED'
+        )
+        op.execute('CREATE INDEX IF NOT EXISTS ix_candidate_search_document ON candidate_search USING gin (document)')
+    elif bind.dialect.name == 'sqlite':
+        cols = ', '.join(SEARCH_FIELDS)
+        new = ', '.join(f'new.{f}' for f in SEARCH_FIELDS)
+        old = ', '.join(f'old.{f}' for f in SEARCH_FIELDS)
+        delete_old = (
+            f"INSERT INTO candidate_search_fts(candidate_search_fts, rowid, {cols}) "
+            f"VALUES ('delete', old.candidate_id, {old});"
+        )
+        insert_new = f'INSERT INTO candidate_search_fts(rowid, {cols}) VALUES (new.candidate_id, {new});'
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS candidate_search_fts USING fts5({cols}, "
+            "content='candidate_search', content_rowid='candidate_id', tokenize='unicode61 remove_diacritics 0')"
+        )
+        op.execute(f'CREATE TRIGGER IF NOT EXISTS candidate_search_ai AFTER INSERT ON candidate_search BEGIN {insert_new} END')
+        op.execute(f'CREATE TRIGGER IF NOT EXISTS candidate_search_ad AFTER DELETE ON candidate_search BEGIN {delete_old} END')
+        op.execute(
+            f'CREATE TRIGGER IF NOT EXISTS candidate_search_au AFTER UPDATE ON candidate_search BEGIN {delete_old} {insert_new} END'
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_candidate_search_document')
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ('candidate_search_au', 'candidate_search_ad', 'candidate_search_ai'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS candidate_search_fts')
+
+    op.drop_table('candidate_search')
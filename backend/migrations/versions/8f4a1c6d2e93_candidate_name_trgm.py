@@ -0,0 +1,43 @@
+"""candidate name trigram indexes
+
+Revision ID: 8f4a1c6d2e93
+Revises: 7c2e9d14b6a8
+Create Date: 2026-10-17 23:05:31.284460
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8f4a1c6d2e93'
+down_revision = '7c2e9d14b6a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fuzzy name / email lookup (services/name_index.py). SQLite keeps an
+    # in-process trigram index instead.
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(
+            'CREATE INDEX IF NOT EXISTS ix_candidate_full_name_trgm '
+            'ON candidate USING gin (lower(full_name) gin_trgm_ops)'
+        )
+        op.execute(
+            'CREATE INDEX IF NOT EXISTS ix_candidate_email_trgm '
+            'ON candidate USING gin (lower(email) gin_trgm_ops)'
+        )
+        op.execute(
+            'CREATE INDEX IF NOT EXISTS ix_candidate_email_local_trgm '
+            "ON candidate USING gin (lower(split_part(email, '@', 1)) gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_candidate_email_local_trgm')
+        op.execute('DROP INDEX IF EXISTS ix_candidate_email_trgm')
+        op.execute('DROP INDEX IF EXISTS ix_candidate_full_name_trgm')
@@ -0,0 +1,62 @@
+"""jd profile
+
+Revision ID: 9b3d6f0a2c71
+Revises: e2a7c5b81f34
+Create Date: 2026-10-17 19:05:37.402116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3d6f0a2c71'
+down_revision = 'e2a7c5b81f34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'jd_profile' not in existing_tables:
+        op.create_table('jd_profile',
+        sa.Column('jd_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('profile_version', sa.String(length=64), nullable=False),
+        sa.Column('is_open', sa.Boolean(), nullable=False),
+        sa.Column('designation', sa.String(length=255), nullable=True),
+        sa.Column('required_skills', sa.JSON(), nullable=True),
+        sa.Column('bonus_skills', sa.JSON(), nullable=True),
+        sa.Column('required_terms', sa.JSON(), nullable=True),
+        sa.Column('bonus_terms', sa.JSON(), nullable=True),
+        sa.Column('built_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('jd_id')
+        )
+    if 'jd_profile_bucket' not in existing_tables:
+        op.create_table('jd_profile_bucket',
+        sa.Column('bucket', sa.String(length=20), nullable=False),
+        sa.Column('jd_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.PrimaryKeyConstraint('bucket', 'jd_id')
+        )
+
+    indexes = {ix.get('name') for ix in insp.get_indexes('jd_profile')} if 'jd_profile' in existing_tables else set()
+    with op.batch_alter_table('jd_profile', schema=None) as batch_op:
+        if 'ix_jd_profile_is_open' not in indexes:
+            batch_op.create_index(batch_op.f('ix_jd_profile_is_open'), ['is_open'], unique=False)
+
+    indexes = {ix.get('name') for ix in insp.get_indexes('jd_profile_bucket')} if 'jd_profile_bucket' in existing_tables else set()
+    with op.batch_alter_table('jd_profile_bucket', schema=None) as batch_op:
+        if 'ix_jd_profile_bucket_jd_id' not in indexes:
+            batch_op.create_index(batch_op.f('ix_jd_profile_bucket_jd_id'), ['jd_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jd_profile_bucket', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_jd_profile_bucket_jd_id'))
+    with op.batch_alter_table('jd_profile', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_jd_profile_is_open'))
+
+    op.drop_table('jd_profile_bucket')
+    op.drop_table('jd_profile')
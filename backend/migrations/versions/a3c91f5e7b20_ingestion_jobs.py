@@ -0,0 +1,81 @@
+"""ingestion job queue
+
+Revision ID: a3c91f5e7b20
+Revises: dbc6b30937ef
+Create Date: 2026-10-17 10:12:41.532907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c91f5e7b20'
+down_revision = 'dbc6b30937ef'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'ingestion_job' not in existing_tables:
+        op.create_table('ingestion_job',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('source', sa.String(length=100), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'ingestion_item' not in existing_tables:
+        op.create_table('ingestion_item',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('filename', sa.String(length=500), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('max_attempts', sa.Integer(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('outcome', sa.String(length=20), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['ingestion_job.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    job_indexes = {ix.get('name') for ix in insp.get_indexes('ingestion_job')} if 'ingestion_job' in existing_tables else set()
+    if 'ix_ingestion_job_status' not in job_indexes:
+        with op.batch_alter_table('ingestion_job', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_ingestion_job_status'), ['status'], unique=False)
+
+    item_indexes = {ix.get('name') for ix in insp.get_indexes('ingestion_item')} if 'ingestion_item' in existing_tables else set()
+    with op.batch_alter_table('ingestion_item', schema=None) as batch_op:
+        for col in ('job_id', 'status', 'next_attempt_at'):
+            name = f'ix_ingestion_item_{col}'
+            if name not in item_indexes:
+                batch_op.create_index(batch_op.f(name), [col], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ingestion_item', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ingestion_item_next_attempt_at'))
+        batch_op.drop_index(batch_op.f('ix_ingestion_item_status'))
+        batch_op.drop_index(batch_op.f('ix_ingestion_item_job_id'))
+
+    with op.batch_alter_table('ingestion_job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ingestion_job_status'))
+
+    op.drop_table('ingestion_item')
+    op.drop_table('ingestion_job')
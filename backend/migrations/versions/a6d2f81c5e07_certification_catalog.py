@@ -0,0 +1,50 @@
+"""certification catalog
+
+Revision ID: a6d2f81c5e07
+Revises: 8f4a1c6d2e93
+Create Date: 2026-10-18 00:14:52.930177
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d2f81c5e07'
+down_revision = '8f4a1c6d2e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'certification' not in existing_tables:
+        op.create_table('certification',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('issuer', sa.String(length=255), nullable=True),
+        sa.Column('code', sa.String(length=32), nullable=True),
+        sa.Column('aliases', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+        )
+
+    # Links are filled as candidate features are recomputed (the feature
+    # version includes the catalog version).
+    columns = {c['name'] for c in insp.get_columns('candidate_certification')}
+    indexes = {ix.get('name') for ix in insp.get_indexes('candidate_certification')}
+    with op.batch_alter_table('candidate_certification', schema=None) as batch_op:
+        if 'certification_key' not in columns:
+            batch_op.add_column(sa.Column('certification_key', sa.String(length=255), nullable=True))
+        if 'ix_candidate_certification_certification_key' not in indexes:
+            batch_op.create_index(batch_op.f('ix_candidate_certification_certification_key'), ['certification_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('candidate_certification', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_candidate_certification_certification_key'))
+        batch_op.drop_column('certification_key')
+
+    op.drop_table('certification')
@@ -0,0 +1,45 @@
+"""candidate embedding fingerprints
+
+Revision ID: b7d24e9c1a53
+Revises: a3c91f5e7b20
+Create Date: 2026-10-17 13:40:07.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d24e9c1a53'
+down_revision = 'a3c91f5e7b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'candidate_embedding' not in existing_tables:
+        op.create_table('candidate_embedding',
+        sa.Column('candidate_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=200), nullable=True),
+        sa.Column('schema_version', sa.Integer(), nullable=True),
+        sa.Column('doc_count', sa.Integer(), nullable=True),
+        sa.Column('indexed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('candidate_id')
+        )
+
+    indexes = {ix.get('name') for ix in insp.get_indexes('candidate_embedding')} if 'candidate_embedding' in existing_tables else set()
+    if 'ix_candidate_embedding_indexed_at' not in indexes:
+        with op.batch_alter_table('candidate_embedding', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_candidate_embedding_indexed_at'), ['indexed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('candidate_embedding', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_candidate_embedding_indexed_at'))
+
+    op.drop_table('candidate_embedding')
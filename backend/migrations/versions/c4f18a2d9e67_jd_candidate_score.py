@@ -0,0 +1,56 @@
+"""jd candidate score
+
+Revision ID: c4f18a2d9e67
+Revises: b7d24e9c1a53
+Create Date: 2026-10-17 15:12:44.530917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f18a2d9e67'
+down_revision = 'b7d24e9c1a53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'jd_candidate_score' not in existing_tables:
+        op.create_table('jd_candidate_score',
+        sa.Column('jd_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('candidate_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('final_score', sa.Float(), nullable=True),
+        sa.Column('tech_score', sa.Float(), nullable=True),
+        sa.Column('experience_score', sa.Float(), nullable=True),
+        sa.Column('matrix_score', sa.Float(), nullable=True),
+        sa.Column('reasoning', sa.String(length=255), nullable=True),
+        sa.Column('llm_score', sa.Float(), nullable=True),
+        sa.Column('llm_reasoning', sa.Text(), nullable=True),
+        sa.Column('jd_fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('jd_id', 'candidate_id')
+        )
+
+    indexes = {ix.get('name') for ix in insp.get_indexes('jd_candidate_score')} if 'jd_candidate_score' in existing_tables else set()
+    with op.batch_alter_table('jd_candidate_score', schema=None) as batch_op:
+        if 'ix_jd_candidate_score_candidate_id' not in indexes:
+            batch_op.create_index(batch_op.f('ix_jd_candidate_score_candidate_id'), ['candidate_id'], unique=False)
+        if 'ix_jd_candidate_score_jd_final' not in indexes:
+            batch_op.create_index('ix_jd_candidate_score_jd_final', ['jd_id', 'final_score'], unique=False)
+        if 'ix_jd_candidate_score_jd_llm' not in indexes:
+            batch_op.create_index('ix_jd_candidate_score_jd_llm', ['jd_id', 'llm_score'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jd_candidate_score', schema=None) as batch_op:
+        batch_op.drop_index('ix_jd_candidate_score_jd_llm')
+        batch_op.drop_index('ix_jd_candidate_score_jd_final')
+        batch_op.drop_index(batch_op.f('ix_jd_candidate_score_candidate_id'))
+
+    op.drop_table('jd_candidate_score')
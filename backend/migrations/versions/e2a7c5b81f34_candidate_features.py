@@ -0,0 +1,40 @@
+"""candidate features
+
+Revision ID: e2a7c5b81f34
+Revises: c4f18a2d9e67
+Create Date: 2026-10-17 17:40:21.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c5b81f34'
+down_revision = 'c4f18a2d9e67'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    existing_tables = set(insp.get_table_names())
+    if 'candidate_features' not in existing_tables:
+        op.create_table('candidate_features',
+        sa.Column('candidate_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('feature_version', sa.String(length=64), nullable=False),
+        sa.Column('skills', sa.JSON(), nullable=True),
+        sa.Column('expanded_skills', sa.JSON(), nullable=True),
+        sa.Column('roles', sa.JSON(), nullable=True),
+        sa.Column('tenure', sa.JSON(), nullable=True),
+        sa.Column('llm', sa.JSON(), nullable=True),
+        sa.Column('terms', sa.JSON(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('candidate_id')
+        )
+
+
+def downgrade():
+    op.drop_table('candidate_features')
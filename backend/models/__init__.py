@@ -235,6 +235,299 @@ class ProjectMergeHistory(db.Model):
     target_project = db.relationship("ProjectDB", foreign_keys=[target_project_id])
 
 
+class IngestionJob(db.Model):
+    """One bulk resume upload; drained by the ingestion worker."""
+    __tablename__ = "ingestion_job"
+
+    id = db.Column(db.String(36), primary_key=True)  # uuid4
+    status = db.Column(db.String(20), default="queued", index=True)  # queued | running | completed | failed
+    source = db.Column(db.String(100), default="upload")
+    total = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    items = db.relationship(
+        "IngestionItem",
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="IngestionItem.id",
+    )
+
+    def to_dict(self, include_items: bool = True):
+        counts = {}
+        for item in self.items:
+            counts[item.status] = counts.get(item.status, 0) + 1
+        successful = counts.get("done", 0)
+        failed = counts.get("failed", 0)
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "source": self.source,
+            "total": self.total or len(self.items),
+            "successful": successful,
+            "failed": failed,
+            "pending": len(self.items) - successful - failed,
+            "counts": counts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if include_items:
+            data["results"] = [item.to_dict() for item in self.items]
+        return data
+
+
+class IngestionItem(db.Model):
+    """One file of an ingestion job, with its retry state."""
+    __tablename__ = "ingestion_item"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    job_id = db.Column(db.String(36), db.ForeignKey("ingestion_job.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = db.Column(db.String(500))
+    file_path = db.Column(db.String(500))
+    # queued | retry | parsing | parsed | saved | done | failed
+    status = db.Column(db.String(20), default="queued", index=True)
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=5)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    last_error = db.Column(db.Text)
+    locked_by = db.Column(db.String(100))
+    locked_at = db.Column(db.DateTime)
+    candidate_id = db.Column(db.Integer)
+    outcome = db.Column(db.String(20))  # new | merged
+    result = db.Column(db.JSON, default=dict)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    job = db.relationship("IngestionJob", back_populates="items")
+
+    def to_dict(self):
+        return {
+            **(self.result or {}),
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "attempts": self.attempts or 0,
+            "max_attempts": self.max_attempts,
+            "next_attempt_at": self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            "error": self.last_error,
+            "candidate_id": self.candidate_id,
+            "outcome": self.outcome,
+        }
+
+
+class CandidateEmbedding(db.Model):
+    """What is currently in the vector store for a candidate (services/incremental_indexer.py)."""
+    __tablename__ = "candidate_embedding"
+
+    # No FK: rows outlive their candidate until the orphan sweep removes the vectors.
+    candidate_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    fingerprint = db.Column(db.String(64), nullable=False)  # sha256 of model + schema + embedded texts
+    model = db.Column(db.String(200))
+    schema_version = db.Column(db.Integer)
+    doc_count = db.Column(db.Integer, default=0)
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {
+            "candidate_id": self.candidate_id,
+            "fingerprint": self.fingerprint,
+            "model": self.model,
+            "schema_version": self.schema_version,
+            "doc_count": self.doc_count,
+            "indexed_at": self.indexed_at.isoformat() if self.indexed_at else None,
+        }
+
+
+class JDCandidateScore(db.Model):
+    """Materialized JD x candidate ranking scores (services/jd_shortlist.py)."""
+    __tablename__ = "jd_candidate_score"
+    __table_args__ = (
+        db.Index("ix_jd_candidate_score_jd_final", "jd_id", "final_score"),
+        db.Index("ix_jd_candidate_score_jd_llm", "jd_id", "llm_score"),
+    )
+
+    # No FKs: rows of deleted candidates/JDs are dropped by the shortlist hooks
+    # and never returned by reads, which join the live tables.
+    jd_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    candidate_id = db.Column(db.Integer, primary_key=True, autoincrement=False, index=True)
+
+    # smart_screen_candidate (AIRANK); NULL where it cannot score the pair
+    final_score = db.Column(db.Float)
+    tech_score = db.Column(db.Float)
+    experience_score = db.Column(db.Float)
+    matrix_score = db.Column(db.Float)
+    reasoning = db.Column(db.String(255))
+
+    # services/llm_rank.py (/api/llm-rank)
+    llm_score = db.Column(db.Float)
+    llm_reasoning = db.Column(db.Text)
+
+    jd_fingerprint = db.Column(db.String(64), nullable=False)  # JD skills + scorer version
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "jd_id": self.jd_id,
+            "candidate_id": self.candidate_id,
+            "final_score": self.final_score,
+            "tech_score": self.tech_score,
+            "experience_score": self.experience_score,
+            "matrix_score": self.matrix_score,
+            "reasoning": self.reasoning,
+            "llm_score": self.llm_score,
+            "llm_reasoning": self.llm_reasoning,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
+
+
+class CandidateFeatures(db.Model):
+    """Derived per-candidate scoring and filter inputs (services/candidate_features.py)."""
+    __tablename__ = "candidate_features"
+
+    # No FK, like jd_candidate_score: the shortlist hooks drop deleted candidates' rows.
+    candidate_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    feature_version = db.Column(db.String(64), nullable=False)  # extractor + ontology + cert catalog
+
+    skills = db.Column(db.JSON)           # skill list smart screening reads
+    expanded_skills = db.Column(db.JSON)  # normalized + ontology-expanded, sorted
+    roles = db.Column(db.JSON)            # role timeline with parsed (unresolved) years
+    tenure = db.Column(db.JSON)           # role spans + end_date years; NULL if not batch-scorable
+    llm = db.Column(db.JSON)              # /api/llm-rank match input
+    terms = db.Column(db.JSON)            # candidate_filters terms
+
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "candidate_id": self.candidate_id,
+            "feature_version": self.feature_version,
+            "skills": self.skills,
+            "expanded_skills": self.expanded_skills,
+            "roles": self.roles,
+            "tenure": self.tenure,
+            "llm": self.llm,
+            "terms": self.terms,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
+
+
+class CandidateSkill(db.Model):
+    """Normalized skill terms per candidate, for indexed skill filters (candidate_features)."""
+    __tablename__ = "candidate_skill"
+    __table_args__ = (
+        db.Index("ix_candidate_skill_skill", "skill", "candidate_id"),
+    )
+
+    candidate_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    skill = db.Column(db.String(255), primary_key=True)
+
+
+class CandidateCertification(db.Model):
+    """One row per certification entry of a candidate (candidate_features)."""
+    __tablename__ = "candidate_certification"
+
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, nullable=False, index=True)
+    name = db.Column(db.Text)          # entry as stored (name, or the string itself)
+    search_text = db.Column(db.Text)   # normalize_cert_name of name / issuer / organization, "|"-joined
+    # Postgres also gets trigram GIN indexes on search_text (migration 5e81c3a7d420).
+    certification_key = db.Column(db.String(255), index=True)  # certification.key (cert_catalog)
+
+
+class Certification(db.Model):
+    """Catalog entry every linked certification resolves to (services/cert_catalog.py)."""
+    __tablename__ = "certification"
+
+    key = db.Column(db.String(255), primary_key=True)  # cert_key() of the canonical name
+    name = db.Column(db.String(255), nullable=False)
+    issuer = db.Column(db.String(255))
+    code = db.Column(db.String(32))   # exam code, seed entries only
+    aliases = db.Column(db.JSON)      # seed entries only
+
+
+class CandidateFacet(db.Model):
+    """Filter option values per candidate, for facet counts (services/facets.py)."""
+    __tablename__ = "candidate_facet"
+    __table_args__ = (
+        db.Index("ix_candidate_facet_facet_key", "facet", "key"),
+    )
+
+    candidate_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    facet = db.Column(db.String(32), primary_key=True)   # skill / certification / project / bucket / role
+    key = db.Column(db.String(255), primary_key=True)    # norm_text of value
+    value = db.Column(db.String(255), nullable=False)    # as written on the candidate
+
+
+class FilterFacet(db.Model):
+    """One filter option per (facet, key) with its candidate count (services/facets.py)."""
+    __tablename__ = "filter_facet"
+    __table_args__ = (
+        db.Index("ix_filter_facet_facet_count", "facet", "candidate_count"),
+    )
+
+    facet = db.Column(db.String(32), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    value = db.Column(db.String(255), nullable=False)
+    candidate_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class CandidateSearchDoc(db.Model):
+    """Per-section resume text for full-text search (services/fulltext.py)."""
+    __tablename__ = "candidate_search"
+
+    # Sections hold fulltext.search_tokens() output: lowercase tokens, space-joined.
+    # Indexed by the candidate_search_fts FTS5 table on SQLite and by a
+    # generated, GIN-indexed tsvector column on Postgres (migration 7c2e9d14b6a8).
+    candidate_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    summary = db.Column(db.Text)
+    skills = db.Column(db.Text)
+    projects = db.Column(db.Text)
+    work = db.Column(db.Text)
+    certifications = db.Column(db.Text)
+    resume = db.Column(db.Text)  # raw_text
+
+
+class JDProfile(db.Model):
+    """Precompiled JD scoring input for reverse ranking (services/jd_profiles.py)."""
+    __tablename__ = "jd_profile"
+
+    # No FK, like jd_candidate_score: reads join the live jds table.
+    jd_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    profile_version = db.Column(db.String(64), nullable=False)  # builder + ontology
+    is_open = db.Column(db.Boolean, nullable=False, default=True, index=True)
+    designation = db.Column(db.String(255))
+
+    required_skills = db.Column(db.JSON)  # as smart_screen_candidate reads them
+    bonus_skills = db.Column(db.JSON)
+    required_terms = db.Column(db.JSON)   # normalized, sorted; NULL if not batch-scorable
+    bonus_terms = db.Column(db.JSON)
+
+    built_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "jd_id": self.jd_id,
+            "profile_version": self.profile_version,
+            "is_open": self.is_open,
+            "designation": self.designation,
+            "required_skills": self.required_skills,
+            "bonus_skills": self.bonus_skills,
+            "required_terms": self.required_terms,
+            "bonus_terms": self.bonus_terms,
+            "built_at": self.built_at.isoformat() if self.built_at else None,
+        }
+
+
+class JDProfileBucket(db.Model):
+    """Role buckets a JD's competency falls in; keyed for bucket -> JD lookups."""
+    __tablename__ = "jd_profile_bucket"
+
+    bucket = db.Column(db.String(20), primary_key=True)
+    jd_id = db.Column(db.Integer, primary_key=True, autoincrement=False, index=True)
+
+
 # ✅ Chat models (keeping them here to avoid circular import)
 class ChatSession(db.Model):
     __tablename__ = "chat_sessions"
@@ -0,0 +1,408 @@
+"""
+Batch candidate x JD scoring for smart_screen_candidate.
+
+smart_screen_candidate scores one pair at a time and redoes all the
+candidate-side work (expand_skills, date parsing, recency weights) for every
+JD. Here each candidate is encoded once into a CandidatePool: rows of sparse
+incidence matrices over a shared skill vocabulary plus per-candidate
+constants. Scoring a JD against the whole pool is then a few sparse products:
+
+  tech        |expanded skills & required|, |... & bonus|     E @ Q.T, E @ B.T
+  experience  stickiness (per candidate) + substring relevance  A @ H
+  matrix      per-role relevance x recency, summed per cand.  G @ ((R @ Q.T) * w)
+              recency-weighted required/bonus skill hits        S @ (...)
+
+Sums run in the same order as the per-pair code and roundings match
+Python's round(), so scores are identical to smart_screen_candidate.
+Candidates or JDs with shapes the per-pair code trips over (non-string
+skills, non-dict roles, None skill lists, ...) are scored by
+smart_screen_candidate itself; pairs that raise there come back as NaN.
+
+    pool = CandidatePool(candidates)        # encode once ...
+    scores = pool.score(jds)                # ... score many JDs: BatchScores (n_cand, n_jd)
+    rank_candidates(candidates, jd)         # [{candidate_id, final_score, ...}], best first
+    rank_jds(candidate, jds)                # [{jd_index, final_score, ...}], best first
+
+JDs may carry precompiled "required_terms" / "bonus_terms" (jd_profile rows,
+services/jd_profiles.py); others are normalized here.
+
+Candidates carrying a stored candidate_features record under "features" are
+encoded from it (expanded skills, role recency and tenure are precomputed);
+plain dicts go through screen_features() first. Encodings are cached per
+candidate when callers pass cache keys that change with the candidate
+(e.g. (id, computed_at)).
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from services.candidate_features import screen_features
+from services.skill_ontology import normalize
+from services.smart_screening import smart_screen_candidate
+
+# JD columns scored per chunk; bounds the dense (roles x JDs) intermediates.
+JD_CHUNK_SIZE = 64
+ENCODING_CACHE_SIZE = 50000
+
+SCORE_KEYS = ("final_score", "tech_score", "experience_score", "matrix_score")
+
+_encoding_cache: "OrderedDict[Hashable, Optional[Dict]]" = OrderedDict()
+_encoding_lock = threading.Lock()
+
+
+class _TermIndex:
+    """Append-only, process-wide string -> column id map shared by all pools."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def ids_for(self, terms) -> np.ndarray:
+        out = []
+        for term in terms:
+            idx = self.ids.get(term)
+            if idx is None:
+                with self._lock:
+                    idx = self.ids.get(term)
+                    if idx is None:
+                        idx = self.ids[term] = len(self.terms)
+                        self.terms.append(term)
+            out.append(idx)
+        return np.array(out, dtype=np.int64)
+
+
+_skill_terms = _TermIndex()  # normalised / ontology-expanded skills
+_lower_terms = _TermIndex()  # lowercased raw skills (analyze_experience)
+
+# required skill (lowercased) -> (lower terms checked so far, ids that hit)
+_substring_hits: Dict[str, tuple] = {}
+_substring_lock = threading.Lock()
+
+
+def _substring_hit_ids(required: str) -> List[int]:
+    """Lowered skill ids that are a substring of, or contain, `required`."""
+    with _substring_lock:
+        checked, hits = _substring_hits.get(required, (0, []))
+        terms = _lower_terms.terms
+        if checked < len(terms):
+            hits = hits + [
+                i for i in range(checked, len(terms))
+                if required in terms[i] or terms[i] in required
+            ]
+            _substring_hits[required] = (len(terms), hits)
+        return hits
+
+
+class BatchScores:
+    """Score arrays of shape (n_candidates, n_jds); NaN where the per-pair code would raise."""
+
+    def __init__(self, n_candidates: int, n_jds: int):
+        shape = (n_candidates, n_jds)
+        self.final_score = np.full(shape, np.nan)
+        self.tech_score = np.full(shape, np.nan)
+        self.experience_score = np.full(shape, np.nan)
+        self.matrix_score = np.full(shape, np.nan)
+
+    def pair(self, i: int, j: int) -> Optional[Dict[str, float]]:
+        if np.isnan(self.final_score[i, j]):
+            return None
+        return {key: float(getattr(self, key)[i, j]) for key in SCORE_KEYS}
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    """
+    Elementwise round(v, 1) with Python's semantics. rint(10v)/10 agrees with
+    it except right at a .x5 tie, where 10v may have rounded across the
+    boundary; those few values go through round() itself.
+    """
+    scaled = values * 10
+    out = np.rint(scaled) / 10
+    with np.errstate(invalid="ignore"):
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        out[near_tie] = [round(v, 1) for v in values[near_tie].tolist()]
+    return out
+
+
+def _candidate_name(candidate: Dict[str, Any]) -> str:
+    return candidate.get("full_name") or candidate.get("name") or "Unknown"
+
+
+# ------------------------- ENCODING ------------------------- #
+
+def _encode_jd(jd: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # compute_matrix_score reads these without the `or []` guard.
+    required = jd.get("required_skills", [])
+    bonus = jd.get("bonus_skills", [])
+    if not isinstance(required, (list, tuple)) or not isinstance(bonus, (list, tuple)):
+        return None
+    if not all(isinstance(s, str) for s in list(required) + list(bonus)):
+        return None
+    # jd_profile rows carry the normalized terms precompiled.
+    required_terms = jd.get("required_terms")
+    bonus_terms = jd.get("bonus_terms")
+    return {
+        "required": set(required_terms) if required_terms is not None else {normalize(s) for s in required},
+        "bonus": set(bonus_terms) if bonus_terms is not None else {normalize(s) for s in bonus},
+        "required_lower": {s.lower() for s in required},
+        "required_len": len(required),
+    }
+
+
+def _encode_features(features: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Pool encoding of a candidate_features record (stored or screen_features())."""
+    tenure = features.get("tenure")
+    if tenure is None:
+        return None
+    skills = features["skills"]
+    roles = features["roles"]
+    return {
+        "n_skills": len(skills),
+        "has_roles": bool(roles),
+        "expanded": np.sort(_skill_terms.ids_for(features["expanded_skills"])),
+        "lower": _lower_terms.ids_for(s.lower() for s in skills),
+        "stickiness": tenure["stickiness_score"] if roles else 0.0,
+        "roles": [
+            (np.sort(_skill_terms.ids_for(role["expanded_skills"])), role["recency"])
+            for role in roles
+        ],
+        # compute_matrix_score's skill_scores is a dict keyed by the raw
+        # skill: one slot per distinct raw skill, in first-seen order.
+        "slots": _skill_terms.ids_for(normalize(s) for s in dict.fromkeys(skills)),
+        "skill_recency": tenure["skill_recency"] if skills else 0.0,
+    }
+
+
+def _encode_candidate(candidate: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """JD-independent features of one candidate, or None to use the per-pair path."""
+    features = candidate.get("features")
+    if features is None:
+        features = screen_features(candidate.get("skills") or [], candidate.get("roles") or [])
+    return _encode_features(features)
+
+
+def _cached_encoding(candidate: Dict[str, Any], key: Optional[Hashable]) -> Optional[Dict]:
+    if key is None:
+        return _encode_candidate(candidate)
+    with _encoding_lock:
+        if key in _encoding_cache:
+            _encoding_cache.move_to_end(key)
+            return _encoding_cache[key]
+    enc = _encode_candidate(candidate)
+    with _encoding_lock:
+        _encoding_cache[key] = enc
+        while len(_encoding_cache) > ENCODING_CACHE_SIZE:
+            _encoding_cache.popitem(last=False)
+    return enc
+
+
+def _csr(rows: List[np.ndarray], n_cols: int) -> sparse.csr_matrix:
+    """Binary CSR matrix from per-row column id arrays."""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows], out=indptr[1:])
+    indices = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    return sparse.csr_matrix(
+        (np.ones(len(indices)), indices, indptr), shape=(len(rows), max(n_cols, 1))
+    )
+
+
+def _grouping(counts: List[int]) -> sparse.csr_matrix:
+    """(n_groups x sum(counts)) CSR of ones mapping consecutive members to their group."""
+    indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    total = int(indptr[-1])
+    return sparse.csr_matrix(
+        (np.ones(total), np.arange(total), indptr), shape=(len(counts), max(total, 1))
+    )
+
+
+# ------------------------- POOL ------------------------- #
+
+class CandidatePool:
+    """Encoded candidates, reusable across any number of JDs."""
+
+    def __init__(self, candidates: Sequence[Dict[str, Any]], cache_keys: Optional[Sequence[Hashable]] = None):
+        self.candidates = list(candidates)
+        keys = list(cache_keys) if cache_keys is not None else [None] * len(self.candidates)
+        encodings = [_cached_encoding(c, k) for c, k in zip(self.candidates, keys)]
+        self.rows = [i for i, e in enumerate(encodings) if e is not None]
+        self.fallback = [i for i, e in enumerate(encodings) if e is None]
+        enc = [encodings[i] for i in self.rows]
+
+        # Every id in these encodings is below the current vocabulary size.
+        self.n_terms = len(_skill_terms)
+
+        self.expanded = _csr([e["expanded"] for e in enc], self.n_terms)
+        self.role_counts = np.array([len(e["roles"]) for e in enc], dtype=float)
+        self.role_inc = _csr([ids for e in enc for ids, _ in e["roles"]], self.n_terms)
+        self.role_recency = np.array([w for e in enc for _, w in e["roles"]], dtype=float)[:, None]
+        self.role_group = _grouping([len(e["roles"]) for e in enc])
+        slots = [e["slots"] for e in enc]
+        self.slot_inc = _csr([ids for row in slots for ids in row[:, None]], self.n_terms)
+        self.slot_recency = np.repeat(
+            np.array([e["skill_recency"] for e in enc], dtype=float), [len(row) for row in slots]
+        )[:, None]
+        self.slot_group = _grouping([len(row) for row in slots])
+
+        # Lowered skills, compacted to the ones present in this pool; repeats
+        # within a candidate are summed (analyze_experience counts them).
+        lower = [e["lower"] for e in enc]
+        all_lower = np.concatenate(lower) if lower else np.zeros(0, dtype=np.int64)
+        self.lower_ids, local = np.unique(all_lower, return_inverse=True)
+        indptr = np.zeros(len(lower) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in lower], out=indptr[1:])
+        self.lower_counts = sparse.csr_matrix(
+            (np.ones(len(local)), local, indptr), shape=(len(lower), max(len(self.lower_ids), 1))
+        )
+        self.lower_counts.sum_duplicates()
+
+        self.n_skills = np.array([e["n_skills"] for e in enc], dtype=float)[:, None]
+        self.has_roles = np.array([e["has_roles"] for e in enc])[:, None]
+        self.stickiness = np.array([e["stickiness"] for e in enc], dtype=float)[:, None]
+
+    def _hits_for(self, required_lower) -> np.ndarray:
+        """Which of the pool's lowered skills are a substring of, or contain, any required skill."""
+        hit = np.zeros(max(len(self.lower_ids), 1), dtype=bool)
+        for w in required_lower:
+            ids = np.array(_substring_hit_ids(w), dtype=np.int64)
+            pos = np.searchsorted(self.lower_ids, ids)
+            ok = pos < len(self.lower_ids)
+            ok[ok] = self.lower_ids[pos[ok]] == ids[ok]
+            hit[pos[ok]] = True
+        return hit
+
+    def _jd_matrix(self, term_sets) -> sparse.csr_matrix:
+        # Terms no pooled candidate has can never match; they only count in |set|.
+        rows = []
+        for terms in term_sets:
+            ids = [_skill_terms.ids.get(t) for t in terms]
+            rows.append(np.array([i for i in ids if i is not None and i < self.n_terms], dtype=np.int64))
+        return _csr(rows, self.n_terms)
+
+    def _score_block(self, jds: List[Dict]) -> Dict[str, np.ndarray]:
+        n_c = len(self.rows)
+        req = self._jd_matrix([jd["required"] for jd in jds])
+        bonus = self._jd_matrix([jd["bonus"] for jd in jds])
+        req_len = np.array([len(jd["required"]) for jd in jds], dtype=float)
+        bonus_len = np.array([len(jd["bonus"]) for jd in jds], dtype=float)
+
+        # ---- tech coverage (screening1.compute_tech_score) ----
+        with np.errstate(divide="ignore", invalid="ignore"):
+            req_cov = np.where(req_len > 0, (self.expanded @ req.T).toarray() / req_len, 0.0)
+            bonus_cov = np.where(bonus_len > 0, (self.expanded @ bonus.T).toarray() / bonus_len, 0.0)
+        tech = _round1(req_cov * 70 + bonus_cov * 30)
+
+        # ---- experience (screening2.analyze_experience) ----
+        # role_relevance counts candidate skills, repeats included.
+        hits = np.stack([self._hits_for(jd["required_lower"]) for jd in jds], axis=1).astype(float)
+        matches = self.lower_counts @ hits
+        jd_req_n = np.array([jd["required_len"] for jd in jds], dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relevance = _round1(np.minimum(100, (matches / jd_req_n) * 100))
+        relevance = np.where((self.n_skills > 0) & (jd_req_n > 0)[None, :], relevance, 50.0)
+        relevance = np.where(self.has_roles, relevance, 0.0)
+        experience = 0.6 * self.stickiness + 0.4 * relevance
+
+        # ---- matrix (screening3.compute_matrix_score) ----
+        if self.role_inc.shape[0]:
+            role_rel = ((self.role_inc @ req.T).toarray() / np.maximum(req_len, 1)) * 100
+            role_sum = self.role_group @ (role_rel * self.role_recency)
+        else:
+            role_sum = np.zeros((n_c, len(jds)))
+        total_role = role_sum / np.maximum(self.role_counts, 1)[:, None]
+
+        if self.slot_inc.shape[0]:
+            slot_req = (self.slot_inc @ req.T).toarray() > 0
+            slot_bonus = (self.slot_inc @ bonus.T).toarray() > 0
+            slot_values = np.where(
+                slot_req, self.slot_recency * 1.0, np.where(slot_bonus, self.slot_recency * 0.5, 0.0)
+            )
+            skill_sum = self.slot_group @ slot_values
+        else:
+            skill_sum = np.zeros((n_c, len(jds)))
+        total_skill = np.where(self.n_skills > 0, skill_sum / np.maximum(self.n_skills, 1), 0.0)
+        matrix = _round1(0.6 * total_role + 0.4 * total_skill)
+
+        final = 0.45 * tech + 0.30 * experience + 0.25 * matrix
+        return {
+            "final_score": _round1(final),
+            "tech_score": tech,
+            "experience_score": _round1(experience),
+            "matrix_score": matrix,
+        }
+
+    def score(self, jds: Sequence[Dict[str, Any]], jd_chunk_size: int = JD_CHUNK_SIZE) -> BatchScores:
+        """Score every pooled candidate against every JD ({"required_skills", "bonus_skills"})."""
+        jds = list(jds)
+        scores = BatchScores(len(self.candidates), len(jds))
+        enc_j = [_encode_jd(jd) for jd in jds]
+        ok_j = [j for j, e in enumerate(enc_j) if e is not None]
+
+        if self.rows:
+            rows = np.array(self.rows)[:, None]
+            for start in range(0, len(ok_j), jd_chunk_size):
+                cols = ok_j[start:start + jd_chunk_size]
+                block = self._score_block([enc_j[j] for j in cols])
+                for key in SCORE_KEYS:
+                    getattr(scores, key)[rows, np.array(cols)[None, :]] = block[key]
+
+        # Anything the encoders rejected goes through the per-pair code verbatim.
+        bad_j = [j for j, e in enumerate(enc_j) if e is None]
+        pairs = [(i, j) for i in self.fallback for j in range(len(jds))]
+        pairs += [(i, j) for i in self.rows for j in bad_j]
+        for i, j in pairs:
+            try:
+                result = smart_screen_candidate(self.candidates[i], jds[j])
+            except Exception as e:
+                print(f"⚠️ Error scoring candidate {self.candidates[i].get('id')}: {e}")
+                continue
+            for key in SCORE_KEYS:
+                getattr(scores, key)[i, j] = result[key]
+        return scores
+
+
+# ------------------------- RANKING ------------------------- #
+
+def score_pairs(candidates: Sequence[Dict[str, Any]], jds: Sequence[Dict[str, Any]],
+                cache_keys: Optional[Sequence[Hashable]] = None) -> BatchScores:
+    return CandidatePool(candidates, cache_keys).score(jds)
+
+
+def rank_candidates(candidates: Sequence[Dict[str, Any]], jd: Dict[str, Any],
+                    top_k: Optional[int] = None,
+                    cache_keys: Optional[Sequence[Hashable]] = None) -> List[Dict[str, Any]]:
+    """Candidates scored against one JD, best final_score first (ties keep input order)."""
+    scores = score_pairs(candidates, [jd], cache_keys)
+    results = []
+    for i, cand in enumerate(candidates):
+        pair = scores.pair(i, 0)
+        if pair is None:
+            continue
+        results.append({
+            "candidate_id": cand.get("id"),
+            "candidate_name": _candidate_name(cand),
+            **pair,
+        })
+    results.sort(key=lambda r: r["final_score"], reverse=True)
+    return results[:top_k] if top_k is not None else results
+
+
+def rank_jds(candidate: Dict[str, Any], jds: Sequence[Dict[str, Any]],
+             top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """JDs scored for one candidate, best final_score first; "jd_index" points into `jds`."""
+    scores = score_pairs([candidate], jds)
+    results = []
+    for j in range(len(jds)):
+        pair = scores.pair(0, j)
+        if pair is None:
+            continue
+        results.append({"jd_index": j, **pair})
+    results.sort(key=lambda r: r["final_score"], reverse=True)
+    return results[:top_k] if top_k is not None else results
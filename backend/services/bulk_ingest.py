@@ -0,0 +1,227 @@
+"""
+Bulk resume ingestion engine.
+
+Runs a batch of saved resume files through one shared RAGResumePipeline:
+
+  1. extract + Groq parse -> bounded worker pool (I/O bound, overlapped)
+  2. embeddings            -> one encode call per batch (CPU bound)
+  3. SQL insert            -> one commit per batch
+  4. vector DB             -> one chunked bulk upsert per batch
+  5. post-processing (dedupe/merge/projects) per candidate; a candidate
+     whose post-processing raises is deleted again before its item fails
+
+The engine does not own any job state. Progress is reported through a
+tracker (see services/ingest_queue.py) exposing:
+
+  tracker.items                      -> list of {"file_path": ...,
+                                        "candidate_id": ...}; items with a
+                                        candidate_id were stored by a worker
+                                        that stopped before finishing them
+                                        and are only finalized (step 5)
+  tracker.update_item(idx, **fields)
+  tracker.save_item(idx, **fields)   -> like update_item, but inside the open
+                                        transaction (no commit); False when
+                                        the claim was lost
+  tracker.fail_item(idx, error, retryable=False)
+  tracker.renew()                    -> extends the claim on the items still
+                                        held; returns their indexes
+
+The engine renews after every parse and batch flush, so a long round keeps
+its claim, and skips items whose claim another worker has taken over.
+
+Only the calling thread touches the tracker and the DB session; the pool
+threads just parse.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from config.local_config import INGEST_BATCH_SIZE, INGEST_PARSE_WORKERS
+from models import db
+
+
+def run_bulk_ingest(tracker, pipeline, on_candidate: Optional[Callable] = None):
+    """
+    Ingest every item of `tracker`. Must be called inside an app context.
+
+    `on_candidate(candidate)` runs after each candidate is stored and returns a
+    dict merged into the item (e.g. {"outcome": "merged", "candidate_id": ...}).
+    """
+    saved = [idx for idx, item in enumerate(tracker.items) if item.get("candidate_id")]
+    if saved:
+        _finish_saved(tracker, pipeline, saved, on_candidate)
+    pending = [idx for idx, item in enumerate(tracker.items) if not item.get("candidate_id")]
+    if not pending:
+        return
+
+    print(f"\n{'=' * 60}")
+    print(f"BULK INGEST: {len(pending)} resumes "
+          f"({INGEST_PARSE_WORKERS} parse workers, batch size {INGEST_BATCH_SIZE})")
+    print(f"{'=' * 60}\n")
+
+    workers = max(1, min(INGEST_PARSE_WORKERS, len(pending)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-parse") as pool:
+        futures = {}
+        for idx in pending:
+            tracker.update_item(idx, status="parsing")
+            futures[pool.submit(pipeline.parse_file, tracker.items[idx]["file_path"])] = idx
+
+        # Flush batches while the pool keeps parsing the rest.
+        ready = []
+        for fut in as_completed(futures):
+            idx = futures[fut]
+            try:
+                resume_text, parsed_data, _stats = fut.result()
+            except Exception as e:
+                tracker.fail_item(idx, e, retryable=True)
+                continue
+            tracker.update_item(idx, status="parsed")
+            if idx not in tracker.renew():
+                continue
+            ready.append((idx, resume_text, parsed_data))
+            if len(ready) >= INGEST_BATCH_SIZE:
+                _flush_batch(tracker, pipeline, ready, on_candidate)
+                tracker.renew()
+                ready = []
+        if ready:
+            _flush_batch(tracker, pipeline, ready, on_candidate)
+
+
+def _flush_batch(tracker, pipeline, ready, on_candidate):
+    """Embed, insert and index one batch of parsed resumes."""
+    held = tracker.renew()
+    ready = [r for r in ready if r[0] in held]
+    if not ready:
+        return
+    try:
+        embeddings = pipeline.embed_parsed_batch([parsed for _, _, parsed in ready])
+    except Exception as e:
+        for idx, _, _ in ready:
+            tracker.fail_item(idx, e, retryable=True)
+        return
+
+    # Embedding can be slow: renew again and drop items taken over meanwhile.
+    held = tracker.renew()
+    rows = []
+    for (idx, resume_text, parsed_data), emb in zip(ready, embeddings):
+        if idx not in held:
+            continue
+        try:
+            cand = pipeline.build_candidate(tracker.items[idx]["file_path"], resume_text, parsed_data)
+            rows.append((idx, cand, emb))
+        except Exception as e:
+            tracker.fail_item(idx, e)
+
+    if not rows:
+        return
+
+    try:
+        rows = _insert(tracker, rows)
+    except Exception as e:
+        # One bad row should not sink the batch: retry row by row.
+        print(f"⚠️ Batch insert failed ({e}); retrying per candidate")
+        db.session.rollback()
+        committed = []
+        for row in rows:
+            try:
+                committed.extend(_insert(tracker, [row]))
+            except Exception as row_error:
+                db.session.rollback()
+                tracker.fail_item(row[0], row_error, retryable=True)
+        rows = committed
+
+    # Vectors for the whole batch go in before post-processing, which may
+    # merge a candidate away and delete its vectors again.
+    try:
+        pipeline.store_vectors_batch([(cand, cand.parsed, emb) for _, cand, emb in rows])
+    except Exception as e:
+        print(f"⚠️ Vector DB add failed for batch (non-critical): {e}")
+    _finalize(tracker, pipeline, rows, on_candidate)
+
+
+def _finish_saved(tracker, pipeline, saved, on_candidate):
+    """Index and finalize candidates a stopped worker stored but did not finish."""
+    from models import Candidate
+
+    held = tracker.renew()
+    by_id = {tracker.items[idx]["candidate_id"]: idx for idx in saved if idx in held}
+    found = {c.id: c for c in Candidate.query.filter(Candidate.id.in_(list(by_id)))} if by_id else {}
+    rows = []
+    for cand_id, idx in by_id.items():
+        if cand_id not in found:
+            # Deleted, or merged away before the worker stopped: a retry parses the file again.
+            tracker.update_item(idx, candidate_id=None)
+            tracker.fail_item(idx, LookupError(f"Stored candidate {cand_id} no longer exists"))
+            continue
+        rows.append((idx, found[cand_id]))
+    if not rows:
+        return
+    print(f"↻ Finishing {len(rows)} candidate(s) stored by a stopped worker")
+
+    # Never "retry" these: that would parse and insert the file again. Missing
+    # vectors are picked up by the incremental reindex.
+    try:
+        embeddings = pipeline.embed_parsed_batch([cand.parsed or {} for _, cand in rows])
+        pipeline.store_vectors_batch([(cand, cand.parsed, emb) for (_, cand), emb in zip(rows, embeddings)])
+    except Exception as e:
+        print(f"⚠️ Vector DB add failed for recovered candidates (non-critical): {e}")
+    _finalize(tracker, pipeline, [(idx, cand, None) for idx, cand in rows], on_candidate)
+
+
+def _finalize(tracker, pipeline, rows, on_candidate):
+    """Post-process stored candidates and mark their items done."""
+    for idx, cand, _ in rows:
+        result = {}
+        if on_candidate:
+            cand_id = cand.id
+            try:
+                result = on_candidate(cand) or {}
+            except Exception as e:
+                db.session.rollback()
+                # The row and its vectors are committed already: drop them so
+                # a retry of the failed item does not leave an unmerged duplicate.
+                _discard_candidate(pipeline, cand_id)
+                tracker.update_item(idx, candidate_id=None)
+                tracker.fail_item(idx, e)
+                continue
+        tracker.update_item(idx, **{"outcome": "new", **result, "status": "done"})
+
+
+def _insert(tracker, rows):
+    """
+    Insert the candidates and mark their items "saved" with candidate_id in
+    one transaction, so a crash cannot leave a stored candidate whose item is
+    reclaimed and inserted again. Returns the rows committed.
+    """
+    db.session.add_all([cand for _, cand, _ in rows])
+    db.session.flush()
+    kept = []
+    for idx, cand, emb in rows:
+        if tracker.save_item(idx, status="saved", candidate_id=cand.id, full_name=cand.full_name):
+            kept.append((idx, cand, emb))
+        else:
+            # Claim lost since the last renew: the new owner inserts it.
+            db.session.delete(cand)
+    db.session.commit()
+    return kept
+
+
+def _discard_candidate(pipeline, cand_id: int):
+    """Delete a stored candidate whose post-processing failed, with its vectors and derived rows."""
+    from models import Candidate, CandidateProject
+    from services.jd_shortlist import forget_candidates
+    from services.rank_cache import bump_data_version
+
+    try:
+        pipeline.vector_db.delete_candidate(cand_id)
+    except Exception as e:
+        print(f"⚠️ Vector DB cleanup failed for {cand_id} (non-critical): {e}")
+    try:
+        CandidateProject.query.filter(CandidateProject.candidate_id == cand_id).delete(synchronize_session=False)
+        Candidate.query.filter(Candidate.id == cand_id).delete(synchronize_session=False)
+        forget_candidates([cand_id], commit=False)
+        db.session.commit()
+        bump_data_version()
+        print(f"   🗑️ Discarded candidate {cand_id} after failed post-processing")
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️ Could not discard candidate {cand_id}: {e}")
@@ -0,0 +1,685 @@
+"""
+Derived per-candidate features (candidate_features).
+
+Every ranking and filter path used to re-derive the same things from
+Candidate.parsed and the JSON columns: which skill list to trust, roles vs
+work_experiences, parse_date_flexible over every role, tenure and
+stickiness, project tech stacks. extract_features() does that once per
+candidate and the record is stored at ingest/edit time:
+
+  skills           the skill list smart screening reads
+  expanded_skills  its normalized + ontology-expanded set (sorted)
+  roles            role timeline: the role fields scoring reads, plus parsed
+                   start/end and end_date years and expanded skills
+  tenure           the role spans and end_date years tenure_stats() and skill
+                   recency read; NULL when the shapes are ones only the
+                   per-pair code handles (batch_screening)
+  llm              /api/llm-rank input: lowercased skills, per-project and
+                   per-role match texts, years, primary role
+  terms            candidate_filters terms: skills, project tech, project and
+                   work text, certifications, per-project tools
+
+Years are stored as parsed, with ongoing roles as screening2.PRESENT, so a
+record never depends on the date it was computed. Reads resolve them
+(resolve_features): per-role recency and the tenure stats / skill recency
+are worked out for the current year from the stored numbers, without
+re-parsing dates.
+
+Stored alongside each record, for filters that run in SQL:
+
+  candidate_skill          one row per distinct normalized skill term (skills,
+                           filter skill terms, project tech, role skills),
+                           indexed by (skill, candidate_id) for semi-joins
+  candidate_certification  one row per certification entry with its
+                           normalize_cert_name() search text, linked to its
+                           certification catalog key (services/cert_catalog)
+  candidate_search         per-section resume text for full-text search
+                           (services/fulltext), with raw_text
+  candidate_facet          filter option values (skills, certifications,
+                           projects, bucket, role); filter_facet counts are
+                           recounted for the values written or dropped
+                           (services/facets)
+
+A record is stale when it is missing, the candidate's updated_at is newer
+than computed_at, or feature_version() changed: the extractor version and the
+ontology and certification catalog versions. features_for() recomputes stale
+records before returning them. SQL reads of the child tables never refresh:
+the ingest / edit / delete hooks (services/jd_shortlist) keep records current,
+and backfill_features() recomputes missing and stale ones off the request
+path: on a background thread after deploy (start_background_backfill, from
+the first request) or `flask refresh-features`. Until every candidate has a
+record (features_pending), the child-table reads also scan the candidates
+without one (no_features) the way they did before these tables existed.
+"""
+import json
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import exists, or_
+from sqlalchemy.exc import IntegrityError
+
+from models import (
+    Candidate, CandidateCertification, CandidateFacet, CandidateFeatures, CandidateSearchDoc,
+    CandidateSkill, db,
+)
+from services.cert_catalog import CERT_CATALOG, record_certifications
+from services.facets import FACET_VALUE_MAX_LEN, forget_all_facets, held_facets, recount_facets
+from services.fulltext import search_document
+from services.llm_rank import candidate_data
+from services.screening2 import parse_year, raw_role_years, resolve_year, span_stats
+from services.screening3 import recency_from_end_years
+from services.skill_ontology import ONTOLOGY, expand_skills
+
+# Bump when extraction changes; every stored record becomes stale.
+FEATURE_EXTRACTOR_VERSION = 6
+FEATURE_CHUNK_SIZE = 500
+# candidate_skill.skill width; longer "skills" are free text, not filterable terms.
+SKILL_TERM_MAX_LEN = 255
+
+# Role fields the smart-screening code reads; the timeline keeps only these.
+ROLE_FIELDS = ("title", "company", "skills", "start_date", "end_date", "duration", "dates", "period")
+
+
+def feature_version() -> str:
+    return f"{FEATURE_EXTRACTOR_VERSION}-{ONTOLOGY.version}-{CERT_CATALOG.version}"
+
+
+def norm_text(s: str) -> str:
+    s = str(s or '').strip().lower()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+def _parsed(c) -> dict:
+    parsed = getattr(c, 'parsed', None) or {}
+    if isinstance(parsed, str):
+        try:
+            parsed = json.loads(parsed)
+        except Exception:
+            parsed = {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+# ------------------------- SMART SCREENING ------------------------- #
+
+def _timeline_entry(role, skills):
+    if not isinstance(role, dict):
+        return role
+    entry = {k: role[k] for k in ROLE_FIELDS if k in role}
+    try:
+        start, end = raw_role_years(role)
+        derived = {
+            "start_year": start,
+            "end_year": end,
+            "end_date_year": parse_year(role.get("end_date")),
+            "expanded_skills": sorted(expand_skills(role.get("skills", []) or skills or [])),
+        }
+    except Exception:
+        return entry
+    entry.update(derived)
+    return entry
+
+
+def _batchable(skills, roles) -> bool:
+    if not isinstance(skills, (list, tuple)) or not all(isinstance(s, str) for s in skills):
+        return False
+    return isinstance(roles, (list, tuple)) and all(isinstance(r, dict) for r in roles)
+
+
+def _stored_screen_features(skills, roles) -> Dict[str, Any]:
+    """screen_features() as stored: years unresolved."""
+    try:
+        expanded = sorted(expand_skills(skills))
+    except Exception:
+        expanded = None
+    timeline = [_timeline_entry(r, skills) for r in roles] if isinstance(roles, (list, tuple)) else roles
+
+    tenure = None
+    if _batchable(skills, roles) and all("end_date_year" in r for r in timeline):
+        try:
+            for role in roles:
+                role.get("title", "").lower()  # the per-pair code raises on non-str titles
+            tenure = {
+                "spans": [[r["start_year"], r["end_year"]] for r in timeline],
+                "end_date_years": [r["end_date_year"] for r in timeline],
+            }
+        except Exception:
+            tenure = None
+
+    return {"skills": skills, "expanded_skills": expanded, "roles": timeline, "tenure": tenure}
+
+
+def resolve_features(features: Dict[str, Any], current_year: Optional[int] = None) -> Dict[str, Any]:
+    """
+    A stored record as scoring reads it, ongoing roles resolved to
+    `current_year` (default: this year): each timeline role gets its
+    recency, and tenure becomes tenure_stats() plus skill recency.
+    """
+    current_year = current_year if current_year is not None else datetime.now().year
+    out = dict(features)
+    roles = features.get("roles")
+    if isinstance(roles, list):
+        out["roles"] = [
+            {**r, "recency": recency_from_end_years([r["end_date_year"]], current_year)}
+            if isinstance(r, dict) and "end_date_year" in r else r
+            for r in roles
+        ]
+    stored = features.get("tenure")
+    if stored is not None:
+        spans = [
+            (resolve_year(start, current_year), resolve_year(end, current_year))
+            for start, end in stored["spans"]
+        ]
+        out["tenure"] = {
+            **span_stats(spans, len(spans)),
+            "skill_recency": recency_from_end_years(stored["end_date_years"], current_year),
+        }
+    return out
+
+
+def screen_features(skills, roles) -> Dict[str, Any]:
+    """Smart-screening features of a skill list and role list (as smart_screen_candidate reads them)."""
+    return resolve_features(_stored_screen_features(skills, roles))
+
+
+def smart_inputs(c, parsed: dict):
+    """(skills, roles) smart screening uses: columns first, then the parsed keys."""
+    skills = c.skills or parsed.get("skills") or parsed.get("technical_skills") or []
+    if isinstance(skills, str):
+        skills = [s.strip() for s in re.split(r"[,;\n]+", skills) if s.strip()]
+    roles = c.work_experiences or parsed.get("roles") or parsed.get("work_experiences") or []
+    return skills or [], roles or []
+
+
+# ------------------------- FILTER TERMS ------------------------- #
+
+def _skill_terms(c, parsed: dict) -> List[str]:
+    skills: List[str] = []
+    if isinstance(getattr(c, 'skills', None), list):
+        skills = [str(s) for s in (c.skills or []) if s]
+
+    if not skills:
+        maybe = parsed.get('technical_skills') or parsed.get('skills') or parsed.get('primary_skills')
+        if isinstance(maybe, list):
+            skills = [str(s) for s in maybe if s]
+
+    return [norm_text(s) for s in skills if norm_text(s)]
+
+
+def _cert_terms(c, parsed: dict) -> List[str]:
+    certs: List[str] = []
+    if isinstance(getattr(c, 'certifications', None), list):
+        for item in c.certifications or []:
+            if isinstance(item, dict):
+                name = item.get('name')
+                if name:
+                    certs.append(str(name))
+            else:
+                certs.append(str(item))
+
+    if not certs:
+        raw2 = parsed.get('certifications')
+        if isinstance(raw2, list):
+            for item in raw2:
+                if isinstance(item, dict):
+                    name = item.get('name') or item.get('title')
+                    if name:
+                        certs.append(str(name))
+                else:
+                    certs.append(str(item))
+
+    return [norm_text(s) for s in certs if norm_text(s)]
+
+
+def _project_terms(c, parsed: dict) -> List[str]:
+    def _from(raw) -> List[str]:
+        out: List[str] = []
+        for p in raw:
+            if isinstance(p, dict):
+                for k in ['name', 'organization', 'role', 'description', 'contribution', 'impact']:
+                    v = p.get(k)
+                    if v:
+                        out.append(str(v))
+                tech = p.get('technical_tools') or p.get('technologies_used')
+                if isinstance(tech, list):
+                    out.extend([str(t) for t in tech if t])
+            else:
+                out.append(str(p))
+        return out
+
+    raw = getattr(c, 'projects', None)
+    projects = _from(raw) if isinstance(raw, list) else []
+    if not projects and isinstance(parsed.get('projects'), list):
+        projects = _from(parsed['projects'])
+
+    return [norm_text(s) for s in projects if norm_text(s)]
+
+
+def _tools(p: Any, order: Sequence[str]) -> List[str]:
+    if not isinstance(p, dict):
+        return []
+    arr = next((p.get(k) for k in order if p.get(k)), None) or []
+    if isinstance(arr, list):
+        return [str(x) for x in arr if x]
+    if isinstance(arr, str):
+        return [x.strip() for x in arr.split(',') if x.strip()]
+    return []
+
+
+def _project_tech_terms(c, parsed: dict) -> List[str]:
+    order = ('technical_tools', 'technologies_used', 'tools', 'skills')
+    techs: List[str] = []
+    for raw in (getattr(c, 'projects', None), parsed.get('projects')):
+        if isinstance(raw, list):
+            for p in raw:
+                techs.extend(_tools(p, order))
+    return [norm_text(t) for t in techs if norm_text(t)]
+
+
+def _project_tools(c) -> List[List[str]]:
+    """Per project (projects column), its normalized tools; skill proficiency counts these."""
+    raw = getattr(c, 'projects', None)
+    if not isinstance(raw, list):
+        return []
+    order = ('technical_tools', 'technologies_used', 'skills', 'tools')
+    return [[norm_text(t) for t in _tools(p, order)] for p in raw]
+
+
+def _work_terms(c, parsed: dict) -> List[str]:
+    def _from(raw) -> List[str]:
+        out: List[str] = []
+        for w in raw:
+            if isinstance(w, dict):
+                for k in ['company_name', 'job_title', 'location', 'start_date', 'end_date']:
+                    v = w.get(k)
+                    if v:
+                        out.append(str(v))
+                tech = w.get('technologies_used')
+                if isinstance(tech, list):
+                    out.extend([str(t) for t in tech if t])
+                resp = w.get('responsibilities')
+                if isinstance(resp, list):
+                    out.extend([str(r) for r in resp if r])
+            else:
+                out.append(str(w))
+        return out
+
+    raw = getattr(c, 'work_experiences', None)
+    work = _from(raw) if isinstance(raw, list) else []
+    if not work and isinstance(parsed.get('work_experiences'), list):
+        work = _from(parsed['work_experiences'])
+
+    return [norm_text(s) for s in work if norm_text(s)]
+
+
+def filter_terms(c, parsed: dict) -> Dict[str, list]:
+    return {
+        "skills": _skill_terms(c, parsed),
+        "project_tech": _project_tech_terms(c, parsed),
+        "projects": _project_terms(c, parsed),
+        "certifications": _cert_terms(c, parsed),
+        "work": _work_terms(c, parsed),
+        "project_tools": _project_tools(c),
+    }
+
+
+# ------------------------- CHILD TABLES ------------------------- #
+
+def skill_terms(features: Dict[str, Any]) -> List[str]:
+    """Distinct normalized skill terms of a feature record (candidate_skill rows)."""
+    terms = features.get("terms") or {}
+    values: List[Any] = []
+    if isinstance(features.get("skills"), (list, tuple)):
+        values.extend(features["skills"])
+    values.extend(terms.get("skills") or [])
+    values.extend(terms.get("project_tech") or [])
+    if isinstance(features.get("roles"), list):
+        for role in features["roles"]:
+            if isinstance(role, dict) and isinstance(role.get("skills"), list):
+                values.extend(role["skills"])
+    out = {norm_text(v) for v in values if isinstance(v, str)}
+    return sorted(t for t in out if t and len(t) <= SKILL_TERM_MAX_LEN)
+
+
+def normalize_cert_name(cert_name: str) -> str:
+    """Certification text as certification matching compares it."""
+    if not cert_name:
+        return ""
+    # Remove extra spaces, convert to lowercase, remove special chars for comparison
+    normalized = " ".join(cert_name.lower().split())
+    # Remove common words
+    normalized = re.sub(r'\b(the|a|an|certification|certificate|certified)\b', '', normalized, flags=re.IGNORECASE)
+    return " ".join(normalized.split())
+
+
+def cert_entries(c, parsed: dict) -> List[Tuple[Optional[str], Optional[str], str]]:
+    """(name, issuer, search text) per certification entry, from every source certification answers read."""
+    items: List[Any] = []
+    for raw in (parsed.get("certifications"), parsed.get("certificate"), getattr(c, "certifications", None)):
+        if raw:
+            items.extend(raw if isinstance(raw, list) else [raw])
+    out = []
+    for item in items:
+        if isinstance(item, dict):
+            name = item.get("name")
+            issuer = item.get("issuer") or item.get("issued_by") or item.get("organization")
+            fields = [name, item.get("issuer"), item.get("organization")]
+        else:
+            name = item
+            issuer = None
+            fields = [item]
+        search_text = "|".join(normalize_cert_name(str(f)) for f in fields if f)
+        out.append((str(name) if name is not None else None, str(issuer) if issuer else None, search_text))
+    return out
+
+
+def _split(value: Any) -> List[Any]:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [x.strip() for x in value.split(',') if x.strip()]
+    return []
+
+
+def facet_values(c, parsed: dict) -> Dict[str, Dict[str, str]]:
+    """Filter option values per facet, {norm_text key: value as first written} (candidate_facet rows)."""
+    raw: Dict[str, List[Any]] = {"skill": [], "certification": [], "project": [], "bucket": [], "role": []}
+    if isinstance(getattr(c, 'skills', None), list):
+        raw["skill"].extend(c.skills)
+    raw["skill"].extend(_split(parsed.get('technical_skills') or parsed.get('skills')))
+    if isinstance(parsed.get('projects'), list):
+        for p in parsed['projects']:
+            raw["skill"].extend(_tools(p, ('technical_tools', 'technologies_used', 'tools', 'skills')))
+
+    for source in (getattr(c, 'certifications', None), parsed.get('certifications')):
+        for item in _split(source):
+            raw["certification"].append((item.get('name') or item.get('title')) if isinstance(item, dict) else item)
+
+    for source in (getattr(c, 'projects', None), parsed.get('projects')):
+        for p in source if isinstance(source, list) else []:
+            raw["project"].append(p.get('name') if isinstance(p, dict) else p)
+
+    raw["bucket"].append(getattr(c, 'role_bucket', None))
+    raw["role"].append(getattr(c, 'primary_role', None))
+
+    out: Dict[str, Dict[str, str]] = {}
+    for facet, values in raw.items():
+        kept: Dict[str, str] = {}
+        for v in values:
+            if not v or isinstance(v, (dict, list)):
+                continue
+            value = str(v).strip()
+            key = norm_text(value)
+            if key and len(value) <= FACET_VALUE_MAX_LEN:
+                kept.setdefault(key, value)
+        out[facet] = kept
+    return out
+
+
+def search_sections(c, parsed: dict, features: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Raw text per full-text search section (candidate_search)."""
+    terms = features.get("terms") or {}
+    summary = [getattr(c, "primary_role", None), getattr(c, "primary_domain", None)]
+    summary += [parsed.get(k) for k in ("summary", "professional_summary", "experience_summary")]
+    return {
+        "summary": [s for s in summary if isinstance(s, str)],
+        "skills": skill_terms(features) + list(features.get("expanded_skills") or []),
+        "projects": (terms.get("projects") or []) + (terms.get("project_tech") or []),
+        "work": terms.get("work") or [],
+        "certifications": terms.get("certifications") or [],
+        "resume": [getattr(c, "raw_text", None) or ""],
+    }
+
+
+# ------------------------- EXTRACTION ------------------------- #
+
+def extract_features(c) -> Dict[str, Any]:
+    """Every derived feature of one Candidate (JSON-serializable)."""
+    parsed = _parsed(c)
+    features = _stored_screen_features(*smart_inputs(c, parsed))
+    try:
+        features["llm"] = candidate_data(c, parsed)
+    except Exception as e:
+        print(f"⚠️ llm-rank features failed for candidate {c.id}: {e}")
+        features["llm"] = None
+    features["terms"] = filter_terms(c, parsed)
+    return features
+
+
+def _forget_children(ids) -> set:
+    """Delete the candidates' child rows; returns the (facet, key) pairs they held."""
+    facets = held_facets(ids)
+    CandidateFacet.query.filter(CandidateFacet.candidate_id.in_(ids)).delete(synchronize_session=False)
+    CandidateSkill.query.filter(CandidateSkill.candidate_id.in_(ids)).delete(synchronize_session=False)
+    CandidateCertification.query.filter(
+        CandidateCertification.candidate_id.in_(ids)
+    ).delete(synchronize_session=False)
+    CandidateSearchDoc.query.filter(CandidateSearchDoc.candidate_id.in_(ids)).delete(synchronize_session=False)
+    return facets
+
+
+def _store(candidates, version: str, computed_at: datetime) -> Dict[int, Dict]:
+    """Extract and upsert features and child rows for loaded Candidates (no commit)."""
+    ids = [c.id for c in candidates]
+    existing = {
+        f.candidate_id: f
+        for f in CandidateFeatures.query.filter(CandidateFeatures.candidate_id.in_(ids))
+    }
+    touched = _forget_children(ids)
+    catalog = []
+    out = {}
+    for c in candidates:
+        features = extract_features(c)
+        record = existing.get(c.id)
+        if record is None:
+            record = CandidateFeatures(candidate_id=c.id)
+            db.session.add(record)
+        for key, value in features.items():
+            setattr(record, key, value)
+        record.feature_version = version
+        record.computed_at = computed_at
+        db.session.add_all(CandidateSkill(candidate_id=c.id, skill=t) for t in skill_terms(features))
+        parsed = _parsed(c)
+        for name, issuer, search_text in cert_entries(c, parsed):
+            key = CERT_CATALOG.resolve(name)
+            db.session.add(CandidateCertification(
+                candidate_id=c.id, name=name, search_text=search_text, certification_key=key,
+            ))
+            catalog.append((key, name, issuer))
+        db.session.add(CandidateSearchDoc(
+            candidate_id=c.id, **search_document(search_sections(c, parsed, features))
+        ))
+        for facet, values in facet_values(c, parsed).items():
+            for key, value in values.items():
+                db.session.add(CandidateFacet(candidate_id=c.id, facet=facet, key=key, value=value))
+                touched.add((facet, key))
+        out[c.id] = resolve_features({
+            "candidate_id": c.id,
+            "feature_version": version,
+            **features,
+            "computed_at": computed_at.isoformat(),
+        })
+    record_certifications(catalog)
+    recount_facets(touched)
+    return out
+
+
+# ------------------------- HOOKS ------------------------- #
+
+def refresh_features(candidate_ids: Sequence[int]) -> Dict[int, Dict]:
+    """Recompute and store features; ids that no longer exist are dropped. Returns records by id."""
+    ids = sorted({int(cid) for cid in candidate_ids if cid is not None})
+    version = feature_version()
+    out: Dict[int, Dict] = {}
+    for start in range(0, len(ids), FEATURE_CHUNK_SIZE):
+        chunk = ids[start:start + FEATURE_CHUNK_SIZE]
+        # Taken before reading: an edit landing meanwhile leaves the record stale.
+        computed_at = datetime.utcnow()
+        candidates = Candidate.query.filter(Candidate.id.in_(chunk)).all()
+        gone = set(chunk) - {c.id for c in candidates}
+        if gone:
+            forget_features(gone, commit=False)
+        try:
+            records = _store(candidates, version, computed_at)
+            db.session.commit()
+        except IntegrityError:
+            # Another worker inserted the same candidates first; write over its rows.
+            db.session.rollback()
+            records = _store(candidates, version, computed_at)
+            db.session.commit()
+        out.update(records)
+    return out
+
+
+def forget_features(candidate_ids, commit: bool = True):
+    ids = [int(cid) for cid in candidate_ids if cid is not None]
+    for start in range(0, len(ids), FEATURE_CHUNK_SIZE):
+        chunk = ids[start:start + FEATURE_CHUNK_SIZE]
+        CandidateFeatures.query.filter(
+            CandidateFeatures.candidate_id.in_(chunk)
+        ).delete(synchronize_session=False)
+        recount_facets(_forget_children(chunk))
+    if commit:
+        db.session.commit()
+
+
+def forget_all_features():
+    CandidateFeatures.query.delete(synchronize_session=False)
+    CandidateSkill.query.delete(synchronize_session=False)
+    CandidateCertification.query.delete(synchronize_session=False)
+    CandidateSearchDoc.query.delete(synchronize_session=False)
+    forget_all_facets()
+    db.session.commit()
+
+
+# ------------------------- BACKFILL ------------------------- #
+
+_backfill_lock = threading.Lock()
+_backfill_thread: Optional[threading.Thread] = None
+_all_featured = False
+
+
+def stale_feature_ids(candidate_ids: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Ids of candidates (all, or among `candidate_ids`) whose record is missing
+    or stale, missing ones first. Without ids this is a full scan: jobs only.
+    """
+    q = (
+        db.session.query(Candidate.id, CandidateFeatures.candidate_id.is_(None))
+        .outerjoin(CandidateFeatures, CandidateFeatures.candidate_id == Candidate.id)
+        .filter(or_(
+            CandidateFeatures.candidate_id.is_(None),
+            CandidateFeatures.feature_version != feature_version(),
+            Candidate.updated_at > CandidateFeatures.computed_at,
+        ))
+    )
+    if candidate_ids is not None:
+        q = q.filter(Candidate.id.in_(list(candidate_ids)))
+    rows = sorted(q, key=lambda row: (not row[1], row[0]))
+    return [cid for cid, _ in rows]
+
+
+def backfill_features(chunk_size: int = FEATURE_CHUNK_SIZE) -> int:
+    """
+    Recompute every missing or stale record a chunk at a time, bumping the
+    data version after each so filter indexes pick it up. Each chunk is
+    rechecked first: other workers backfill too. Returns how many were done.
+    """
+    from services.rank_cache import bump_data_version
+
+    stale = stale_feature_ids()
+    done = 0
+    for start in range(0, len(stale), chunk_size):
+        chunk = stale_feature_ids(stale[start:start + chunk_size])
+        if not chunk:
+            continue
+        refresh_features(chunk)
+        bump_data_version()
+        done += len(chunk)
+    return done
+
+
+def start_background_backfill(app) -> Optional[threading.Thread]:
+    """Run backfill_features once per process on a daemon thread."""
+    global _backfill_thread
+    with _backfill_lock:
+        if _backfill_thread is not None:
+            return _backfill_thread
+
+        def _run():
+            try:
+                with app.app_context():
+                    done = backfill_features()
+                    print(f"✅ Feature backfill finished: {done} record(s) refreshed")
+            except Exception as e:
+                import traceback
+                print(f"❌ Feature backfill failed: {e}")
+                traceback.print_exc()
+
+        _backfill_thread = threading.Thread(target=_run, name="feature-backfill", daemon=True)
+        _backfill_thread.start()
+    return _backfill_thread
+
+
+def no_features():
+    """Candidate filter: no feature record (nor child rows) yet."""
+    return ~exists().where(CandidateFeatures.candidate_id == Candidate.id)
+
+
+def features_pending() -> bool:
+    """
+    Whether some candidate has no feature record yet (the backfill has not
+    reached it). Once every candidate has one, the hooks keep it that way and
+    this process stops checking.
+    """
+    global _all_featured
+    if _all_featured:
+        return False
+    pending = db.session.query(Candidate.id).filter(no_features()).first() is not None
+    if not pending:
+        _all_featured = True
+    return pending
+
+
+def scan_terms(c) -> Dict[str, list]:
+    """filter_terms() of a Candidate without a record, for features_pending scans."""
+    return filter_terms(c, _parsed(c))
+
+
+def scan_facets(c) -> Dict[str, Dict[str, str]]:
+    """facet_values() of a Candidate without a record, for features_pending scans."""
+    return facet_values(c, _parsed(c))
+
+
+def scan_certifications(c) -> List[Tuple[Optional[str], Optional[str], str]]:
+    """cert_entries() of a Candidate without a record, for features_pending scans."""
+    return cert_entries(c, _parsed(c))
+
+
+# ------------------------- READS ------------------------- #
+
+def features_for(candidate_ids: Sequence[int]) -> Dict[int, Dict]:
+    """Current feature records by candidate id (resolve_features()), recomputing stale or missing ones first."""
+    ids = sorted({int(cid) for cid in candidate_ids if cid is not None})
+    version = feature_version()
+    out: Dict[int, Dict] = {}
+    for start in range(0, len(ids), FEATURE_CHUNK_SIZE):
+        chunk = ids[start:start + FEATURE_CHUNK_SIZE]
+        rows = (
+            db.session.query(CandidateFeatures, Candidate.updated_at)
+            .join(Candidate, Candidate.id == CandidateFeatures.candidate_id)
+            .filter(CandidateFeatures.candidate_id.in_(chunk))
+            .all()
+        )
+        for record, updated_at in rows:
+            if record.feature_version != version:
+                continue
+            if updated_at and record.computed_at and updated_at > record.computed_at:
+                continue
+            out[record.candidate_id] = resolve_features(record.to_dict())
+        stale = [cid for cid in chunk if cid not in out]
+        if stale:
+            out.update(refresh_features(stale))
+    return out
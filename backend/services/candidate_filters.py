@@ -5,10 +5,14 @@ import os
 import re
 from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
 
-from groq import Groq
+from services.model_registry import get_groq_client
 from pydantic import BaseModel, Field, ValidationError
 
-from models import Candidate
+from models import Candidate, db
+from services.candidate_features import features_for, norm_text as _norm_text
+from services.filter_index import bitmap_of, filter_index
+from services.fulltext import matching_ids, unindexed_matches
+from services.skill_ontology import ONTOLOGY
 
 
 LogicOp = Literal['AND', 'OR']
@@ -18,6 +22,7 @@ ConditionField = Literal[
     'certification',
     'project',
     'work_experience',
+    'keyword',
     'experience_min_years',
     'experience_max_years',
 ]
@@ -35,6 +40,7 @@ class StructuredFilter(BaseModel):
         'role',
         'bench',
         'work_experience_years',
+        'keyword',
     ]
     operator: Literal['contains', 'equals', '>=', '<=', 'between']
     value: Any
@@ -92,108 +98,22 @@ def _looks_like_skill_token(token: str) -> bool:
     return False
 
 
-def _norm_text(s: str) -> str:
-    s = str(s or '').strip().lower()
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-
 def normalize_synonyms(term: str) -> List[str]:
     t = _norm_text(term)
     if not t:
         return []
+    return list(ONTOLOGY.canonicals(t))
 
-    if t in {'ml'}:
-        return ['machine learning']
-
-    if t in {'ai/ml', 'ai-ml', 'aiml', 'ai ml'}:
-        return ['ai', 'machine learning']
-
-    if t in {'ai'}:
-        return ['ai']
-
-    return [t]
-
-
-def _infer_skill_proficiency(c: Candidate, skill: str) -> Optional[str]:
-    skill_norm = _norm_text(skill)
-    if not skill_norm:
-        return None
-
-    projects = getattr(c, 'projects', None) or []
-    if not isinstance(projects, list):
-        projects = []
-
-    def _iter_tools(p: Any) -> List[str]:
-        if not isinstance(p, dict):
-            return []
-        arr = (
-            p.get('technical_tools')
-            or p.get('technologies_used')
-            or p.get('skills')
-            or p.get('tools')
-            or []
-        )
-        if isinstance(arr, list):
-            return [str(x) for x in arr if x]
-        if isinstance(arr, str):
-            return [x.strip() for x in arr.split(',') if x.strip()]
-        return []
-
-    used_in = 0
-    for p in projects:
-        tools = _iter_tools(p)
-        if any(_norm_text(t) == skill_norm for t in tools):
-            used_in += 1
 
-    if used_in >= 4:
-        return 'ADVANCED'
-    if used_in >= 2:
-        return 'INTERMEDIATE'
-    if used_in >= 1:
-        return 'BASIC'
-    return None
-
-
-def _proficiency_meets(actual: Optional[str], required: str) -> bool:
-    if not required:
-        return True
-    order = {'BASIC': 1, 'INTERMEDIATE': 2, 'ADVANCED': 3}
-    a = order.get((actual or '').upper(), 0)
-    r = order.get(required.upper(), 0)
-    if r == 0:
-        return True
-    return a >= r
-
-
-def _match_scalar_contains(val: Any, term: str) -> bool:
-    return _norm_text(term) in _norm_text(val or '')
-
-
-def _match_scalar_equals(val: Any, term: str) -> bool:
-    return _norm_text(val or '') == _norm_text(term)
-
-
-def run_structured_candidate_filter(payload: Dict[str, Any], fetch_limit: int = 500, max_results: int = 50) -> Dict[str, Any]:
-    req = StructuredFilterRequest.model_validate(payload)
-    if not req.filters:
-        return {
-            'message': 'No filters provided.',
-            'structured': {
-                'type': 'candidate_table',
-                'headers': ["ID", "Name", "Role", "Bucket", "Experience", "Top Skills", "Email"],
-                'rows': [],
-                'applied_filters': [],
-                'warnings': ['No filters provided.'],
-                'scanned': 0,
-                'matched': 0,
-            },
-        }
-
-    warnings: List[str] = []
+def _structured_selection(req: StructuredFilterRequest) -> Tuple[Any, List[str], int, List[int], int]:
+    """
+    (filter index, applied filter texts, universe, per-filter bitmaps, matched
+    bitmap) of a structured request; no filters match the whole universe.
+    """
     applied: List[str] = []
 
     q = Candidate.query
+    sql_filtered = False
 
     min_years = None
     max_years = None
@@ -220,6 +140,7 @@ def run_structured_candidate_filter(payload: Dict[str, Any], fetch_limit: int =
         elif f.field == 'bucket':
             if f.operator not in {'equals', 'contains'}:
                 raise ValueError('Unsupported operator for bucket')
+            sql_filtered = True
             if f.operator == 'equals':
                 q = q.filter(Candidate.role_bucket == str(f.value))
                 applied.append(f"bucket equals '{f.value}'")
@@ -230,6 +151,7 @@ def run_structured_candidate_filter(payload: Dict[str, Any], fetch_limit: int =
         elif f.field == 'role':
             if f.operator not in {'equals', 'contains'}:
                 raise ValueError('Unsupported operator for role')
+            sql_filtered = True
             if f.operator == 'equals':
                 q = q.filter(Candidate.primary_role == str(f.value))
                 applied.append(f"role equals '{f.value}'")
@@ -247,104 +169,160 @@ def run_structured_candidate_filter(payload: Dict[str, Any], fetch_limit: int =
             else:
                 v_bool = bool(v)
             q = q.filter(Candidate.on_bench == v_bool)
+            sql_filtered = True
             applied.append(f"bench equals {str(v_bool).lower()}")
 
         elif f.field in {'skill', 'certification', 'project'}:
             if f.operator not in {'contains', 'equals'}:
                 raise ValueError(f"Unsupported operator for {f.field}")
             applied.append(f"{f.field} {f.operator} '{f.value}'" + (f" (proficiency: {f.proficiency})" if f.field == 'skill' and f.proficiency else ''))
+        elif f.field == 'keyword':
+            if f.operator != 'contains':
+                raise ValueError('Unsupported operator for keyword')
+            applied.append(f"keyword contains '{f.value}'")
         else:
             raise ValueError(f"Unsupported field: {f.field}")
 
     if min_years is not None and min_years != float('-inf'):
         q = q.filter(Candidate.total_experience_years >= float(min_years))
+        sql_filtered = True
     if max_years is not None and max_years != float('inf'):
         q = q.filter(Candidate.total_experience_years <= float(max_years))
+        sql_filtered = True
 
-    candidates = q.order_by(Candidate.created_at.desc()).limit(fetch_limit).all()
-    scanned = len(candidates)
+    # Scalar filters ran in SQL: every candidate they leave passes them.
+    # Term filters are bitmaps from the inverted index over the whole table.
+    index = filter_index()
+    universe = _universe(q) if sql_filtered else index.all_ids
 
-    def _matches_one(c: Candidate, flt: StructuredFilter) -> bool:
+    def _bits_one(flt: StructuredFilter) -> int:
+        value = str(flt.value)
         if flt.field == 'skill':
             # Match against both declared skills and project tech/tools.
-            skill_terms = list(dict.fromkeys(_candidate_skills(c) + _candidate_project_tech(c)))
             if flt.operator == 'contains':
-                ok = _match_term(skill_terms, str(flt.value))
+                bits = index.contains('skills', value) | index.contains('project_tech', value)
             else:
-                skill_norm = _norm_text(str(flt.value))
-                ok = any(_norm_text(s) == skill_norm for s in skill_terms)
-            if not ok:
-                return False
+                # Synonyms are equal ("k8s" == "kubernetes").
+                bits = index.skill_equals(value)
             if flt.proficiency:
-                prof = _infer_skill_proficiency(c, str(flt.value))
-                return _proficiency_meets(prof, flt.proficiency)
-            return True
+                bits &= index.proficient(value, flt.proficiency)
+            return bits & universe
 
         if flt.field == 'certification':
-            return _match_term(_candidate_certs(c), str(flt.value))
+            return index.contains('certifications', value) & universe
 
         if flt.field == 'project':
-            return _match_term(_candidate_projects(c), str(flt.value))
+            return index.contains('projects', value) & universe
+
+        if flt.field == 'keyword':
+            return _keyword_bits(value) & universe
+
+        # bucket / role / bench / work_experience_years
+        return universe
+
+    per_filter = [_bits_one(f) for f in req.filters]
+    bits = universe
+    if req.op == 'AND' or not per_filter:
+        for b in per_filter:
+            bits &= b
+    else:
+        bits = 0
+        for b in per_filter:
+            bits |= b
+    return index, applied, universe, per_filter, bits
+
+
+def _per_filter_counts(req: StructuredFilterRequest, per_filter: Sequence[int]) -> List[Dict[str, Any]]:
+    """How many candidates of the universe each filter matches on its own."""
+    return [
+        {'filter': f"{f.field} {f.operator} {f.value}", 'matched_candidates': b.bit_count()}
+        for f, b in zip(req.filters, per_filter)
+    ]
 
-        if flt.field == 'bucket':
-            return _match_scalar_equals(getattr(c, 'role_bucket', None), str(flt.value)) if flt.operator == 'equals' else _match_scalar_contains(getattr(c, 'role_bucket', None), str(flt.value))
 
-        if flt.field == 'role':
-            return _match_scalar_equals(getattr(c, 'primary_role', None), str(flt.value)) if flt.operator == 'equals' else _match_scalar_contains(getattr(c, 'primary_role', None), str(flt.value))
+# work_experience_years bands [low, high) reported by structured_facet_counts; None = open-ended.
+EXPERIENCE_BANDS: Tuple[Tuple[float, Optional[float]], ...] = ((0, 2), (2, 5), (5, 8), (8, 12), (12, None))
+FACET_COUNT_LIMIT = 25
 
-        if flt.field == 'bench':
-            v = flt.value
-            if isinstance(v, str):
-                v_bool = _norm_text(v) in {'true', 'yes', 'y', '1'}
-            else:
-                v_bool = bool(v)
-            return bool(getattr(c, 'on_bench', False)) == bool(v_bool)
-
-        if flt.field == 'work_experience_years':
-            v = _try_parse_float(getattr(c, 'total_experience_years', None) or 0)
-            if flt.operator == '>=':
-                return v is not None and v >= float(flt.value)
-            if flt.operator == '<=':
-                return v is not None and v <= float(flt.value)
-            if flt.operator == 'between':
-                if flt.value2 is None:
-                    return False
-                lo = float(flt.value)
-                hi = float(flt.value2)
-                return v is not None and min(lo, hi) <= v <= max(lo, hi)
-            return False
-
-        return False
 
-    matched: List[Candidate] = []
-    for c in candidates:
-        checks = [bool(_matches_one(c, f)) for f in req.filters]
-        if req.op == 'AND':
-            ok = all(checks)
+def _experience_bands(years: Dict[Optional[float], int]) -> List[Dict[str, Any]]:
+    bands = [
+        {'value': f"{lo:g}-{hi:g}" if hi is not None else f"{lo:g}+", 'min': lo, 'max': hi, 'count': 0}
+        for lo, hi in EXPERIENCE_BANDS
+    ]
+    unknown = 0
+    for y, n in years.items():
+        band = None
+        if y is not None:
+            band = next((b for b in bands if y >= b['min'] and (b['max'] is None or y < b['max'])), None)
+        if band is None:
+            unknown += n
         else:
-            ok = any(checks)
-        if ok:
-            matched.append(c)
-            if len(matched) >= max_results:
-                break
+            band['count'] += n
+    bands.append({'value': 'unknown', 'min': None, 'max': None, 'count': unknown})
+    return bands
+
+
+def structured_facet_counts(payload: Dict[str, Any], limit: int = FACET_COUNT_LIMIT) -> Dict[str, Any]:
+    """
+    Matched set size of a structured filter request plus, within the matched
+    set, per-value counts for skills, certifications, buckets, roles (top
+    `limit` each) and experience bands: how many candidates adding that value
+    as an AND filter would leave. One pass over the matched bitmap.
+    """
+    req = StructuredFilterRequest.model_validate(payload)
+    index, applied, universe, per_filter, bits = _structured_selection(req)
+    counts = index.value_counts(bits)
+
+    def _top(counter) -> List[Dict[str, Any]]:
+        ranked = sorted(counter.items(), key=lambda kv: (-kv[1], str(kv[0])))
+        return [{'value': v, 'count': n} for v, n in ranked[:limit]]
+
+    return {
+        'matched': bits.bit_count(),
+        'scanned': universe.bit_count(),
+        'applied_filters': applied,
+        'filters': _per_filter_counts(req, per_filter),
+        'facets': {
+            'skill': _top(counts['skill']),
+            'certification': _top(counts['certification']),
+            'bucket': _top(counts['bucket']),
+            'role': _top(counts['role']),
+            'experience': _experience_bands(counts['years']),
+        },
+    }
+
+
+def run_structured_candidate_filter(payload: Dict[str, Any], max_results: int = 50) -> Dict[str, Any]:
+    req = StructuredFilterRequest.model_validate(payload)
+    if not req.filters:
+        return {
+            'message': 'No filters provided.',
+            'structured': {
+                'type': 'candidate_table',
+                'headers': ["ID", "Name", "Role", "Bucket", "Experience", "Top Skills", "Email"],
+                'rows': [],
+                'applied_filters': [],
+                'warnings': ['No filters provided.'],
+                'scanned': 0,
+                'matched': 0,
+            },
+        }
+
+    warnings: List[str] = []
+    index, applied, universe, per_filter, bits = _structured_selection(req)
+    scanned = universe.bit_count()
+    matched = _load_in_order(index.newest(bits, max_results))
 
     # If nothing matched, provide safe diagnostics: how many candidates match each filter individually.
-    if not matched and candidates:
-        try:
-            counts = []
-            for f in req.filters:
-                n = 0
-                for c in candidates:
-                    if _matches_one(c, f):
-                        n += 1
-                counts.append({'filter': f"{f.field} {f.operator} {f.value}", 'matched_candidates': n})
-            warnings.append('No candidates matched all constraints. Per-filter matches: ' + json.dumps(counts))
-        except Exception:
-            pass
+    if not matched and universe:
+        counts = _per_filter_counts(req, per_filter)
+        warnings.append('No candidates matched all constraints. Per-filter matches: ' + json.dumps(counts))
 
+    terms = _terms_for(matched)
     rows: List[Dict[str, Any]] = []
     for c in matched[:max_results]:
-        skills = _candidate_skills(c)
+        skills = terms[c.id]['skills']
         top_skills = ", ".join([s for s in skills[:5]])
         rows.append(
             {
@@ -666,7 +644,7 @@ def _rule_based_parse(user_text: str) -> Tuple[Optional[FilterSpec], str]:
 
 
 def _groq_fallback_parse(user_text: str) -> FilterSpec:
-    client = Groq(api_key=os.getenv('GROQ_API_KEY'))
+    client = get_groq_client()
 
     schema = {
         "type": "object",
@@ -687,6 +665,7 @@ def _groq_fallback_parse(user_text: str) -> FilterSpec:
                                         "certification",
                                         "project",
                                         "work_experience",
+                                        "keyword",
                                         "experience_min_years",
                                         "experience_max_years"
                                     ]},
@@ -710,6 +689,7 @@ def _groq_fallback_parse(user_text: str) -> FilterSpec:
         "You convert a user request into a JSON filter spec for filtering candidates. "
         "Return ONLY valid JSON. Do not include any explanation. "
         "Use the schema exactly. Use 'any_of' as OR groups, and each group's 'all_of' as AND conditions. "
+        "Use 'keyword' only for free text to find anywhere in a resume that fits no other field. "
         "Normalize synonyms: 'ml' -> 'machine learning', 'ai/ml' -> ['ai','machine learning'] (pick the best single value if needed)."
     )
 
@@ -790,235 +770,41 @@ def parse_candidate_filters(user_text: str) -> Optional[FilterSpec]:
         return None
 
 
-def _candidate_skills(c: Candidate) -> List[str]:
-    skills: List[str] = []
-    parsed = getattr(c, 'parsed', None) or {}
+def _terms_for(candidates: Sequence[Candidate]) -> Dict[int, Dict[str, Any]]:
+    """Filter terms (candidate_features) of each candidate, by id."""
+    features = features_for([c.id for c in candidates])
+    return {cid: f['terms'] for cid, f in features.items()}
 
-    if isinstance(parsed, str):
-        try:
-            parsed = json.loads(parsed)
-        except Exception:
-            parsed = {}
 
-    if isinstance(getattr(c, 'skills', None), list):
-        skills = [str(s) for s in (c.skills or []) if s]
+def _universe(q) -> int:
+    """Bitmap of the candidate ids a SQL-filtered Candidate query returns."""
+    return bitmap_of(cid for cid, in q.with_entities(Candidate.id))
 
-    if not skills and isinstance(parsed, dict):
-        maybe = parsed.get('technical_skills') or parsed.get('skills') or parsed.get('primary_skills')
-        if isinstance(maybe, list):
-            skills = [str(s) for s in maybe if s]
 
-    return [_norm_text(s) for s in skills if _norm_text(s)]
+def _keyword_bits(value: str) -> int:
+    """Bitmap of candidates whose resume matches `value` in the full-text index (or, unindexed, its text)."""
+    ids = matching_ids(value)
+    bits = bitmap_of(cid for cid, in db.session.execute(ids)) if ids is not None else 0
+    unindexed = unindexed_matches([value])
+    if unindexed is not None:
+        bits |= bitmap_of(cid for cid, in db.session.query(Candidate.id).filter(unindexed))
+    return bits
 
 
-def _candidate_certs(c: Candidate) -> List[str]:
-    certs: List[str] = []
-    parsed = getattr(c, 'parsed', None) or {}
+def _load_in_order(ids: Sequence[int]) -> List[Candidate]:
+    by_id = {c.id: c for c in Candidate.query.filter(Candidate.id.in_(list(ids)))} if ids else {}
+    return [by_id[cid] for cid in ids if cid in by_id]
 
-    if isinstance(parsed, str):
-        try:
-            parsed = json.loads(parsed)
-        except Exception:
-            parsed = {}
 
-    if isinstance(getattr(c, 'certifications', None), list):
-        raw = c.certifications or []
-        for item in raw:
-            if isinstance(item, dict):
-                name = item.get('name')
-                if name:
-                    certs.append(str(name))
-            else:
-                certs.append(str(item))
-
-    if not certs and isinstance(parsed, dict):
-        raw2 = parsed.get('certifications')
-        if isinstance(raw2, list):
-            for item in raw2:
-                if isinstance(item, dict):
-                    name = item.get('name') or item.get('title')
-                    if name:
-                        certs.append(str(name))
-                else:
-                    certs.append(str(item))
-
-    return [_norm_text(s) for s in certs if _norm_text(s)]
-
-
-def _candidate_projects(c: Candidate) -> List[str]:
-    projects: List[str] = []
-    parsed = getattr(c, 'parsed', None) or {}
-
-    if isinstance(parsed, str):
-        try:
-            parsed = json.loads(parsed)
-        except Exception:
-            parsed = {}
-
-    raw = getattr(c, 'projects', None)
-    if isinstance(raw, list):
-        for p in raw:
-            if isinstance(p, dict):
-                for k in ['name', 'organization', 'role', 'description', 'contribution', 'impact']:
-                    v = p.get(k)
-                    if v:
-                        projects.append(str(v))
-                tech = p.get('technical_tools') or p.get('technologies_used')
-                if isinstance(tech, list):
-                    projects.extend([str(t) for t in tech if t])
-            else:
-                projects.append(str(p))
-
-    if not projects and isinstance(parsed, dict):
-        raw2 = parsed.get('projects')
-        if isinstance(raw2, list):
-            for p in raw2:
-                if isinstance(p, dict):
-                    for k in ['name', 'organization', 'role', 'description', 'contribution', 'impact']:
-                        v = p.get(k)
-                        if v:
-                            projects.append(str(v))
-                    tech = p.get('technical_tools') or p.get('technologies_used')
-                    if isinstance(tech, list):
-                        projects.extend([str(t) for t in tech if t])
-                else:
-                    projects.append(str(p))
-
-    return [_norm_text(s) for s in projects if _norm_text(s)]
-
-
-def _candidate_project_tech(c: Candidate) -> List[str]:
-    techs: List[str] = []
-    parsed = getattr(c, 'parsed', None) or {}
-
-    if isinstance(parsed, str):
-        try:
-            parsed = json.loads(parsed)
-        except Exception:
-            parsed = {}
-
-    def _add_from_project(p: Any) -> None:
-        if not isinstance(p, dict):
-            return
-        arr = (
-            p.get('technical_tools')
-            or p.get('technologies_used')
-            or p.get('tools')
-            or p.get('skills')
-            or []
-        )
-        if isinstance(arr, list):
-            for t in arr:
-                if t:
-                    techs.append(str(t))
-        elif isinstance(arr, str):
-            techs.extend([x.strip() for x in arr.split(',') if x.strip()])
-
-    raw = getattr(c, 'projects', None)
-    if isinstance(raw, list):
-        for p in raw:
-            _add_from_project(p)
-
-    if isinstance(parsed, dict):
-        raw2 = parsed.get('projects')
-        if isinstance(raw2, list):
-            for p in raw2:
-                _add_from_project(p)
-
-    return [_norm_text(t) for t in techs if _norm_text(t)]
-
-
-def _candidate_work_experiences(c: Candidate) -> List[str]:
-    work: List[str] = []
-    parsed = getattr(c, 'parsed', None) or {}
-
-    if isinstance(parsed, str):
-        try:
-            parsed = json.loads(parsed)
-        except Exception:
-            parsed = {}
-
-    raw = getattr(c, 'work_experiences', None)
-    if isinstance(raw, list):
-        for w in raw:
-            if isinstance(w, dict):
-                for k in ['company_name', 'job_title', 'location', 'start_date', 'end_date']:
-                    v = w.get(k)
-                    if v:
-                        work.append(str(v))
-                tech = w.get('technologies_used')
-                if isinstance(tech, list):
-                    work.extend([str(t) for t in tech if t])
-                resp = w.get('responsibilities')
-                if isinstance(resp, list):
-                    work.extend([str(r) for r in resp if r])
-            else:
-                work.append(str(w))
-
-    if not work and isinstance(parsed, dict):
-        raw2 = parsed.get('work_experiences')
-        if isinstance(raw2, list):
-            for w in raw2:
-                if isinstance(w, dict):
-                    for k in ['company_name', 'job_title', 'location', 'start_date', 'end_date']:
-                        v = w.get(k)
-                        if v:
-                            work.append(str(v))
-                    tech = w.get('technologies_used')
-                    if isinstance(tech, list):
-                        work.extend([str(t) for t in tech if t])
-                    resp = w.get('responsibilities')
-                    if isinstance(resp, list):
-                        work.extend([str(r) for r in resp if r])
-                else:
-                    work.append(str(w))
-
-    return [_norm_text(s) for s in work if _norm_text(s)]
-
-
-def _match_term(values: Sequence[str], term: str) -> bool:
-    t = _norm_text(term)
-    if not t:
-        return False
-    for v in values:
-        if t in v:
-            return True
-    return False
-
-
-def _candidate_matches_group(c: Candidate, group: AllOfGroup) -> bool:
-    for cond in group.all_of:
-        if cond.field == 'role_bucket':
-            if _norm_text(getattr(c, 'role_bucket', '') or '') != _norm_text(cond.value):
-                return False
-        elif cond.field == 'experience_min_years':
-            v = _try_parse_float(getattr(c, 'total_experience_years', None) or 0)
-            target = _try_parse_float(cond.value)
-            if target is not None and (v is None or v < target):
-                return False
-        elif cond.field == 'experience_max_years':
-            v = _try_parse_float(getattr(c, 'total_experience_years', None) or 0)
-            target = _try_parse_float(cond.value)
-            if target is not None and (v is None or v > target):
-                return False
-        elif cond.field == 'skill':
-            if not _match_term(_candidate_skills(c), cond.value):
-                return False
-        elif cond.field == 'certification':
-            if not _match_term(_candidate_certs(c), cond.value):
-                return False
-        elif cond.field == 'project':
-            if not _match_term(_candidate_projects(c), cond.value):
-                return False
-        elif cond.field == 'work_experience':
-            if not _match_term(_candidate_work_experiences(c), cond.value):
-                return False
-        else:
-            return False
-    return True
+_GROUP_TERM_FIELDS = {
+    'skill': 'skills',
+    'certification': 'certifications',
+    'project': 'projects',
+    'work_experience': 'work',
+}
 
 
-def run_candidate_filter_query(spec: FilterSpec, fetch_limit: int = 500, max_results: int = 50) -> Dict[str, Any]:
+def run_candidate_filter_query(spec: FilterSpec, max_results: int = 50) -> Dict[str, Any]:
     if not spec.any_of:
         return {
             'message': 'I could not determine any filters from your request.',
@@ -1031,13 +817,15 @@ def run_candidate_filter_query(spec: FilterSpec, fetch_limit: int = 500, max_res
 
     _debug_log('parsed_spec', spec.model_dump())
 
-    results: Dict[int, Candidate] = {}
+    index = filter_index()
+    results = 0
     warnings: List[str] = []
     applied_filters: List[str] = []
     scanned_total = 0
 
     for group in spec.any_of:
         q = Candidate.query
+        sql_filtered = False
         bucket_values = [c.value for c in group.all_of if c.field == 'role_bucket']
 
         # If the dataset doesn't contain C-level buckets (c1..c9), don't let it zero the result.
@@ -1064,9 +852,11 @@ def run_candidate_filter_query(spec: FilterSpec, fetch_limit: int = 500, max_res
                 else:
                     q = q.filter(Candidate.role_bucket.in_(bucket_values))
                     applied_filters.append(f"role_bucket IN {bucket_values}")
+                    sql_filtered = True
             else:
                 q = q.filter(Candidate.role_bucket.in_(bucket_values))
                 applied_filters.append(f"role_bucket IN {bucket_values}")
+                sql_filtered = True
 
         min_vals = [c.value for c in group.all_of if c.field == 'experience_min_years']
         max_vals = [c.value for c in group.all_of if c.field == 'experience_max_years']
@@ -1081,41 +871,44 @@ def run_candidate_filter_query(spec: FilterSpec, fetch_limit: int = 500, max_res
                 applied_filters.append(f"project contains '{cond.value}'")
             elif cond.field == 'work_experience':
                 applied_filters.append(f"work_experience contains '{cond.value}'")
+            elif cond.field == 'keyword':
+                applied_filters.append(f"keyword contains '{cond.value}'")
 
         if min_vals:
             mins = [m for m in (_try_parse_float(v) for v in min_vals) if m is not None]
             if mins:
                 q = q.filter(Candidate.total_experience_years >= max(mins))
                 applied_filters.append(f"total_experience_years >= {max(mins)}")
+                sql_filtered = True
 
         if max_vals:
             maxs = [m for m in (_try_parse_float(v) for v in max_vals) if m is not None]
             if maxs:
                 q = q.filter(Candidate.total_experience_years <= min(maxs))
                 applied_filters.append(f"total_experience_years <= {min(maxs)}")
+                sql_filtered = True
+
+        # Bucket and experience constraints ran in SQL; text conditions are
+        # index bitmaps ANDed within the group, groups ORed together.
+        bits = _universe(q) if sql_filtered else index.all_ids
+        scanned_total += bits.bit_count()
+        if len({_norm_text(v) for v in bucket_values}) > 1:
+            # all_of two different buckets: nobody is in both.
+            bits = 0
+        for cond in group.all_of:
+            field = _GROUP_TERM_FIELDS.get(cond.field)
+            if field is not None:
+                bits &= index.contains(field, cond.value)
+            elif cond.field == 'keyword':
+                bits &= _keyword_bits(cond.value)
+        results |= bits
 
-        candidates = (
-            q.order_by(Candidate.created_at.desc())
-            .limit(fetch_limit)
-            .all()
-        )
-
-        scanned_total += len(candidates)
-
-        for c in candidates:
-            if _candidate_matches_group(c, group):
-                results[int(c.id)] = c
-                if len(results) >= max_results:
-                    break
-        if len(results) >= max_results:
-            break
-
-    matched = list(results.values())
-    matched.sort(key=lambda c: c.created_at or 0, reverse=True)
+    matched = _load_in_order(index.newest(results, max_results))
+    terms = _terms_for(matched)
 
     rows: List[Dict[str, Any]] = []
     for c in matched[:max_results]:
-        skills = _candidate_skills(c)
+        skills = terms[c.id]['skills']
         top_skills = ", ".join([s for s in skills[:5]])
         rows.append(
             {
@@ -1145,6 +938,8 @@ def run_candidate_filter_query(spec: FilterSpec, fetch_limit: int = 500, max_res
                 parts.append(f"project contains '{cond.value}'")
             elif cond.field == 'work_experience':
                 parts.append(f"work experience contains '{cond.value}'")
+            elif cond.field == 'keyword':
+                parts.append(f"resume mentions '{cond.value}'")
             elif cond.field == 'experience_min_years':
                 parts.append(f"experience >= {cond.value} yrs")
             elif cond.field == 'experience_max_years':
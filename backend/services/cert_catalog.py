@@ -0,0 +1,262 @@
+"""
+Certification catalog (docs/certifications.json, certification table).
+
+Certification questions used to load every candidate and string-match the
+query against every certification entry (difflib per pair). Instead each
+entry is resolved once, at feature-extraction time, to a catalog key and
+linked through candidate_certification.certification_key:
+
+  key      cert_key() of a name: accents, punctuation and filler words
+           ("certified", "certification", ...) dropped, lowercase words
+  resolve  a name whose key is a seed entry's name, alias or exam code, or
+           holds the exam code ("Azure Fundamentals (AZ-900)", "az900"),
+           links to that seed entry; any other name links to its own key
+
+The certification table lists every key in use (seed entries with their
+issuer, code and aliases; observed names as first seen). Fuzzy lookups probe
+an in-process trigram index over catalog names, aliases and codes, then read
+holders from the link column's index:
+
+    hits = search_certifications("azure data engineer")   # best first, 0..100
+    certification_holders([h["key"] for h in hits])
+
+Seed changes move CERT_CATALOG.version, which is part of the candidate
+feature version, so stored links are re-resolved.
+"""
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+
+from config.local_config import CERT_CATALOG_PATH
+from models import Certification, CandidateCertification, db
+from services.name_index import normalize_name, trigrams, word_similarity, word_trigrams
+
+CERT_KEY_MAX_LEN = 255
+CERT_MATCH_THRESHOLD = 70.0
+CERT_SUGGEST_THRESHOLD = 40.0
+
+_FILLER = re.compile(r"\b(the|a|an|certification|certificate|certified)\b")
+
+
+def cert_key(name: Optional[str]) -> str:
+    return " ".join(_FILLER.sub(" ", normalize_name(name)).split())
+
+
+class CertCatalog:
+    """Seed entries compiled into key, alias and exam-code lookups."""
+
+    def __init__(self, data: Dict, version: str):
+        self.version = version
+        self.entries: Dict[str, Dict] = {}
+        self._alias: Dict[str, str] = {}
+        self._codes: Dict[str, str] = {}
+        for item in data.get("certifications") or []:
+            key = cert_key(item["name"])
+            aliases = [a for a in item.get("aliases") or [] if cert_key(a)]
+            self.entries[key] = {
+                "key": key, "name": item["name"], "issuer": item.get("issuer"),
+                "code": item.get("code"), "aliases": aliases,
+            }
+            self._alias.setdefault(key, key)
+            for alias in aliases:
+                self._alias.setdefault(cert_key(alias), key)
+            code = cert_key(item.get("code"))
+            if code:
+                self._codes.setdefault(code, key)
+                self._codes.setdefault(code.replace(" ", ""), key)
+
+    def search_keys(self, key: str) -> List[str]:
+        """Every key a seed entry is known by (its own, aliases, exam code)."""
+        entry = self.entries[key]
+        keys = [key] + [cert_key(a) for a in entry["aliases"]]
+        if entry["code"]:
+            keys.append(cert_key(entry["code"]))
+        return keys
+
+    def seed_key(self, name: Optional[str]) -> Optional[str]:
+        """The seed entry a name is, or carries the exam code of; None if none."""
+        key = cert_key(name)
+        if not key:
+            return None
+        if key in self._alias:
+            return self._alias[key]
+        if key in self._codes:
+            return self._codes[key]
+        words = key.split()
+        for a, b in zip(words, words[1:]):
+            hit = self._codes.get(f"{a} {b}") or self._codes.get(a + b)
+            if hit:
+                return hit
+        for w in words:
+            if w in self._codes:
+                return self._codes[w]
+        return None
+
+    def resolve(self, name: Optional[str]) -> Optional[str]:
+        """Catalog key of a certification entry name (None when it has none)."""
+        key = self.seed_key(name)
+        if key is not None:
+            return key
+        key = cert_key(name)
+        return key if key and len(key) <= CERT_KEY_MAX_LEN else None
+
+
+def load_catalog(path: str = CERT_CATALOG_PATH) -> CertCatalog:
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    digest = hashlib.sha256(raw).hexdigest()[:12]
+    return CertCatalog(data, f"{data.get('version', 0)}-{digest}")
+
+
+CERT_CATALOG = load_catalog()
+
+
+# ------------------------- CATALOG TABLE ------------------------- #
+
+def record_certifications(names: Iterable[Tuple[str, Optional[str], Optional[str]]]):
+    """Add certification rows for (key, name, issuer) not in the table yet (no commit)."""
+    pending: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    for key, name, issuer in names:
+        if key and key not in pending:
+            pending[key] = (name, issuer)
+    if not pending:
+        return
+    existing = {
+        k for k, in db.session.query(Certification.key).filter(Certification.key.in_(list(pending)))
+    }
+    for key, (name, issuer) in pending.items():
+        if key in existing:
+            continue
+        entry = CERT_CATALOG.entries.get(key)
+        if entry is not None:
+            db.session.add(Certification(
+                key=key, name=entry["name"], issuer=entry["issuer"], code=entry["code"],
+                aliases=entry["aliases"],
+            ))
+        else:
+            db.session.add(Certification(
+                key=key, name=str(name or key)[:255], issuer=str(issuer)[:255] if issuer else None,
+            ))
+
+
+# ------------------------- N-GRAM INDEX ------------------------- #
+
+class CertificationIndex:
+    """Trigram postings over the search keys of every catalog entry."""
+
+    def __init__(self):
+        self.keys: Dict[str, str] = {}            # search key -> catalog key
+        self.grams: Dict[str, List[Set[str]]] = {}  # search key -> word trigrams
+        self.postings: Dict[str, Set[str]] = {}
+        self.names: Dict[str, Tuple[str, Optional[str]]] = {}  # catalog key -> (name, issuer)
+        self._rows: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def _add(self, search_key: str, key: str):
+        if not search_key or search_key in self.keys:
+            return
+        self.keys[search_key] = key
+        self.grams[search_key] = [word_trigrams(w) for w in search_key.split()]
+        for g in trigrams(search_key):
+            self.postings.setdefault(g, set()).add(search_key)
+
+    def sync(self):
+        """Index every seed entry and every catalog row (the table only grows)."""
+        rows = db.session.query(func.count(Certification.key)).scalar() or 0
+        with self._lock:
+            if rows == self._rows:
+                return
+            if self._rows is None:
+                for key, entry in CERT_CATALOG.entries.items():
+                    self.names[key] = (entry["name"], entry["issuer"])
+                    for search_key in CERT_CATALOG.search_keys(key):
+                        self._add(search_key, key)
+            for key, name, issuer in db.session.query(Certification.key, Certification.name, Certification.issuer):
+                if key not in self.names:
+                    self.names[key] = (name, issuer)
+                    self._add(key, key)
+            self._rows = rows
+
+    def search(self, text: str, limit: Optional[int], threshold: float) -> List[Dict]:
+        q = cert_key(text)
+        if not q:
+            return []
+        words = q.split()
+        q_grams = trigrams(q)
+        # Containment boosts add at most 20; below this similarity nothing passes.
+        need = math.ceil(max(0.0, threshold - 20.0) / 100.0 * len(q_grams))
+        best: Dict[str, float] = {}
+        with self._lock:
+            overlap = Counter()
+            for g in q_grams:
+                overlap.update(self.postings.get(g, ()))
+            exact = CERT_CATALOG.seed_key(text)
+            if exact is not None:
+                best[exact] = 100.0
+            for search_key, n in overlap.items():
+                if n < max(need, 1):
+                    continue
+                score = word_similarity(q_grams, len(words), self.grams[search_key]) * 100.0
+                if all(w in search_key for w in words[:3]):
+                    score += 10.0
+                if q in search_key:
+                    score += 10.0
+                key = self.keys[search_key]
+                best[key] = max(best.get(key, 0.0), min(100.0, score))
+            hits = [
+                {"key": key, "name": self.names[key][0], "issuer": self.names[key][1], "score": round(score, 1)}
+                for key, score in best.items() if score >= threshold and key in self.names
+            ]
+        hits.sort(key=lambda h: (-h["score"], h["name"]))
+        return hits[:limit] if limit is not None else hits
+
+
+_index = CertificationIndex()
+
+
+def certification_index() -> CertificationIndex:
+    """The process-wide index, synced."""
+    _index.sync()
+    return _index
+
+
+# ------------------------- READS ------------------------- #
+
+def search_certifications(text: str, limit: Optional[int] = None,
+                          threshold: float = CERT_MATCH_THRESHOLD) -> List[Dict]:
+    """Catalog entries matching `text` (key, name, issuer, score 0..100), best first."""
+    return certification_index().search(text, limit, threshold)
+
+
+def certification_holders(keys: Iterable[str]) -> List[Tuple[int, Optional[str], str]]:
+    """(candidate_id, entry name, catalog key) of every entry linked to one of `keys`."""
+    keys = sorted(set(keys))
+    if not keys:
+        return []
+    return (
+        db.session.query(
+            CandidateCertification.candidate_id, CandidateCertification.name,
+            CandidateCertification.certification_key,
+        )
+        .filter(CandidateCertification.certification_key.in_(keys))
+        .all()
+    )
+
+
+def held_certifications(keys: Iterable[str]) -> Set[str]:
+    """The keys among `keys` that at least one candidate entry links to."""
+    keys = sorted(set(keys))
+    if not keys:
+        return set()
+    return {
+        k for k, in db.session.query(CandidateCertification.certification_key)
+        .filter(CandidateCertification.certification_key.in_(keys))
+        .distinct()
+    }
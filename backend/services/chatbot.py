@@ -2,13 +2,12 @@ import uuid
 from collections import Counter
 from typing import List, Dict, Optional, Tuple
 import json
-from groq import Groq
 from flask import current_app
 from sqlalchemy.orm.attributes import flag_modified
 from models import db, Candidate
 from models import ChatSession, ChatMessage, JD
-from services.rag_pipeline import RAGResumePipeline
-from config.local_config import GROQ_API_KEY
+from services.model_registry import get_groq_client, get_pipeline
+from services.batch_screening import score_pairs
 from services.smart_screening import smart_screen_candidate
 from services.general_queries import get_query_handler
 from typing import Dict, List, Any, Optional
@@ -146,8 +145,9 @@ class ChatOrchestrator:
     """
 
     def __init__(self):
-        self.rag = RAGResumePipeline()
-        self.llm = Groq(api_key=GROQ_API_KEY)
+        # Shared, already-loaded pipeline and client (services/model_registry.py)
+        self.rag = get_pipeline()
+        self.llm = get_groq_client()
 
     # ---------------- session + history ---------------- #
 
@@ -541,22 +541,29 @@ Example job description for: {role}
             "bonus_skills": ["aws", "pyspark"],
         }
 
-        # 3) Smart-screen each candidate
-        scored: List[Dict[str, Any]] = []
-        for c in candidates:
-            cand_struct = {
+        # 3) Score the whole pool in one batch
+        structs = [
+            {
                 "id": c.get("candidate_id"),
                 "full_name": c.get("candidate_name"),
                 "skills": c.get("skills") or [],
                 "roles": c.get("roles") or c.get("work_experiences") or [],
             }
-            s = smart_screen_candidate(cand_struct, jd)
-            s["similarity_score"] = float(c.get("similarity_score", 0.0))
-            scored.append(s)
+            for c in candidates
+        ]
+        scores = score_pairs(structs, [jd])
+        order = sorted(
+            (i for i in range(len(structs)) if scores.pair(i, 0) is not None),
+            key=lambda i: (scores.final_score[i, 0], float(candidates[i].get("similarity_score", 0.0))),
+            reverse=True,
+        )
 
-        # 4) Sort by final smart score then similarity
-        scored.sort(key=lambda x: (x["final_score"], x["similarity_score"]), reverse=True)
-        top = scored[:8]
+        # 4) Full explanation only for the rows we show
+        top: List[Dict[str, Any]] = []
+        for i in order[:8]:
+            s = smart_screen_candidate(structs[i], jd)
+            s["similarity_score"] = float(candidates[i].get("similarity_score", 0.0))
+            top.append(s)
 
         # 5) Build table rows with better reasons
         table_rows = []
@@ -864,7 +871,11 @@ Tasks:
     def _handle_certification_lookup(self, query: str):
         import re
         import json
-        from difflib import SequenceMatcher
+        from services.cert_catalog import (
+            CERT_CATALOG, CERT_MATCH_THRESHOLD, CERT_SUGGEST_THRESHOLD, cert_key, certification_holders,
+            held_certifications, search_certifications,
+        )
+        from services.candidate_features import features_pending, no_features, scan_certifications
 
         q = (query or "").strip()
         q_lower = q.lower()
@@ -874,25 +885,6 @@ Tasks:
             if not any(k in q_lower for k in ["az-", "dp-", "aws", "gcp", "databricks", "snowflake"]):
                 return None
 
-        def _norm(s: str) -> str:
-            s = str(s or "").strip().lower()
-            s = re.sub(r"\s+", " ", s)
-            return s
-
-        def _score(a: str, b: str) -> float:
-            a2 = _norm(a)
-            b2 = _norm(b)
-            if not a2 or not b2:
-                return 0.0
-            ratio = SequenceMatcher(None, a2, b2).ratio() * 100.0
-            # token containment boosts
-            tokens = [t for t in re.split(r"[^a-z0-9]+", a2) if t]
-            if tokens and all(t in b2 for t in tokens[:3]):
-                ratio += 10.0
-            if a2 in b2:
-                ratio += 10.0
-            return min(100.0, ratio)
-
         # Try to extract the certification name from the query
         cert_term = None
         patterns = [
@@ -916,12 +908,38 @@ Tasks:
         if not cert_term or len(cert_term) < 3:
             return None
 
-        # Collect all certifications from DB
-        rows = Candidate.query.order_by(Candidate.created_at.desc()).all()
-        all_cert_names = []
-        matches = []
+        # Match the term against the certification catalog, then read holders
+        # through the candidate_certification link index.
+        hits = search_certifications(cert_term)
+        key_scores = {h["key"]: h["score"] for h in hits}
+        best_by_candidate: Dict[int, Tuple[float, Optional[str]]] = {}
+        for cid, name, key in certification_holders(key_scores):
+            sc = key_scores[key]
+            if cid not in best_by_candidate or sc > best_by_candidate[cid][0]:
+                best_by_candidate[cid] = (sc, name)
+        if features_pending():
+            # Candidates the feature backfill has not reached have no links yet:
+            # resolve their entries here; names outside the catalog match by containment.
+            term_key = cert_key(cert_term)
+            for cand in Candidate.query.filter(no_features()):
+                for name, _issuer, _text in scan_certifications(cand):
+                    key = CERT_CATALOG.resolve(name)
+                    sc = key_scores.get(key)
+                    if sc is None and term_key and term_key in (key or ""):
+                        sc = CERT_MATCH_THRESHOLD
+                    if sc is not None and (cand.id not in best_by_candidate or sc > best_by_candidate[cand.id][0]):
+                        best_by_candidate[cand.id] = (sc, name)
 
+        matches = []
+        rows = []
+        if best_by_candidate:
+            rows = (
+                Candidate.query.filter(Candidate.id.in_(list(best_by_candidate)))
+                .order_by(Candidate.created_at.desc())
+                .all()
+            )
         for cand in rows:
+            score, linked_name = best_by_candidate[cand.id]
             # Prefer top-level certifications column; fallback to parsed
             certs = getattr(cand, "certifications", None)
             if not isinstance(certs, list):
@@ -938,7 +956,8 @@ Tasks:
                 if isinstance(maybe, list):
                     certs = maybe
 
-            best = None
+            best = {"cert_name": linked_name or "", "issuer": "", "year": ""}
+            best_sc = -1.0
             for c in certs:
                 if isinstance(c, dict):
                     name = c.get("name") or ""
@@ -948,48 +967,29 @@ Tasks:
                     name = str(c)
                     issuer = ""
                     year = ""
-
-                if name:
-                    all_cert_names.append(str(name))
-
-                sc = _score(cert_term, name)
-                if best is None or sc > best["score"]:
-                    best = {
-                        "score": sc,
-                        "cert_name": name,
-                        "issuer": issuer,
-                        "year": year,
-                    }
-
-            if best and best["score"] >= 70:
-                matches.append({
-                    "id": cand.id,
-                    "name": cand.full_name,
-                    "primary_role": cand.primary_role or "",
-                    "score": round(best["score"], 1),
-                    "cert_name": best["cert_name"],
-                    "issuer": best["issuer"],
-                    "year": best["year"],
-                })
+                sc = key_scores.get(CERT_CATALOG.resolve(name), -1.0)
+                if sc > best_sc:
+                    best_sc = sc
+                    best = {"cert_name": name, "issuer": issuer, "year": year}
+
+            matches.append({
+                "id": cand.id,
+                "name": cand.full_name,
+                "primary_role": cand.primary_role or "",
+                "score": round(score, 1),
+                "cert_name": best["cert_name"],
+                "issuer": best["issuer"],
+                "year": best["year"],
+            })
 
         # If no matches, offer suggestions
         if not matches:
-            # Suggest closest cert names from global list
-            uniq = []
-            seen = set()
-            for n in all_cert_names:
-                nn = _norm(n)
-                if nn and nn not in seen:
-                    seen.add(nn)
-                    uniq.append(n)
-
-            scored = sorted(
-                [(n, _score(cert_term, n)) for n in uniq],
-                key=lambda x: x[1],
-                reverse=True,
-            )[:8]
-
-            suggestion_lines = "\n".join([f"- {n}" for n, s in scored if s >= 40])
+            # Suggest the closest catalog entries some candidate holds
+            scored = search_certifications(cert_term, limit=None, threshold=CERT_SUGGEST_THRESHOLD)
+            held = held_certifications(h["key"] for h in scored)
+            scored = [h for h in scored if h["key"] in held][:8]
+
+            suggestion_lines = "\n".join([f"- {h['name']}" for h in scored])
             msg = (
                 f"I couldn't find anyone with a certification matching: '{cert_term}'.\n\n"
                 "If you meant one of these, reply with the exact name:\n"
@@ -1044,14 +1044,18 @@ Tasks:
         if not name_fragment and not wants_contact:
             return None
 
-        like = f"%{name_fragment}%" if name_fragment else "%"
+        close_only = False
+        if name_fragment:
+            from services.name_index import find_candidates_by_name
 
-        rows = (
-            Candidate.query.filter(Candidate.full_name.ilike(like))
-            .order_by(Candidate.created_at.desc())
-            .limit(10)
-            .all()
-        )
+            matches = find_candidates_by_name(name_fragment, limit=10)
+            close_only = bool(matches) and matches[0]["match"] == "fuzzy"
+            by_id = {
+                c.id: c for c in Candidate.query.filter(Candidate.id.in_([m["candidate_id"] for m in matches]))
+            } if matches else {}
+            rows = [by_id[m["candidate_id"]] for m in matches if m["candidate_id"] in by_id]
+        else:
+            rows = Candidate.query.order_by(Candidate.created_at.desc()).limit(10).all()
         if not rows:
             return (
                 f"I could not find any candidate whose name looks like '{name_fragment}'. "
@@ -1081,6 +1085,8 @@ Tasks:
             if wants_contact
             else "Here are candidates that match your description:\n"
         )
+        if close_only:
+            header = f"No candidate name contains '{name_fragment}'; closest matches:\n" + header
         text = header + "\n".join(lines)
         return text, {"type": "summary", "count": len(rows)}
 
@@ -1127,8 +1133,13 @@ Tasks:
         if cand_id is not None:
             candidates_q = candidates_q.filter(Candidate.id == cand_id)
         elif name_fragment:
-            like = f"%{name_fragment}%"
-            candidates_q = candidates_q.filter(Candidate.full_name.ilike(like))
+            # Exact matches when there are any, else per-word ones. Never fuzzy
+            # ones: this path writes to whichever candidate it finds.
+            from services.name_index import best_matches, find_candidates_by_name
+
+            matches = [m for m in find_candidates_by_name(name_fragment, limit=5) if m["match"] != "fuzzy"]
+            match_ids = [m["candidate_id"] for m in best_matches(matches)]
+            candidates_q = candidates_q.filter(Candidate.id.in_(match_ids))
 
         candidates_rows = (
             candidates_q
@@ -1569,6 +1580,14 @@ Tasks:
         except Exception as e:
             print("⚠️ Failed DB reload verification:", e)
 
+        # Rescore against open JDs so stored rankings reflect the edit
+        try:
+            from services.jd_shortlist import refresh_candidates
+            refresh_candidates([cand.id])
+        except Exception as e:
+            db.session.rollback()
+            print("⚠️ Shortlist refresh failed (non-critical):", e)
+
         # ✅ Clear any cached query results for this candidate
         if hasattr(self, "query_cache") and self.query_cache:
             keys_to_remove = []
@@ -1,14 +1,12 @@
-from groq import Groq
 from pydantic import BaseModel, Field
 from typing import List, Optional
-import os
 from dotenv import load_dotenv
 from datetime import datetime
 import json  
 import pandas as pd  
+from services.model_registry import get_groq_client
 
 load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
 class JDSkills(BaseModel):
     required_skills: List[str] = Field(..., description="Comma-separated mandatory skills from Skills/Job Description")
@@ -80,7 +78,7 @@ def parse_csv_row_to_jd(row_dict: dict) -> dict:
     """Groq LLM: CSV row → full structured JD (47 fields)"""
     text = "\n".join([f"{k}: {v}" for k, v in row_dict.items() if pd.notna(v) and v])
     
-    response = client.chat.completions.create(
+    response = get_groq_client().chat.completions.create(
         model="llama3-8b-8192",
         messages=[
             {"role": "system", "content": """
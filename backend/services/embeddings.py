@@ -1,28 +1,58 @@
-from sentence_transformers import SentenceTransformer
 from typing import List
-from config.local_config import EMBEDDING_MODEL
+from config.local_config import EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL
+from services.model_registry import get_embedding_model
 
 class EmbeddingGenerator:
     """Generate embeddings for semantic search"""
     
-    def __init__(self):
-        print(f"\nLoading embedding model: {EMBEDDING_MODEL}")
-        print("(First time may take 1-2 minutes to download ~80MB model...)")
-        
-        # This will download the model on first run
-        self.model = SentenceTransformer(EMBEDDING_MODEL)
-        
-        print("✓ Embedding model loaded successfully!\n")
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        # The SentenceTransformer itself is shared process-wide and loaded on
+        # first use (see services/model_registry.py).
+        self.model_name = model_name
+
+    @property
+    def model(self):
+        return get_embedding_model(self.model_name)
     
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for single text"""
         embedding = self.model.encode(text, convert_to_numpy=True)
         return embedding.tolist()
     
-    def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts (more efficient)"""
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+    def generate_batch_embeddings(self, texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts (more efficient).
+
+        Identical texts are encoded once, and unique texts are fed to the model
+        longest-first in `batch_size` chunks so each forward pass pads to a
+        similar length. Vectors are scattered back to the input order.
+        """
+        if not texts:
+            return []
+
+        unique_index = {}
+        unique_texts: List[str] = []
+        positions = []
+        for text in texts:
+            idx = unique_index.get(text)
+            if idx is None:
+                idx = unique_index[text] = len(unique_texts)
+                unique_texts.append(text)
+            positions.append(idx)
+
+        order = sorted(range(len(unique_texts)), key=lambda i: len(unique_texts[i]), reverse=True)
+        encoded = self.model.encode(
+            [unique_texts[i] for i in order],
+            batch_size=max(1, batch_size),
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+        vectors: List[List[float]] = [None] * len(unique_texts)
+        for row, i in enumerate(order):
+            vectors[i] = encoded[row].tolist()
+        return [vectors[i] for i in positions]
+
     def build_candidate_text(self, candidate) -> str:
         """
         Build a rich text representation of a Candidate using all extracted fields.
@@ -0,0 +1,171 @@
+"""
+Filter option facets (candidate_facet, filter_facet).
+
+The filter helper used to fetch five option lists, each endpoint loading
+skills / certifications / parsed for every candidate, walking project tool
+lists and deduping in Python on every open. The values are now kept in two
+tables, written with candidate features (services/candidate_features) on
+ingest, edit and delete:
+
+  candidate_facet  one row per (candidate, facet, key): the candidate's
+                   option values, key = norm_text(value)
+  filter_facet     one row per (facet, key) with a display value and the
+                   number of candidates holding it; rows whose count drops
+                   to zero are removed
+
+Writes recount only the (facet, key) pairs the written candidates held
+before or hold now, from candidate_facet's (facet, key) index. Reads are one
+query over filter_facet (facet_options), optionally narrowed to a key prefix
+and the top N values per facet by candidate count. Until the feature backfill
+has reached every candidate, those without a record are scanned and counted
+in as well.
+
+facet_etag() tags option lists with the ranking data version and the
+feature version, so unchanged lists revalidate without a read. Writes that
+skip the version bump (bulk SQL) show after the next bump.
+"""
+import hashlib
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func
+
+from models import CandidateFacet, FilterFacet, db
+
+FACETS = ("skill", "certification", "project", "bucket", "role")
+# candidate_facet.key / value width; longer values are free text, not options.
+FACET_VALUE_MAX_LEN = 255
+FACET_CHUNK_SIZE = 500
+
+
+# ------------------------- MAINTENANCE ------------------------- #
+
+def held_facets(candidate_ids: Sequence[int]) -> Set[Tuple[str, str]]:
+    """(facet, key) pairs the candidates hold in candidate_facet."""
+    ids = list(candidate_ids)
+    out: Set[Tuple[str, str]] = set()
+    for start in range(0, len(ids), FACET_CHUNK_SIZE):
+        chunk = ids[start:start + FACET_CHUNK_SIZE]
+        out.update(
+            db.session.query(CandidateFacet.facet, CandidateFacet.key)
+            .filter(CandidateFacet.candidate_id.in_(chunk))
+            .distinct()
+        )
+    return out
+
+
+def recount_facets(pairs: Iterable[Tuple[str, str]]):
+    """Bring filter_facet rows for `pairs` in line with candidate_facet (no commit)."""
+    by_facet: Dict[str, List[str]] = {}
+    for facet, key in set(pairs):
+        by_facet.setdefault(facet, []).append(key)
+    for facet, keys in by_facet.items():
+        keys.sort()
+        for start in range(0, len(keys), FACET_CHUNK_SIZE):
+            chunk = keys[start:start + FACET_CHUNK_SIZE]
+            counts = {
+                key: (n, value) for key, n, value in
+                db.session.query(CandidateFacet.key, func.count(), func.min(CandidateFacet.value))
+                .filter(CandidateFacet.facet == facet, CandidateFacet.key.in_(chunk))
+                .group_by(CandidateFacet.key)
+            }
+            rows = {
+                row.key: row for row in
+                FilterFacet.query.filter(FilterFacet.facet == facet, FilterFacet.key.in_(chunk))
+            }
+            for key in chunk:
+                row = rows.get(key)
+                if key not in counts:
+                    if row is not None:
+                        db.session.delete(row)
+                    continue
+                n, value = counts[key]
+                if row is None:
+                    db.session.add(FilterFacet(facet=facet, key=key, value=value, candidate_count=n))
+                else:
+                    row.candidate_count = n
+
+
+def forget_all_facets():
+    CandidateFacet.query.delete(synchronize_session=False)
+    FilterFacet.query.delete(synchronize_session=False)
+
+
+# ------------------------- READS ------------------------- #
+
+def facet_etag() -> Optional[str]:
+    """Tag of the current option lists (None when the data version is unavailable)."""
+    from services.candidate_features import feature_version
+    from services.rank_cache import data_version
+
+    try:
+        version = data_version()
+    except Exception as e:
+        print(f"⚠️ Facet ETag could not read the data version (non-critical): {e}")
+        return None
+    return hashlib.sha256(f"{version}|{feature_version()}".encode()).hexdigest()[:20]
+
+
+def facet_options(facets: Sequence[str] = FACETS, prefix: Optional[str] = None,
+                  limit: Optional[int] = None) -> Dict[str, List[Dict]]:
+    """
+    Options per facet as {"value", "count"}, most-held first: every value, or
+    those whose key starts with norm_text(prefix), at most `limit` per facet.
+    """
+    from services.candidate_features import features_pending, norm_text
+
+    facets = [f for f in facets if f in FACETS]
+    out: Dict[str, List[Dict]] = {f: [] for f in facets}
+    if not facets:
+        return out
+    conditions = [FilterFacet.facet.in_(facets)]
+    prefix = norm_text(prefix or "")
+    if prefix:
+        if db.engine.dialect.name == "sqlite":
+            # A key range the (facet, key) primary key serves; LIKE would scan.
+            conditions += [FilterFacet.key >= prefix, FilterFacet.key < prefix + "\U0010ffff"]
+        else:
+            conditions.append(FilterFacet.key.startswith(prefix, autoescape=True))
+    rank = func.row_number().over(
+        partition_by=FilterFacet.facet,
+        order_by=(FilterFacet.candidate_count.desc(), FilterFacet.key),
+    ).label("rank")
+    ranked = (
+        db.session.query(FilterFacet.facet, FilterFacet.value, FilterFacet.candidate_count, rank)
+        .filter(*conditions)
+        .subquery()
+    )
+    q = db.session.query(ranked.c.facet, ranked.c.value, ranked.c.candidate_count)
+    if not features_pending():
+        if limit is not None:
+            q = q.filter(ranked.c.rank <= limit)
+        for facet, value, n in q.order_by(ranked.c.facet, ranked.c.rank):
+            out[facet].append({"value": value, "count": n})
+        return out
+
+    # Backfill pending: merge in candidates without a record, then rank.
+    counts: Dict[str, Dict[str, List]] = {f: {} for f in facets}
+    rows = db.session.query(FilterFacet.facet, FilterFacet.key, FilterFacet.value, FilterFacet.candidate_count)
+    for facet, key, value, n in rows.filter(*conditions):
+        counts[facet][key] = [value, n]
+    for values in _unfeatured_facets():
+        for facet in facets:
+            for key, value in values.get(facet, {}).items():
+                if key.startswith(prefix):
+                    counts[facet].setdefault(key, [value, 0])[1] += 1
+    for facet in facets:
+        ranked_keys = sorted(counts[facet], key=lambda k: (-counts[facet][k][1], k))
+        for key in ranked_keys[:limit] if limit is not None else ranked_keys:
+            value, n = counts[facet][key]
+            out[facet].append({"value": value, "count": n})
+    return out
+
+
+def _unfeatured_facets():
+    """facet_values() of each candidate without a feature record, in chunks."""
+    from models import Candidate
+    from services.candidate_features import no_features, scan_facets
+
+    ids = [cid for cid, in db.session.query(Candidate.id).filter(no_features())]
+    for start in range(0, len(ids), FACET_CHUNK_SIZE):
+        for c in Candidate.query.filter(Candidate.id.in_(ids[start:start + FACET_CHUNK_SIZE])):
+            yield scan_facets(c)
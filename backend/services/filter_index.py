@@ -0,0 +1,269 @@
+"""
+In-memory inverted index over candidate filter terms (candidate_features.terms).
+
+For each term field (skills, project tech, certifications, project and work
+text) the index maps every distinct normalized value to the ids of the
+candidates that have it. Filters match a query term as a substring of a
+value, so a lookup scans that field's value dictionary once and ORs the
+postings of the values containing the term into a bitmap: a Python int
+with bit i set for candidate id i. Lookups are
+memoized until the index changes; AND / OR groups are then plain & and |
+over bitmaps. Skill proficiency reads per-threshold postings of how many
+projects list a tool.
+
+    index = filter_index()                      # synced, process-wide
+    bits = index.contains("skills", "python") & index.contains("certifications", "aws")
+    index.newest(bits, 50)                      # ids, newest candidates first
+    index.value_counts(bits)                    # facet value counts over those candidates
+
+Each worker keeps its own index and syncs it before reads when the ranking
+data version (services/rank_cache) has moved, i.e. after the candidate
+ingest / edit / delete hooks, and at least every FILTER_INDEX_RECHECK_SECONDS
+for writes that skip them. A sync scans candidate and feature timestamps and
+reindexes only candidates whose stored record changed, was added or was
+deleted. It never stores records: the write hooks keep them current and the
+feature backfill (candidate_features.backfill_features) fills them after
+deploy. Until it has, candidates without a record are indexed from terms
+computed in memory (scan_terms), redone when their updated_at moves and
+replaced once their record lands.
+"""
+import heapq
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models import Candidate, CandidateFeatures, db
+from services.candidate_features import FEATURE_CHUNK_SIZE, norm_text, scan_terms
+from services.skill_ontology import ONTOLOGY
+
+TERM_FIELDS = ("skills", "project_tech", "certifications", "projects", "work")
+# Projects whose tools list a skill, needed per proficiency level.
+PROFICIENCY_USES = {"BASIC": 1, "INTERMEDIATE": 2, "ADVANCED": 4}
+FILTER_INDEX_RECHECK_SECONDS = 300.0
+_LOOKUP_CACHE_SIZE = 1024
+
+
+def bitmap_of(ids: Iterable[int]) -> int:
+    arr = np.fromiter(ids, dtype=np.int64)
+    if not len(arr):
+        return 0
+    flags = np.zeros(int(arr.max()) + 1, dtype=bool)
+    flags[arr] = True
+    return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+
+
+def ids_of(bits: int) -> np.ndarray:
+    if not bits:
+        return np.zeros(0, dtype=np.int64)
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    return np.flatnonzero(np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little"))
+
+
+class CandidateTermIndex:
+    """Term -> candidate postings for every indexed candidate, with bitmap lookups."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, Set[int]]] = {f: {} for f in TERM_FIELDS}
+        self.tool_uses: Dict[int, Dict[str, Set[int]]] = {n: {} for n in sorted(set(PROFICIENCY_USES.values()))}
+        # candidate id -> (indexed computed_at, {field: values}, {min uses: tools})
+        self.docs: Dict[int, Tuple[str, Dict[str, Set[str]], Dict[int, Set[str]]]] = {}
+        self.created: Dict[int, object] = {}
+        # candidate id -> (role_bucket, primary_role, total_experience_years), for facet counts
+        self.scalars: Dict[int, Tuple[Optional[str], Optional[str], Optional[float]]] = {}
+        self.all_ids = 0
+        self._lookups: "OrderedDict[Tuple, int]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._version: Optional[int] = None
+        self._checked: Optional[float] = None
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ------------------------- MAINTENANCE ------------------------- #
+
+    def _remove(self, cid: int):
+        doc = self.docs.pop(cid, None)
+        if doc is None:
+            return
+        _, fields, uses = doc
+        for groups, keys in ((self.postings, fields), (self.tool_uses, uses)):
+            for group, values in keys.items():
+                postings = groups[group]
+                for v in values:
+                    ids = postings.get(v)
+                    if ids is not None:
+                        ids.discard(cid)
+                        if not ids:
+                            del postings[v]
+        self.all_ids &= ~(1 << cid)
+
+    def _add(self, cid: int, computed_at: str, terms: Optional[Dict]):
+        self._remove(cid)
+        terms = terms or {}
+        fields = {f: set(terms.get(f) or []) for f in TERM_FIELDS}
+        used_in = Counter(t for tools in terms.get("project_tools") or [] for t in set(tools))
+        uses = {n: {t for t, k in used_in.items() if k >= n} for n in self.tool_uses}
+        for groups, keys in ((self.postings, fields), (self.tool_uses, uses)):
+            for group, values in keys.items():
+                postings = groups[group]
+                for v in values:
+                    postings.setdefault(v, set()).add(cid)
+        self.docs[cid] = (computed_at, fields, uses)
+        self.all_ids |= 1 << cid
+
+    def sync(self):
+        """Bring the index up to date with candidate_features (see module docstring)."""
+        from services.rank_cache import data_version
+
+        # Read before scanning: a bump landing meanwhile triggers the next sync.
+        try:
+            version = data_version()
+        except Exception as e:
+            print(f"⚠️ Filter index could not read the data version (non-critical): {e}")
+            version = None
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._checked is not None and now - self._checked < FILTER_INDEX_RECHECK_SECONDS
+            if fresh and version is not None and version == self._version:
+                return
+            self._sync()
+            self._version = version
+            self._checked = now
+
+    def _sync(self):
+        rows = (
+            db.session.query(
+                Candidate.id, Candidate.created_at, Candidate.updated_at,
+                Candidate.role_bucket, Candidate.primary_role, Candidate.total_experience_years,
+                CandidateFeatures.computed_at,
+            )
+            .outerjoin(CandidateFeatures, CandidateFeatures.candidate_id == Candidate.id)
+            .all()
+        )
+        seen = set()
+        changed: List[int] = []
+        unfeatured: Dict[int, str] = {}
+        for cid, created_at, updated_at, bucket, role, years, computed_at in rows:
+            self.created[cid] = created_at
+            self.scalars[cid] = (bucket, role, years)
+            seen.add(cid)
+            if computed_at is None:
+                # No record yet (backfill pending): index terms computed here.
+                stamp = f"scan:{updated_at.isoformat() if updated_at else ''}"
+                if cid not in self.docs or self.docs[cid][0] != stamp:
+                    unfeatured[cid] = stamp
+            elif cid not in self.docs or self.docs[cid][0] != computed_at.isoformat():
+                changed.append(cid)
+
+        gone = set(self.docs) - seen
+        for cid in gone:
+            self._remove(cid)
+        candidates = {row[0] for row in rows}
+        for cid in set(self.created) - candidates:
+            del self.created[cid]
+            self.scalars.pop(cid, None)
+
+        for start in range(0, len(changed), FEATURE_CHUNK_SIZE):
+            chunk = changed[start:start + FEATURE_CHUNK_SIZE]
+            for cid, computed_at, terms in db.session.query(
+                CandidateFeatures.candidate_id, CandidateFeatures.computed_at, CandidateFeatures.terms
+            ).filter(CandidateFeatures.candidate_id.in_(chunk)):
+                self._add(cid, computed_at.isoformat(), terms)
+        scanned = list(unfeatured)
+        for start in range(0, len(scanned), FEATURE_CHUNK_SIZE):
+            for c in Candidate.query.filter(Candidate.id.in_(scanned[start:start + FEATURE_CHUNK_SIZE])):
+                self._add(c.id, unfeatured[c.id], scan_terms(c))
+        changed += scanned
+
+        if gone or changed:
+            self._lookups.clear()
+            print(f"🗂️ Filter index synced: {len(self.docs)} candidates "
+                  f"({len(changed)} reindexed, {len(gone)} removed)")
+
+    # ------------------------- LOOKUPS ------------------------- #
+
+    def _memo(self, key: Tuple, build) -> int:
+        with self._lock:
+            if key in self._lookups:
+                self._lookups.move_to_end(key)
+                return self._lookups[key]
+            bits = build()
+            self._lookups[key] = bits
+            while len(self._lookups) > _LOOKUP_CACHE_SIZE:
+                self._lookups.popitem(last=False)
+            return bits
+
+    def _union(self, postings: Dict[str, Set[int]], match) -> int:
+        ids: Set[int] = set()
+        for v, posting in postings.items():
+            if match(v):
+                ids.update(posting)
+        return bitmap_of(ids)
+
+    def contains(self, field: str, term: str) -> int:
+        """Candidates with a `field` value containing the normalized term."""
+        t = norm_text(term)
+        if not t:
+            return 0
+        return self._memo(("contains", field, t), lambda: self._union(self.postings[field], lambda v: t in v))
+
+    def skill_equals(self, term: str) -> int:
+        """Candidates with a skill or project tech that is a synonym of `term`."""
+        target = ONTOLOGY.canonical(norm_text(term))
+
+        def build():
+            bits = 0
+            for field in ("skills", "project_tech"):
+                bits |= self._union(self.postings[field], lambda v: ONTOLOGY.canonical(v) == target)
+            return bits
+
+        return self._memo(("equals", target), build)
+
+    def proficient(self, skill: str, level: str) -> int:
+        """Candidates whose projects use `skill` at least as often as `level` requires."""
+        with self._lock:
+            return bitmap_of(self.tool_uses[PROFICIENCY_USES[level.upper()]].get(norm_text(skill), ()))
+
+    def value_counts(self, bits: int) -> Dict[str, Counter]:
+        """
+        Per facet, how many candidates in `bits` hold each value, in one pass
+        over them: skill (skills and project tech), certification, bucket,
+        role, and years (total_experience_years, None when unknown).
+        """
+        counts = {f: Counter() for f in ("skill", "certification", "bucket", "role", "years")}
+        with self._lock:
+            for cid in ids_of(bits):
+                cid = int(cid)
+                doc = self.docs.get(cid)
+                if doc is not None:
+                    fields = doc[1]
+                    counts["skill"].update(fields["skills"] | fields["project_tech"])
+                    counts["certification"].update(fields["certifications"])
+                bucket, role, years = self.scalars.get(cid, (None, None, None))
+                if bucket:
+                    counts["bucket"][bucket] += 1
+                if role:
+                    counts["role"][role] += 1
+                counts["years"][years] += 1
+        return counts
+
+    def newest(self, bits: int, limit: int) -> List[int]:
+        """Up to `limit` ids from `bits`, most recently created first."""
+        def key(cid):
+            created = self.created.get(cid)
+            return (created is not None, created or 0, cid)
+
+        with self._lock:
+            return heapq.nlargest(limit, (int(i) for i in ids_of(bits)), key=key)
+
+
+_index = CandidateTermIndex()
+
+
+def filter_index() -> CandidateTermIndex:
+    """The process-wide index, synced."""
+    _index.sync()
+    return _index
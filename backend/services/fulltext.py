@@ -0,0 +1,287 @@
+"""
+Full-text search over resume sections (candidate_search).
+
+Keyword lookups used to be ilike '%x%' scans over Candidate.raw_text and the
+JSON columns. Each candidate's searchable text is stored instead, one column
+per section, alongside its candidate_features record (same staleness rules,
+same insert / edit / delete hooks):
+
+  summary         primary role and domain, parsed summary
+  skills          skill terms plus their ontology expansions, so aliases match
+  projects        project text and project tech
+  work            work experience text
+  certifications  certification names
+  resume          raw_text
+
+and indexed per dialect:
+
+  SQLite    candidate_search_fts, an external-content FTS5 table kept in step
+            with candidate_search by triggers; ranked with bm25()
+  Postgres  candidate_search.document, a generated weighted tsvector with a
+            GIN index; ranked with ts_rank_cd() (Postgres has no BM25), which
+            weighs sections by class instead of per column
+
+Section text is stored as search_tokens() output and queries are tokenized
+the same way, so both engines see the same tokens. A query is a set of terms
+that must all match: a bare word matches as a prefix ("develop" matches
+"developer"), a "quoted phrase" matches exactly, and a word with punctuation
+is a phrase of its parts ("node.js" -> node js).
+
+    search_candidates("spark \"data lake\"", fields=["projects", "work"])
+    Candidate.query.filter(Candidate.id.in_(matching_ids("airflow")))
+
+rebuild_search_index() (flask rebuild-search-index) recreates the index
+structures and recomputes every document. Until the feature backfill has
+given every candidate a document, unindexed_matches() is the old scan for
+the candidates still without one.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, String, and_, bindparam, cast, or_, text
+
+from models import CandidateSearchDoc, db
+
+SEARCH_FIELDS = ("summary", "skills", "projects", "work", "certifications", "resume")
+# bm25() column weights (SQLite), in SEARCH_FIELDS order.
+FIELD_WEIGHTS = {"summary": 2.0, "skills": 4.0, "projects": 2.0, "work": 1.5, "certifications": 3.0, "resume": 1.0}
+# tsvector weight class per section (Postgres).
+FIELD_CLASSES = {"skills": "A", "certifications": "A", "projects": "B", "work": "B", "summary": "C", "resume": "D"}
+# Shorter bare words match whole tokens only; a prefix that short matches most of the index.
+PREFIX_MIN_LEN = 3
+FTS_TABLE = "candidate_search_fts"
+
+# Tokens that would otherwise lose the punctuation that tells them apart.
+_TOKEN_ALIASES = (
+    (re.compile(r"(?<![^\W_])c\+\+"), " cpp "),
+    (re.compile(r"(?<![^\W_])c#"), " csharp "),
+    (re.compile(r"(?<![^\W_])f#"), " fsharp "),
+    (re.compile(r"(?<![^\W_])\.net(?![^\W_])"), " dotnet "),
+)
+_TOKEN = re.compile(r"[^\W_]+")
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _dialect() -> str:
+    return db.engine.dialect.name
+
+
+def _tokens(s: str) -> List[str]:
+    s = str(s or "").lower()
+    for pattern, alias in _TOKEN_ALIASES:
+        s = pattern.sub(alias, s)
+    return _TOKEN.findall(s)
+
+
+def search_tokens(values: Iterable) -> str:
+    """Section text as it is stored and indexed: lowercase word tokens, space-joined."""
+    out: List[str] = []
+    for v in values:
+        if v:
+            out.extend(_tokens(v))
+    return " ".join(out)
+
+
+def search_document(sections: Dict[str, Iterable]) -> Dict[str, str]:
+    """candidate_search columns from raw text values per section."""
+    return {field: search_tokens(sections.get(field) or ()) for field in SEARCH_FIELDS}
+
+
+def _terms(query: str) -> List[Tuple[List[str], bool]]:
+    """(tokens, prefix) per query term."""
+    terms = []
+    for quoted, bare in _TERM.findall(str(query or "")):
+        tokens = _tokens(quoted if quoted else bare)
+        if tokens:
+            terms.append((tokens, not quoted and len(tokens[-1]) >= PREFIX_MIN_LEN))
+    return terms
+
+
+def _check_fields(fields: Optional[Sequence[str]]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    unknown = set(fields) - set(SEARCH_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown search fields: {sorted(unknown)}")
+    return [f for f in SEARCH_FIELDS if f in fields]
+
+
+# ------------------------- QUERY COMPILATION ------------------------- #
+
+def _fts5_query(terms, fields, any_term: bool = False) -> str:
+    expr = (" OR " if any_term else " AND ").join(f'"{" ".join(tokens)}"' + ("*" if prefix else "") for tokens, prefix in terms)
+    if fields:
+        return "{" + " ".join(fields) + "} : (" + expr + ")"
+    return expr
+
+
+def _tsquery(terms, any_term: bool = False) -> str:
+    return (" | " if any_term else " & ").join(
+        "(" + " <-> ".join(tokens) + (":*" if prefix else "") + ")" for tokens, prefix in terms
+    )
+
+
+def _search_sql(terms, fields, ranked: bool, any_term: bool = False) -> Tuple[str, Dict]:
+    if _dialect() == "postgresql":
+        where = "document @@ q"
+        if fields:
+            # The tsvector's weight classes are shared by sections: recheck the
+            # requested ones on the rows the GIN index returns.
+            where += " AND (" + " OR ".join(
+                f"to_tsvector('simple', coalesce({f}, '')) @@ q" for f in fields
+            ) + ")"
+        sql = (
+            "SELECT candidate_id" + (", ts_rank_cd(document, q, 1) AS score" if ranked else "")
+            + " FROM candidate_search, to_tsquery('simple', :q) AS q WHERE " + where
+        )
+        return sql, {"q": _tsquery(terms, any_term)}
+
+    weights = ", ".join(str(FIELD_WEIGHTS[f]) for f in SEARCH_FIELDS)
+    sql = (
+        "SELECT rowid AS candidate_id"
+        + (f", -bm25({FTS_TABLE}, {weights}) AS score" if ranked else "")
+        + f" FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :q"
+    )
+    return sql, {"q": _fts5_query(terms, fields, any_term)}
+
+
+# ------------------------- READS ------------------------- #
+
+def search_candidates(query: str, fields: Optional[Sequence[str]] = None,
+                      limit: Optional[int] = 50) -> List[Tuple[int, float]]:
+    """(candidate_id, score) of documents matching every query term, best first."""
+    terms = _terms(query)
+    if not terms:
+        return []
+    sql, params = _search_sql(terms, _check_fields(fields), ranked=True)
+    sql += " ORDER BY score DESC, candidate_id"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = int(limit)
+    return [(int(cid), float(score)) for cid, score in db.session.execute(text(sql), params)]
+
+
+def matching_ids(query: str, fields: Optional[Sequence[str]] = None):
+    """
+    Unranked ids of matching candidates as a SQL subquery for
+    Candidate.id.in_(...), or None when the query has no searchable tokens.
+    """
+    terms = _terms(query)
+    if not terms:
+        return None
+    return _id_select(terms, fields)
+
+
+def phrase_ids(phrases: Iterable[str], fields: Optional[Sequence[str]] = None):
+    """
+    matching_ids() for any of `phrases`, each one term: its tokens in order,
+    the last one as a prefix ("python 3" matches "python 3.10"). None when no
+    phrase has tokens.
+    """
+    terms = []
+    for phrase in phrases:
+        tokens = _tokens(phrase)
+        if tokens:
+            terms.append((tokens, len(tokens[-1]) >= PREFIX_MIN_LEN))
+    if not terms:
+        return None
+    return _id_select(terms, fields, any_term=True)
+
+
+def unindexed_matches(phrases: Iterable[str]):
+    """
+    Candidate condition for candidates with no document yet whose raw_text
+    or parsed JSON contains any of `phrases` (ilike), to OR with a
+    matching_ids() / phrase_ids() filter; None once every candidate has a
+    document (candidate_features.features_pending).
+    """
+    from models import Candidate
+    from services.candidate_features import features_pending, no_features
+
+    phrases = [p.strip() for p in phrases if p and p.strip()]
+    if not phrases or not features_pending():
+        return None
+
+    def contains(column, phrase):
+        phrase = phrase.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return column.ilike(f"%{phrase}%", escape="\\")
+
+    return and_(no_features(), or_(*[
+        contains(column, p) for p in phrases for column in (Candidate.raw_text, cast(Candidate.parsed, String))
+    ]))
+
+
+def _id_select(terms, fields, any_term: bool = False):
+    sql, params = _search_sql(terms, _check_fields(fields), ranked=False, any_term=any_term)
+    # Unique bind names: several of these may sit in one statement.
+    binds = [bindparam(k, v, unique=True) for k, v in params.items()]
+    return text(sql).bindparams(*binds).columns(candidate_id=Integer)
+
+
+# ------------------------- INDEX STRUCTURES ------------------------- #
+
+def _sqlite_ddl() -> List[str]:
+    cols = ", ".join(SEARCH_FIELDS)
+    new = ", ".join(f"new.{f}" for f in SEARCH_FIELDS)
+    old = ", ".join(f"old.{f}" for f in SEARCH_FIELDS)
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.candidate_id, {old});"
+    )
+    insert_new = f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.candidate_id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({cols}, content='candidate_search', "
+        "content_rowid='candidate_id', tokenize='unicode61 remove_diacritics 0')",
+        f"CREATE TRIGGER IF NOT EXISTS candidate_search_ai AFTER INSERT ON candidate_search BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS candidate_search_ad AFTER DELETE ON candidate_search BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS candidate_search_au AFTER UPDATE ON candidate_search BEGIN "
+        f"{delete_old} {insert_new} END",
+    ]
+
+
+def _postgres_ddl() -> List[str]:
+    document = " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({f}, '')), '{FIELD_CLASSES[f]}')" for f in SEARCH_FIELDS
+    )
+    return [
+        f"ALTER TABLE candidate_search ADD COLUMN IF NOT EXISTS document tsvector "
+        f"GENERATED ALWAYS AS ({document}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_candidate_search_document ON candidate_search USING gin (document)",
+    ]
+
+
+def ensure_search_index():
+    """Create candidate_search and its dialect's index if missing."""
+    CandidateSearchDoc.__table__.create(db.engine, checkfirst=True)
+    ddl = _postgres_ddl() if _dialect() == "postgresql" else _sqlite_ddl()
+    for statement in ddl:
+        db.session.execute(text(statement))
+    db.session.commit()
+
+
+def rebuild_search_index(recompute: bool = True) -> int:
+    """
+    Recreate the index and reindex every document; with recompute, first
+    rebuild every document (and feature record) from the candidates.
+    Returns the number of indexed documents.
+    """
+    from models import Candidate
+    from services.candidate_features import refresh_features
+
+    ensure_search_index()
+    if recompute:
+        ids = [cid for cid, in db.session.query(Candidate.id)]
+        refresh_features(ids)
+        CandidateSearchDoc.query.filter(
+            ~CandidateSearchDoc.candidate_id.in_(db.session.query(Candidate.id))
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+    if _dialect() == "postgresql":
+        db.session.execute(text("REINDEX INDEX ix_candidate_search_document"))
+    else:
+        db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+    db.session.commit()
+    count = CandidateSearchDoc.query.count()
+    print(f"🔎 Search index rebuilt: {count} documents")
+    return count
@@ -1,12 +1,16 @@
 from typing import Dict, List, Any, Optional, Tuple
-from groq import Groq
-import os
+from services.model_registry import get_groq_client
 import json
 import re
 from datetime import datetime, timedelta
 from functools import lru_cache
-from models import Candidate, db
-from sqlalchemy import cast, String, func, or_, and_
+from models import Candidate, CandidateCertification, CandidateSkill, db
+from services.candidate_features import features_pending, no_features, norm_text, normalize_cert_name
+from services.cert_catalog import CERT_CATALOG
+from services.fulltext import matching_ids, phrase_ids, unindexed_matches
+from services.name_index import best_matches, find_candidates_by_name
+from services.skill_ontology import ONTOLOGY
+from sqlalchemy import func, or_, and_, exists, false
 from collections.abc import Mapping
 
 class GeneralQueryHandler:
@@ -23,29 +27,8 @@ class GeneralQueryHandler:
     - Analytics and insights generation
     """
     
-    # Skill aliases for better matching
-    SKILL_ALIASES = {
-        "python": ["py", "python3", "cpython"],
-        "javascript": ["js", "node", "nodejs", "node.js"],
-        "react": ["reactjs", "react.js"],
-        "aws": ["amazon web services", "amazon aws"],
-        "gcp": ["google cloud", "google cloud platform"],
-        "azure": ["microsoft azure", "ms azure"],
-        "kubernetes": ["k8s", "kube"],
-        "tensorflow": ["tf"],
-        "pytorch": ["torch"],
-        "sql": ["mysql", "postgresql", "postgres", "mssql", "oracle"],
-        "nosql": ["mongodb", "cassandra", "dynamodb", "redis"],
-        "spark": ["apache spark", "pyspark"],
-        "docker": ["containers", "containerization"],
-        "machine learning": ["ml", "ai", "artificial intelligence"],
-        "deep learning": ["dl", "neural networks"],
-        "data science": ["ds"],
-        "etl": ["data pipeline", "data pipelines"],
-    }
-    
     def __init__(self):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.client = get_groq_client()
         self._cache = {}
         self._cache_ttl = 300
         self._session_memory = {}  # ✅ NEW: Store last filters per session
@@ -427,14 +410,7 @@ class GeneralQueryHandler:
         """
         Normalize skill name using aliases.
         """
-        skill_lower = skill.lower().strip()
-        
-        # Check if it's an alias
-        for canonical, aliases in self.SKILL_ALIASES.items():
-            if skill_lower == canonical or skill_lower in aliases:
-                return canonical.title()
-        
-        return skill.title()
+        return ONTOLOGY.canonical(skill, include_related=True).title()
     
     from collections.abc import Mapping
 
@@ -468,58 +444,34 @@ class GeneralQueryHandler:
         name_filter = filters.get("name_filter") or filters.get("name") or filters.get("candidate_name")
         
         if name_filter:
-            # Try exact match first (case-insensitive)
-            exact_query = Candidate.query.filter(Candidate.full_name.ilike(f"%{name_filter}%"))
-            exact_matches = exact_query.all()
-            
-            if exact_matches:
-                query = exact_query
-            else:
-                # Try email matching (check if name_filter could be part of an email)
-                email_query = Candidate.query.filter(Candidate.email.ilike(f"%{name_filter}%"))
-                email_matches = email_query.all()
-                
-                if email_matches:
-                    query = email_query
-                    # Suggest the actual name in a natural way
-                    if len(email_matches) == 1:
-                        actual_name = email_matches[0].full_name
-                        email_addr = email_matches[0].email
-                        suggestion = f"I couldn't find a candidate named '{name_filter}', but I found a match by email address. The candidate with email '{email_addr}' is **{actual_name}**."
+            # One trigram-index lookup ranks exact name, exact email, per-word
+            # name and fuzzy name/email matches (services/name_index).
+            matches = best_matches(find_candidates_by_name(name_filter, limit=None))
+            kind = matches[0]["match"] if matches else None
+            if kind == "exact" and matches[0]["field"] == "name":
+                matches = [m for m in matches if m["field"] == "name"]
+            if matches:
+                query = Candidate.query.filter(Candidate.id.in_([m["candidate_id"] for m in matches]))
+
+            if kind == "exact" and matches[0]["field"] == "email":
+                # Suggest the actual name in a natural way
+                if len(matches) == 1:
+                    actual_name = matches[0]["full_name"]
+                    email_addr = matches[0]["email"]
+                    suggestion = f"I couldn't find a candidate named '{name_filter}', but I found a match by email address. The candidate with email '{email_addr}' is **{actual_name}**."
+            elif kind == "fuzzy" and all(m["field"] == "email" for m in matches):
+                if len(matches) == 1:
+                    suggestion = f"I couldn't find a candidate named '{name_filter}', but I found **{matches[0]['full_name']}** with email '{matches[0]['email']}'."
                 else:
-                    # Fuzzy match: try partial name
-                    name_parts = name_filter.split()
-                    if name_parts:
-                        # Search for any part of the name
-                        name_conditions = []
-                        for part in name_parts:
-                            if len(part) > 2:  # Ignore very short parts
-                                name_conditions.append(Candidate.full_name.ilike(f"%{part}%"))
-                        
-                        if name_conditions:
-                            fuzzy_query = Candidate.query.filter(or_(*name_conditions))
-                            fuzzy_matches = fuzzy_query.all()
-                            
-                            if fuzzy_matches:
-                                query = fuzzy_query
-                                # Suggest closest match
-                                if len(fuzzy_matches) == 1:
-                                    suggestion = f"I couldn't find an exact match for '{name_filter}', but I found **{fuzzy_matches[0].full_name}** which might be who you're looking for."
-                                elif len(fuzzy_matches) <= 3:
-                                    names = [c.full_name for c in fuzzy_matches]
-                                    suggestion = f"I couldn't find an exact match for '{name_filter}'. Did you mean one of these: {', '.join(f'**{n}**' for n in names)}?"
-                            else:
-                                # Last resort: search in email (even if no @ in name_filter)
-                                # This handles "Merril" matching emails like "merril.almeida@..."
-                                email_part_query = Candidate.query.filter(Candidate.email.ilike(f"%{name_filter.lower()}%"))
-                                email_part_matches = email_part_query.all()
-                                if email_part_matches:
-                                    query = email_part_query
-                                    if len(email_part_matches) == 1:
-                                        suggestion = f"I couldn't find a candidate named '{name_filter}', but I found **{email_part_matches[0].full_name}** with email '{email_part_matches[0].email}'."
-                                    else:
-                                        names = [f"{c.full_name} ({c.email})" for c in email_part_matches[:3]]
-                                        suggestion = f"I couldn't find an exact match. Here are some candidates with similar email addresses: {', '.join(f'**{n}**' for n in names)}"
+                    names = [f"{m['full_name']} ({m['email']})" for m in matches[:3]]
+                    suggestion = f"I couldn't find an exact match. Here are some candidates with similar email addresses: {', '.join(f'**{n}**' for n in names)}"
+            elif kind in ("token", "fuzzy"):
+                # Suggest closest match
+                if len(matches) == 1:
+                    suggestion = f"I couldn't find an exact match for '{name_filter}', but I found **{matches[0]['full_name']}** which might be who you're looking for."
+                elif len(matches) <= 3:
+                    names = [m["full_name"] for m in matches]
+                    suggestion = f"I couldn't find an exact match for '{name_filter}'. Did you mean one of these: {', '.join(f'**{n}**' for n in names)}?"
         
         # Candidate ID filter (for context tracking)
         candidate_id = filters.get("candidate_id")
@@ -545,16 +497,21 @@ class GeneralQueryHandler:
         if job_title:
             query = query.filter(Candidate.primary_role.ilike(f"%{job_title}%"))
 
-        # Keyword search (name, role, email)
+        # Keyword search (name, role, email; resume text via the full-text index)
         keyword = filters.get("keyword")
         if keyword:
-            query = query.filter(
-                or_(
-                    Candidate.full_name.ilike(f"%{keyword}%"),
-                    Candidate.primary_role.ilike(f"%{keyword}%"),
-                    Candidate.email.ilike(f"%{keyword}%")
-                )
-            )
+            matches = [
+                Candidate.full_name.ilike(f"%{keyword}%"),
+                Candidate.primary_role.ilike(f"%{keyword}%"),
+                Candidate.email.ilike(f"%{keyword}%")
+            ]
+            resume_matches = matching_ids(keyword)
+            if resume_matches is not None:
+                matches.append(Candidate.id.in_(resume_matches))
+            unindexed = unindexed_matches([keyword])
+            if unindexed is not None:
+                matches.append(unindexed)
+            query = query.filter(or_(*matches))
         
         # Certification filter - DON'T filter at SQL level, we'll search all candidates in Python
         # This ensures we don't miss any matches due to variations in how certs are stored
@@ -569,28 +526,13 @@ class GeneralQueryHandler:
         skills_excluded = filters.get("skills_excluded", [])
         
         if skills_required or skills_excluded:
-            # Build skill conditions
+            # Semi-joins on candidate_skill through its (skill, candidate_id) index
             for skill in skills_required:
-                # Check all aliases
-                aliases = self.SKILL_ALIASES.get(skill.lower(), [skill])
-                skill_conditions = []
-                
-                for alias in [skill] + aliases:
-                    skill_conditions.append(cast(Candidate.parsed, String).ilike(f"%{alias}%"))
-                    skill_conditions.append(Candidate.raw_text.ilike(f"%{alias}%"))
-                
-                query = query.filter(or_(*skill_conditions))
+                query = query.filter(self._has_skill(skill))
             
             for skill in skills_excluded:
                 # Exclude candidates with this skill
-                aliases = self.SKILL_ALIASES.get(skill.lower(), [skill])
-                exclude_conditions = []
-                
-                for alias in [skill] + aliases:
-                    exclude_conditions.append(cast(Candidate.parsed, String).ilike(f"%{alias}%"))
-                    exclude_conditions.append(Candidate.raw_text.ilike(f"%{alias}%"))
-                
-                query = query.filter(~or_(*exclude_conditions))
+                query = query.filter(~self._has_skill(skill))
         
         # Sorting
         sort_by = intent.get("sort_by")
@@ -629,6 +571,70 @@ class GeneralQueryHandler:
         
         return results, suggestion
 
+    @staticmethod
+    def _has_skill(skill: str):
+        """
+        The candidate mentions the skill or any of its aliases: as a skill term
+        (exact through the (skill, candidate_id) index, or inside a longer term
+        such as "python 3.10" or "aws lambda"), or anywhere in the resume
+        through the full-text index. Negated for exclusions, so it must stay
+        a superset match.
+        """
+        aliases = sorted({norm_text(alias) for alias in ONTOLOGY.search_terms(skill)} - {""})
+        if not aliases:
+            return false()
+
+        def like(alias):
+            alias = alias.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return CandidateSkill.skill.like(f"%{alias}%", escape="\\")
+
+        conditions = [
+            exists().where(CandidateSkill.candidate_id == Candidate.id, CandidateSkill.skill.in_(aliases)),
+            exists().where(CandidateSkill.candidate_id == Candidate.id, or_(*[like(a) for a in aliases])),
+        ]
+        ids = phrase_ids(aliases)
+        if ids is not None:
+            conditions.append(Candidate.id.in_(ids))
+        unindexed = unindexed_matches(aliases)
+        if unindexed is not None:
+            conditions.append(unindexed)
+        return or_(*conditions)
+
+    @staticmethod
+    def _certification_candidates(cert_name: str):
+        """
+        Candidates that may hold `cert_name`, from candidate_certification: a
+        superset of what _cert_name_matches accepts (every way it can match
+        implies one of these LIKEs) plus entries linked to the same catalog
+        seed entry, rechecked in Python by the caller. Candidates without a
+        feature record yet (backfill pending) are all returned for the recheck.
+        """
+        pending = features_pending()
+
+        def with_pending(condition):
+            return Candidate.query.filter(or_(condition, no_features()) if pending else condition)
+
+        holders = with_pending(Candidate.id.in_(db.session.query(CandidateCertification.candidate_id)))
+        search = normalize_cert_name(cert_name or "")
+        no_spaces = search.replace(" ", "")
+        if not no_spaces:
+            return holders
+
+        def like(column, text):
+            text = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return column.like(f"%{text}%", escape="\\")
+
+        text = CandidateCertification.search_text
+        conditions = [like(func.replace(text, " ", ""), no_spaces)]
+        words = [w for w in search.split() if len(w) > 2]
+        if words:
+            conditions.append(and_(*[like(text, w) for w in words]))
+        seed = CERT_CATALOG.seed_key(cert_name)
+        if seed is not None:
+            conditions.append(CandidateCertification.certification_key == seed)
+        matching = db.session.query(CandidateCertification.candidate_id).filter(or_(*conditions))
+        return with_pending(Candidate.id.in_(matching))
+
     def _generate_response(self, user_query: str, intent: Dict, candidates: List[Candidate], context: Optional[List[Dict]] = None, suggestion: Optional[str] = None) -> Dict[str, Any]:
         """Generate intelligent, context-aware responses with smart table formatting."""
         
@@ -647,13 +653,14 @@ class GeneralQueryHandler:
         # Handle certification queries first - ALWAYS search ALL candidates for maximum accuracy
         query_lower = user_query.lower()
         if any(kw in query_lower for kw in ['certification', 'certificate', 'certified', 'has completed', 'completed']):
-            # For certification queries, ALWAYS search ALL candidates to ensure we don't miss any
-            # This is critical for accuracy - certifications might be stored in various formats
-            from models import Candidate as CandidateModel
-            all_candidates = CandidateModel.query.all()
+            # For certification queries, ALWAYS search ALL candidates to ensure we don't miss any.
+            # candidate_certification narrows them in SQL; matching is still rechecked per entry.
+            cert_name = (self._filters_to_dict(intent.get("filters")).get("certification_name") or "").strip()
+            searched = Candidate.query.count()
+            all_candidates = self._certification_candidates(cert_name).all()
             all_candidate_rows = self._extract_candidate_rows(all_candidates)
-            print(f"🔍 Certification query: Searching ALL {len(all_candidate_rows)} candidates")
-            return self._format_certification_response(all_candidate_rows, user_query, intent, suggestion)
+            print(f"🔍 Certification query: Searching ALL {searched} candidates ({len(all_candidate_rows)} with matching entries)")
+            return self._format_certification_response(all_candidate_rows, user_query, intent, suggestion, searched=searched)
         
         # Handle aggregation queries
         if aggregation == "count":
@@ -1135,13 +1142,7 @@ class GeneralQueryHandler:
     
     def _normalize_cert_name(self, cert_name: str) -> str:
         """Normalize certification name for better matching."""
-        if not cert_name:
-            return ""
-        # Remove extra spaces, convert to lowercase, remove special chars for comparison
-        normalized = " ".join(cert_name.lower().split())
-        # Remove common words
-        normalized = re.sub(r'\b(the|a|an|certification|certificate|certified)\b', '', normalized, flags=re.IGNORECASE)
-        return " ".join(normalized.split())
+        return normalize_cert_name(cert_name)
     
     def _cert_name_matches(self, search_cert: str, candidate_cert: str) -> bool:
         """Intelligent certification name matching with variations."""
@@ -1178,7 +1179,8 @@ class GeneralQueryHandler:
 
         return False
     
-    def _format_certification_response(self, candidates: List[Dict], user_query: str, intent: Dict, suggestion: Optional[str] = None) -> Dict[str, Any]:
+    def _format_certification_response(self, candidates: List[Dict], user_query: str, intent: Dict, suggestion: Optional[str] = None,
+                                       searched: Optional[int] = None) -> Dict[str, Any]:
         """Format certification queries with natural responses and intelligent matching."""
         from models import Candidate as CandidateModel
         import re
@@ -1187,8 +1189,11 @@ class GeneralQueryHandler:
         is_count_query = any(kw in query_lower for kw in ['how many', 'count', 'number of', 'total'])
         cert_name = intent.get("filters", {}).get("certification_name", "").strip()
         cert_name_lower = cert_name.lower() if cert_name else ""
+        if searched is None:
+            searched = len(candidates)
+        seed_key = CERT_CATALOG.seed_key(cert_name) if cert_name else None
         
-        print(f"🔍 Searching for certification: '{cert_name}' in {len(candidates)} candidates")
+        print(f"🔍 Searching for certification: '{cert_name}' in {searched} candidates")
         
         # Extract certifications from candidates with improved matching
         cert_data = []
@@ -1239,6 +1244,12 @@ class GeneralQueryHandler:
                         if self._cert_name_matches(cert_name, cert):
                             is_match = True
                     
+                    # Same catalog entry: "AZ-900" finds "Azure Fundamentals"
+                    if not is_match and seed_key is not None:
+                        entry_name = cert.get("name") if isinstance(cert, dict) else cert
+                        if CERT_CATALOG.resolve(str(entry_name or "")) == seed_key:
+                            is_match = True
+                    
                     if is_match:
                         if isinstance(cert, str):
                             matching_certs.append({"name": cert})
@@ -1266,14 +1277,14 @@ class GeneralQueryHandler:
         if not cert_data:
             if cert_name:
                 # Try to suggest similar certifications or variations
-                message = f"I searched through all {len(candidates)} candidates in the database but couldn't find anyone with the '{cert_name}' certification."
+                message = f"I searched through all {searched} candidates in the database but couldn't find anyone with the '{cert_name}' certification."
                 message += "\n\nThis could mean:"
                 message += "\n• The certification might be stored under a different name (e.g., 'TensorFlow' vs 'Tensor Flow')"
                 message += "\n• No candidates in the database have this certification"
                 message += "\n• The certification information might not have been extracted from resumes"
                 message += f"\n\nTry searching for variations like: '{cert_name.replace(' ', '')}' or individual keywords from the certification name."
             else:
-                message = f"I searched through all {len(candidates)} candidates but found no certification information in the database."
+                message = f"I searched through all {searched} candidates but found no certification information in the database."
             
             if suggestion:
                 message = f"{suggestion}\n\n{message}"
@@ -1284,7 +1295,7 @@ class GeneralQueryHandler:
                 "data": {
                     "total": 0,
                     "certification_name": cert_name,
-                    "candidates_searched": len(candidates)
+                    "candidates_searched": searched
                 }
             }
         
@@ -1331,7 +1342,7 @@ class GeneralQueryHandler:
                     "rows": rows,
                     "total": count,
                     "certification_name": cert_name,
-                    "candidates_searched": len(candidates)
+                    "candidates_searched": searched
                 }
             }
             print(f"✅ Found {count} candidate(s) with {cert_name} certification")
@@ -1377,7 +1388,7 @@ class GeneralQueryHandler:
                 "rows": rows,
                 "total": len(cert_data),
                 "certification_name": cert_name,
-                "candidates_searched": len(candidates)
+                "candidates_searched": searched
             }
         }
         print(f"✅ Found {len(cert_data)} candidate(s) with certifications")
@@ -1,17 +1,105 @@
-from groq import Groq
-import instructor
+import hashlib
+import json
+import re
+import threading
+
 from models.resume_schema import ResumeData
-from config.local_config import GROQ_API_KEY
+from services.model_registry import get_instructor_client
+from config.local_config import (
+    CACHE_DB_PATH,
+    PARSE_CACHE_ENABLED,
+    PARSE_CACHE_MAX_ENTRIES,
+)
+
+PARSE_MODEL = "llama-3.3-70b-versatile"
+
+# Bump whenever the prompt, system message or generation params below change,
+# so cached parses produced by the old prompt are no longer served.
+PARSE_PROMPT_VERSION = "1"
+
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
 
 def get_groq_client():
-    """Get Groq client with instructor."""
-    client = Groq(api_key=GROQ_API_KEY)
-    return instructor.from_groq(client)
+    """Get Groq client with instructor (shared process-wide)."""
+    return get_instructor_client()
 
-def parse_resume_with_groq(resume_text: str) -> ResumeData:
-    """Parse resume with MAXIMUM extraction: Name, Email, Role, Experience Summary, Primary Skills, 
-    Hierarchical Skills, Enhanced Projects with DATES, Certifications."""
 
+# ------------------------- PARSE CACHE ------------------------- #
+
+def _schema_fingerprint() -> str:
+    schema = json.dumps(ResumeData.schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:16]
+
+
+_SCHEMA_FINGERPRINT = _schema_fingerprint()
+
+
+def normalize_resume_text(resume_text: str) -> str:
+    """Whitespace-insensitive form of the resume text used for cache keys."""
+    return re.sub(r"\s+", " ", resume_text or "").strip()
+
+
+def parse_cache_key(resume_text: str) -> str:
+    digest = hashlib.sha256(normalize_resume_text(resume_text).encode("utf-8")).hexdigest()
+    return f"{PARSE_MODEL}:{PARSE_PROMPT_VERSION}:{_SCHEMA_FINGERPRINT}:{digest}"
+
+
+def get_parse_cache():
+    """Process-wide parse cache (None when disabled)."""
+    global _parse_cache
+    if not PARSE_CACHE_ENABLED:
+        return None
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                from services.sqlite_cache import SQLiteLRUCache
+                _parse_cache = SQLiteLRUCache(
+                    CACHE_DB_PATH,
+                    table="resume_parse_cache",
+                    max_entries=PARSE_CACHE_MAX_ENTRIES,
+                )
+    return _parse_cache
+
+
+def parse_cache_stats() -> dict:
+    cache = get_parse_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+def parse_resume_with_groq(resume_text: str, use_cache: bool = True) -> ResumeData:
+    """Parse resume with MAXIMUM extraction: Name, Email, Role, Experience Summary, Primary Skills, 
+    Hierarchical Skills, Enhanced Projects with DATES, Certifications.
+
+    Identical resume text (after whitespace normalization) is served from the
+    parse cache without calling Groq."""
+
+    cache = get_parse_cache() if use_cache else None
+    cache_key = parse_cache_key(resume_text) if cache is not None else None
+    if cache is not None:
+        try:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("   ⚡ Parse cache hit - skipping Groq")
+                return ResumeData(**cached)
+        except Exception as e:
+            print(f"⚠️ Parse cache read failed (non-critical): {e}")
+
+    parsed = _parse_resume_with_groq_uncached(resume_text)
+
+    if cache is not None:
+        try:
+            # exclude_unset so rebuilding the model reproduces its defaults exactly
+            cache.set(cache_key, parsed.dict(exclude_unset=True))
+        except Exception as e:
+            print(f"⚠️ Parse cache write failed (non-critical): {e}")
+    return parsed
+
+
+def _parse_resume_with_groq_uncached(resume_text: str) -> ResumeData:
     inst_client = get_groq_client()
 
     prompt = f"""
@@ -263,7 +351,7 @@ Extract complete JSON following ResumeData schema.
 
     try:
         response = inst_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+            model=PARSE_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -0,0 +1,301 @@
+"""
+Incremental vector re-indexing with dirty tracking.
+
+candidate_embedding holds, per candidate, the fingerprint of what is in the
+vector store: sha256(EMBEDDING_MODEL, VECTOR_SCHEMA_VERSION, embedded texts),
+see services/vector_db.embedding_fingerprint. Ingestion records it as it
+writes vectors (RAGResumePipeline.store_vectors_batch). A reindex run then:
+
+  1. sweeps orphans - fingerprint rows and vector docs whose candidate row
+     is gone get their vectors deleted
+  2. selects dirty candidates in SQL: no fingerprint yet, another model or
+     schema version, or updated_at newer than indexed_at (verify=True checks
+     every row)
+  3. recomputes their fingerprints and re-embeds only those that changed;
+     unchanged ones just get indexed_at bumped
+
+Every round commits its fingerprint rows, so a crashed run simply resumes:
+whatever it had not reached is still dirty on the next run.
+
+    python -m services.incremental_indexer [--full] [--verify]
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import or_
+
+from config.local_config import EMBEDDING_MODEL
+from models import Candidate, CandidateEmbedding, db
+from services.vector_db import VECTOR_SCHEMA_VERSION, embedding_fingerprint
+
+REINDEX_ROUND_SIZE = 256
+ORPHAN_PAGE_SIZE = 5000
+
+_run_lock = threading.Lock()
+_status: Dict = {"running": False}
+
+
+def parsed_dict(raw) -> dict:
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return {}
+    return raw if isinstance(raw, dict) else {}
+
+
+def reindex_status() -> Dict:
+    return dict(_status)
+
+
+def _set_status(**fields):
+    _status.update(fields)
+
+
+# ------------------------- FINGERPRINTS ------------------------- #
+
+def record_indexed(entries, indexed_at: Optional[datetime] = None):
+    """Upsert fingerprint rows for [(candidate_id, fingerprint, doc_count), ...] and commit."""
+    entries = [e for e in entries if e[0] is not None]
+    if not entries:
+        return
+    indexed_at = indexed_at or datetime.utcnow()
+    existing = {
+        row.candidate_id: row
+        for row in CandidateEmbedding.query.filter(
+            CandidateEmbedding.candidate_id.in_([cid for cid, _, _ in entries])
+        )
+    }
+    for cid, fingerprint, doc_count in entries:
+        row = existing.get(cid)
+        if row is None:
+            row = CandidateEmbedding(candidate_id=cid)
+            db.session.add(row)
+        row.fingerprint = fingerprint
+        row.model = EMBEDDING_MODEL
+        row.schema_version = VECTOR_SCHEMA_VERSION
+        row.doc_count = doc_count
+        row.indexed_at = indexed_at
+    db.session.commit()
+
+
+def index_rows(pipeline, rows, indexed_at: Optional[datetime] = None) -> int:
+    """
+    Embed and write [(candidate_id, parsed, pdf_path), ...] and record their
+    fingerprints. Rows with nothing to embed lose their vectors.
+    """
+    vector_db = pipeline.vector_db
+    empty = [cid for cid, parsed, _ in rows if not parsed]
+    rows = [row for row in rows if row[1]]
+
+    entries = []
+    if rows:
+        # One batched, length-sorted encode for the whole round
+        embeddings = pipeline.embed_parsed_batch([parsed for _, parsed, _ in rows])
+        vector_db.upsert_candidates([
+            {
+                "candidate_id": cid,
+                "parsed_data": parsed,
+                "embeddings": emb,
+                "pdf_path": pdf_path,
+            }
+            for (cid, parsed, pdf_path), emb in zip(rows, embeddings)
+        ])
+        entries.extend(
+            (cid, emb["fingerprint"], 1 + len(emb["experiences"]))
+            for (cid, _, _), emb in zip(rows, embeddings)
+        )
+    if empty:
+        vector_db.delete_candidates(empty)
+        entries.extend((cid, embedding_fingerprint([]), 0) for cid in empty)
+
+    record_indexed(entries, indexed_at)
+    return len(rows)
+
+
+# ------------------------- ORPHANS ------------------------- #
+
+def sweep_orphans(vector_db) -> int:
+    """Delete vectors and fingerprint rows of candidates that no longer exist in SQL."""
+    orphans = {
+        cid for (cid,) in
+        db.session.query(CandidateEmbedding.candidate_id)
+        .outerjoin(Candidate, Candidate.id == CandidateEmbedding.candidate_id)
+        .filter(Candidate.id.is_(None))
+    }
+
+    # Vector docs without a fingerprint row (migrated or written by older code).
+    collection = vector_db.collection
+    doc_owners = set()
+    offset = 0
+    while True:
+        page = collection.get(offset=offset, limit=ORPHAN_PAGE_SIZE, include=[])["ids"]
+        if not page:
+            break
+        offset += len(page)
+        for doc_id in page:
+            head = doc_id.split("_exp_", 1)[0]
+            if head.isdigit():
+                doc_owners.add(int(head))
+    doc_owners -= orphans
+    owners = sorted(doc_owners)
+    for start in range(0, len(owners), ORPHAN_PAGE_SIZE):
+        chunk = owners[start:start + ORPHAN_PAGE_SIZE]
+        alive = {cid for (cid,) in db.session.query(Candidate.id).filter(Candidate.id.in_(chunk))}
+        orphans.update(cid for cid in chunk if cid not in alive)
+
+    if orphans:
+        ids = sorted(orphans)
+        vector_db.delete_candidates(ids)
+        for start in range(0, len(ids), ORPHAN_PAGE_SIZE):
+            CandidateEmbedding.query.filter(
+                CandidateEmbedding.candidate_id.in_(ids[start:start + ORPHAN_PAGE_SIZE])
+            ).delete(synchronize_session=False)
+        db.session.commit()
+        print(f"🧹 Removed vectors of {len(ids)} deleted candidates")
+    return len(orphans)
+
+
+# ------------------------- REINDEX ------------------------- #
+
+def reindex(pipeline=None, full: bool = False, verify: bool = False,
+            round_size: int = REINDEX_ROUND_SIZE) -> Dict:
+    """
+    Bring the vector store in line with SQL. Must run inside an app context.
+
+    full=True drops the collection and every fingerprint first (the old
+    /api/rebuild-chroma behaviour). verify=True re-hashes every candidate
+    instead of trusting updated_at, for rows changed outside the ORM.
+    """
+    if not _run_lock.acquire(blocking=False):
+        raise RuntimeError("A reindex is already running")
+    try:
+        return _reindex(pipeline, full, verify, round_size)
+    finally:
+        _run_lock.release()
+
+
+def _reindex(pipeline=None, full: bool = False, verify: bool = False,
+             round_size: int = REINDEX_ROUND_SIZE) -> Dict:
+    """reindex() with _run_lock held by the caller."""
+    try:
+        if pipeline is None:
+            from services.model_registry import get_pipeline
+            pipeline = get_pipeline()
+        vector_db = pipeline.vector_db
+        started = time.time()
+        _status.clear()
+        _set_status(running=True, phase="starting", full=full, verify=verify,
+                    started_at=started, finished_at=None, error=None,
+                    scanned=0, embedded=0, unchanged=0, orphans_removed=0)
+
+        if full:
+            vector_db.clear_all()
+            CandidateEmbedding.query.delete(synchronize_session=False)
+            db.session.commit()
+        else:
+            _set_status(phase="orphans")
+            _set_status(orphans_removed=sweep_orphans(vector_db))
+
+        _set_status(phase="embedding")
+        dirty = Candidate.query.with_entities(
+            Candidate.id, CandidateEmbedding.fingerprint,
+        ).outerjoin(CandidateEmbedding, CandidateEmbedding.candidate_id == Candidate.id)
+        if not verify:
+            dirty = dirty.filter(or_(
+                CandidateEmbedding.candidate_id.is_(None),
+                CandidateEmbedding.model != EMBEDDING_MODEL,
+                CandidateEmbedding.schema_version != VECTOR_SCHEMA_VERSION,
+                Candidate.updated_at > CandidateEmbedding.indexed_at,
+            ))
+
+        last_id = 0
+        while True:
+            # Taken before reading rows: edits landing mid-round stay dirty.
+            round_started = datetime.utcnow()
+            batch = dirty.filter(Candidate.id > last_id).order_by(Candidate.id).limit(round_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            known = {row.id: row.fingerprint for row in batch}
+
+            rows = Candidate.query.with_entities(
+                Candidate.id, Candidate.parsed, Candidate.pdf_path,
+            ).filter(Candidate.id.in_(list(known))).all()
+
+            changed, unchanged = [], []
+            for row in rows:
+                parsed = parsed_dict(row.parsed)
+                texts = vector_db.candidate_texts(parsed) if parsed else []
+                if known.get(row.id) == embedding_fingerprint(texts):
+                    unchanged.append((row.id, known[row.id], len(texts)))
+                else:
+                    changed.append((row.id, parsed, row.pdf_path))
+
+            embedded = index_rows(pipeline, changed, round_started) if changed else 0
+            record_indexed(unchanged, round_started)
+            db.session.expunge_all()
+
+            _set_status(
+                scanned=_status["scanned"] + len(batch),
+                embedded=_status["embedded"] + embedded,
+                unchanged=_status["unchanged"] + len(unchanged),
+                last_id=last_id,
+            )
+            print(f"  ... reindex: {_status['scanned']} checked, {_status['embedded']} re-embedded")
+
+        _set_status(running=False, phase="done", finished_at=time.time(),
+                    seconds=round(time.time() - started, 2))
+        print(f"✅ Reindex finished: {reindex_status()}")
+        return reindex_status()
+    except Exception as e:
+        db.session.rollback()
+        _set_status(running=False, phase="failed", error=str(e), finished_at=time.time())
+        raise
+
+
+def start_background_reindex(app, pipeline_factory, **kwargs) -> bool:
+    """
+    Run reindex() on a daemon thread; False if one is already running. The
+    run lock is taken here and handed to the thread, so of two concurrent
+    starts exactly one runs and the other leaves the status alone.
+    """
+    if not _run_lock.acquire(blocking=False):
+        return False
+    _set_status(running=True, phase="queued")
+
+    def _run():
+        try:
+            with app.app_context():
+                _reindex(pipeline_factory(), **kwargs)
+        except Exception as e:
+            import traceback
+            print(f"❌ Reindex failed: {e}")
+            traceback.print_exc()
+            _set_status(running=False, phase="failed", error=str(e))
+        finally:
+            _run_lock.release()
+
+    try:
+        threading.Thread(target=_run, name="vector-reindex", daemon=True).start()
+    except Exception:
+        _run_lock.release()
+        raise
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally re-index candidate vectors")
+    parser.add_argument("--full", action="store_true", help="drop the collection and re-embed everything")
+    parser.add_argument("--verify", action="store_true", help="re-hash every candidate, not just updated ones")
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        reindex(full=args.full, verify=args.verify)
@@ -1,51 +1,70 @@
 # scripts/index_candidates.py
 
-from app import app, db
-from models import Candidate
-from services.embeddings import EmbeddingGenerator
-from services.vector_db import VectorDatabase
-
-
-def index_all_candidates():
-    embedder = EmbeddingGenerator()
-    vector_db = VectorDatabase()
-    collection = vector_db.collection
-
-    candidates = Candidate.query.all()
-    print(f"Indexing {len(candidates)} candidates into Chroma...")
-
-    ids = []
-    embeddings = []
-    metadatas = []
-
-    for cand in candidates:
-        # Build rich searchable text from candidate fields
-        text = embedder.build_candidate_text(cand)
-        if not text or not text.strip():
-            continue
-
-        embedding = embedder.generate_embedding(text)
-
-        ids.append(str(cand.id))  # Chroma document ID
-        embeddings.append(embedding)
-        metadatas.append({
-            "id": cand.id,  # integer PK for SQL lookup
-            "full_name": cand.full_name,
-            "email": cand.email,
-            "primary_role": cand.primary_role,
-            "primary_domain": cand.primary_domain,
-        })
-
-    if ids:
-        collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas,
+from models import Candidate, db
+from services.incremental_indexer import index_rows, parsed_dict
+
+# Candidates embedded and written per round; keeps memory flat on large pools
+# while still feeding the model full batches (EMBEDDING_BATCH_SIZE).
+INDEX_ROUND_SIZE = 512
+
+
+def index_all_candidates(
+    round_size: int = INDEX_ROUND_SIZE,
+    pipeline=None,
+    only_missing: bool = False,
+) -> int:
+    """
+    (Re)write every SQL candidate into the vector store using the same
+    summary + experience layout as ingestion, recording fingerprints (see
+    services/incremental_indexer.py). Must run inside an app context.
+
+    only_missing=True skips candidates that already have a summary doc, which
+    is how the legacy-store migrator backfills what it could not copy.
+    Returns the number of candidates written.
+    """
+    if pipeline is None:
+        from services.model_registry import get_pipeline
+        pipeline = get_pipeline()
+    vector_db = pipeline.vector_db
+
+    total = Candidate.query.count()
+    print(f"Indexing {total} candidates into {vector_db.path}/{vector_db.collection_name}...")
+
+    indexed = 0
+    seen = 0
+    last_id = 0
+    while True:
+        batch = (
+            Candidate.query
+            .with_entities(Candidate.id, Candidate.parsed, Candidate.pdf_path)
+            .filter(Candidate.id > last_id)
+            .order_by(Candidate.id)
+            .limit(round_size)
+            .all()
         )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        seen += len(batch)
+
+        rows = [(row.id, parsed_dict(row.parsed), row.pdf_path) for row in batch]
+        rows = [row for row in rows if row[1]]
+        if only_missing and rows:
+            present = set(vector_db.collection.get(ids=[str(cid) for cid, _, _ in rows], include=[])["ids"])
+            rows = [row for row in rows if str(row[0]) not in present]
+
+        if rows:
+            indexed += index_rows(pipeline, rows)
+        print(f"  ... {seen}/{total} scanned, {indexed} written")
+
+        db.session.expunge_all()
 
     print("Done indexing candidates.")
+    return indexed
 
 
 if __name__ == "__main__":
+    from app import app
+
     with app.app_context():
         index_all_candidates()
@@ -0,0 +1,424 @@
+"""
+Ingestion job queue backed by the ingestion_job / ingestion_item tables.
+
+The tables are the broker: uploads insert rows and return immediately, and a
+worker claims due items, runs them through services/bulk_ingest.py and writes
+the outcome back. No Redis is needed (celery/redis in requirements.txt are
+not used here).
+
+Brokers (config INGEST_BROKER):
+  - "inprocess": a daemon thread inside the web process drains the queue and
+    is woken up on every enqueue.
+  - "database" / "sqlite": the web process only enqueues; run
+    `python ingest_worker.py` to drain.
+
+Claims are conditional UPDATEs, so several workers (or gunicorn workers in
+"inprocess" mode) can share one queue. A worker renews the lease (locked_at)
+on the items it still holds after every parse and batch flush; items whose
+lease is older than INGEST_LEASE_SECONDS belong to a dead worker and are
+reclaimed while they have attempts left, and failed once they have none (a
+file that crashes its worker is not retried forever). Items abandoned
+"saved" (candidate stored, post-processing not done) keep that status when
+reclaimed and are only finalized, never parsed and inserted again. Every status write is
+conditional on locked_by too, so a worker that lost its lease drops its
+writes instead of overwriting the new owner's. Parse failures (Groq errors,
+rate limits) are retried with exponential backoff up to INGEST_MAX_ATTEMPTS.
+"""
+import os
+import random
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import and_, case, or_, update
+
+from config.local_config import (
+    INGEST_BROKER,
+    INGEST_CLAIM_SIZE,
+    INGEST_LEASE_SECONDS,
+    INGEST_MAX_ATTEMPTS,
+    INGEST_POLL_SECONDS,
+    INGEST_RETRY_BASE_SECONDS,
+    INGEST_RETRY_MAX_SECONDS,
+)
+from models import db, IngestionItem, IngestionJob
+from services.bulk_ingest import run_bulk_ingest
+
+FINAL_STATUSES = ("done", "failed")
+
+# Item fields stored as columns; anything else reported by the engine lands
+# in IngestionItem.result.
+_ITEM_COLUMNS = {"status", "candidate_id", "outcome"}
+
+
+# ------------------------- ENQUEUE ------------------------- #
+
+def enqueue_uploads(pipeline, files, source: str = "upload") -> IngestionJob:
+    """
+    Save uploaded files (FileStorage objects do not outlive the request) and
+    queue one item per file.
+    """
+    job = IngestionJob(id=str(uuid.uuid4()), status="queued", source=source, total=len(files))
+    db.session.add(job)
+
+    now = datetime.utcnow()
+    for f in files:
+        item = IngestionItem(
+            job=job,
+            filename=f.filename,
+            status="queued",
+            attempts=0,
+            max_attempts=INGEST_MAX_ATTEMPTS,
+            next_attempt_at=now,
+        )
+        try:
+            item.file_path = pipeline.save_file(f, str(uuid.uuid4()))
+        except Exception as e:
+            print(f"   ✗ Failed to save {f.filename}: {e}")
+            item.status = "failed"
+            item.last_error = str(e)
+        db.session.add(item)
+
+    db.session.commit()
+    print(f"📥 Queued ingestion job {job.id} with {len(files)} file(s)")
+
+    if _inprocess_worker:
+        _inprocess_worker.wake()
+    return job
+
+
+def retry_failed_items(job: IngestionJob) -> int:
+    """
+    Put a job's failed items back on the queue with a fresh attempt budget.
+    Items that failed with their candidate stored are only finalized again.
+    """
+    now = datetime.utcnow()
+    count = 0
+    for item in job.items:
+        if item.status == "failed" and (item.file_path or item.candidate_id):
+            item.status = "saved" if item.candidate_id else "queued"
+            item.attempts = 0
+            item.next_attempt_at = now
+            item.locked_by = None
+            item.locked_at = None
+            count += 1
+    if count:
+        job.status = "queued"
+        job.finished_at = None
+    db.session.commit()
+
+    if count and _inprocess_worker:
+        _inprocess_worker.wake()
+    return count
+
+
+# ------------------------- CLAIM / PROCESS ------------------------- #
+
+def _abandoned_filter(now: datetime):
+    """Items a crashed worker was still parsing, or had saved but not finalized."""
+    stale = now - timedelta(seconds=INGEST_LEASE_SECONDS)
+    return and_(IngestionItem.status.in_(("parsing", "parsed", "saved")), IngestionItem.locked_at < stale)
+
+
+def _claimable_filter(now: datetime):
+    return or_(
+        and_(IngestionItem.status.in_(("queued", "retry")), IngestionItem.next_attempt_at <= now),
+        and_(
+            # Saved items put back by retry_failed_items hold no lease.
+            or_(_abandoned_filter(now), and_(IngestionItem.status == "saved", IngestionItem.locked_by.is_(None))),
+            IngestionItem.attempts < IngestionItem.max_attempts,
+        ),
+    )
+
+
+def fail_exhausted_items(now: Optional[datetime] = None) -> int:
+    """Fail abandoned items with no attempts left, and settle their jobs."""
+    now = now or datetime.utcnow()
+    exhausted = and_(_abandoned_filter(now), IngestionItem.attempts >= IngestionItem.max_attempts)
+    rows = db.session.query(IngestionItem.id, IngestionItem.job_id).filter(exhausted).all()
+    if not rows:
+        return 0
+    res = db.session.execute(
+        update(IngestionItem)
+        .where(IngestionItem.id.in_([item_id for item_id, _ in rows]), exhausted)
+        .values(
+            status="failed",
+            last_error="The worker stopped while processing this file and no attempts are left",
+            locked_by=None,
+            locked_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if res.rowcount:
+        print(f"   ✗ Failed {res.rowcount} item(s) abandoned by a stopped worker on their last attempt")
+        _refresh_job_status({job_id for _, job_id in rows})
+    return res.rowcount
+
+
+def claim_items(worker_id: str, limit: int = INGEST_CLAIM_SIZE, job_id: Optional[str] = None) -> List[IngestionItem]:
+    """Atomically claim up to `limit` due items for `worker_id`."""
+    now = datetime.utcnow()
+    fail_exhausted_items(now)
+    query = db.session.query(IngestionItem.id).filter(_claimable_filter(now))
+    if job_id:
+        query = query.filter(IngestionItem.job_id == job_id)
+    ids = [row[0] for row in query.order_by(IngestionItem.next_attempt_at, IngestionItem.id).limit(limit).all()]
+
+    claimed = []
+    for item_id in ids:
+        res = db.session.execute(
+            update(IngestionItem)
+            .where(IngestionItem.id == item_id, _claimable_filter(now))
+            .values(
+                status=case((IngestionItem.status == "saved", "saved"), else_="parsing"),
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=IngestionItem.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if res.rowcount == 1:
+            claimed.append(item_id)
+    db.session.commit()
+
+    if not claimed:
+        return []
+    return IngestionItem.query.filter(IngestionItem.id.in_(claimed)).order_by(IngestionItem.id).all()
+
+
+def _backoff_seconds(attempts: int) -> float:
+    delay = min(INGEST_RETRY_MAX_SECONDS, INGEST_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class _ClaimedItems:
+    """Tracker handed to run_bulk_ingest; persists progress on IngestionItem rows."""
+
+    def __init__(self, rows: List[IngestionItem], worker_id: str):
+        self.rows = rows
+        self.worker_id = worker_id
+        self.items = [
+            {
+                "file_path": row.file_path,
+                "filename": row.filename,
+                # Set when the candidate is stored already; the engine only finalizes it.
+                "candidate_id": row.candidate_id if row.status == "saved" else None,
+            }
+            for row in rows
+        ]
+        self._results = [dict(row.result or {}) for row in rows]
+        self._held = set(range(len(rows)))
+
+    def _write(self, idx: int, values: dict, commit: bool = True) -> bool:
+        """Conditional UPDATE of one row; False (and the item dropped) when the lease was lost."""
+        row = self.rows[idx]
+        res = db.session.execute(
+            update(IngestionItem)
+            .where(IngestionItem.id == row.id, IngestionItem.locked_by == self.worker_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            db.session.commit()
+        if res.rowcount != 1:
+            if idx in self._held:
+                print(f"   ⚠️ Lost the lease on {row.filename}; dropping this worker's result")
+            self._held.discard(idx)
+            return False
+        return True
+
+    def renew(self) -> set:
+        """Extend the lease on every item still held; returns their indexes."""
+        if not self._held:
+            return set()
+        ids = {self.rows[idx].id: idx for idx in self._held}
+        res = db.session.execute(
+            update(IngestionItem)
+            .where(IngestionItem.id.in_(list(ids)), IngestionItem.locked_by == self.worker_id)
+            .values(locked_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if res.rowcount != len(ids):
+            owned = {
+                item_id for item_id, in db.session.query(IngestionItem.id)
+                .filter(IngestionItem.id.in_(list(ids)), IngestionItem.locked_by == self.worker_id)
+            }
+            for item_id, idx in ids.items():
+                if item_id not in owned:
+                    print(f"   ⚠️ Lost the lease on {self.rows[idx].filename}; dropping this worker's result")
+                    self._held.discard(idx)
+        return set(self._held)
+
+    def _values(self, idx: int, fields: dict) -> dict:
+        values = {}
+        extra = {}
+        for key, value in fields.items():
+            if key in _ITEM_COLUMNS:
+                values[key] = value
+            else:
+                extra[key] = value
+        if extra:
+            self._results[idx] = {**self._results[idx], **extra}
+            values["result"] = self._results[idx]
+        status = values.get("status")
+        if status in FINAL_STATUSES:
+            values["locked_by"] = None
+            values["locked_at"] = None
+        else:
+            values["locked_at"] = datetime.utcnow()
+        if status == "done":
+            values["last_error"] = None
+        return values
+
+    def update_item(self, idx: int, **fields):
+        if idx not in self._held:
+            return
+        if self._write(idx, self._values(idx, fields)) and fields.get("status") in FINAL_STATUSES:
+            self._held.discard(idx)
+
+    def save_item(self, idx: int, **fields) -> bool:
+        """
+        Write a non-final status in the caller's open transaction (no commit),
+        so it lands together with the rows the caller commits next. False when
+        the lease was lost: the caller must not commit its rows for this item.
+        """
+        if idx not in self._held:
+            return False
+        return self._write(idx, self._values(idx, fields), commit=False)
+
+    def fail_item(self, idx: int, error, retryable: bool = False):
+        db.session.rollback()
+        if idx not in self._held:
+            return
+        row = self.rows[idx]
+        values = {"last_error": str(error), "locked_by": None, "locked_at": None}
+
+        # Unsupported file types (ValueError from extract_resume_text) never succeed on retry.
+        if retryable and not isinstance(error, ValueError) and (row.attempts or 0) < (row.max_attempts or 1):
+            delay = _backoff_seconds(row.attempts or 1)
+            values["status"] = "retry"
+            values["next_attempt_at"] = datetime.utcnow() + timedelta(seconds=delay)
+            message = f"   ↻ Retry {row.attempts}/{row.max_attempts} for {row.filename} in {delay:.0f}s: {error}"
+        else:
+            values["status"] = "failed"
+            message = f"   ✗ Ingest failed for {row.filename}: {error}"
+        if self._write(idx, values):
+            print(message)
+        self._held.discard(idx)
+
+
+def _refresh_job_status(job_ids):
+    now = datetime.utcnow()
+    for job in IngestionJob.query.filter(IngestionJob.id.in_(list(job_ids))).all():
+        statuses = [item.status for item in job.items]
+        if statuses and all(s in FINAL_STATUSES for s in statuses):
+            job.status = "completed" if any(s == "done" for s in statuses) else "failed"
+            job.finished_at = job.finished_at or now
+        else:
+            job.status = "running"
+            job.started_at = job.started_at or now
+    db.session.commit()
+
+
+def process_claimed(rows: List[IngestionItem], pipeline, worker_id: str, on_candidate: Optional[Callable] = None):
+    job_ids = {row.job_id for row in rows}
+    _refresh_job_status(job_ids)
+    try:
+        run_bulk_ingest(_ClaimedItems(rows, worker_id), pipeline, on_candidate)
+    finally:
+        db.session.rollback()
+        _refresh_job_status(job_ids)
+
+
+def drain_job(job_id: str, pipeline, on_candidate: Optional[Callable] = None, worker_id: Optional[str] = None):
+    """
+    Process a job's currently due items on the calling thread (one attempt
+    each; retries are left to the worker).
+    """
+    worker_id = worker_id or f"inline-{uuid.uuid4().hex[:8]}"
+    while True:
+        rows = claim_items(worker_id, job_id=job_id)
+        if not rows:
+            return
+        process_claimed(rows, pipeline, worker_id, on_candidate)
+
+
+# ------------------------- WORKER ------------------------- #
+
+class IngestWorker:
+    """Polls the queue and drains due items in claim-sized rounds."""
+
+    def __init__(
+        self,
+        app,
+        pipeline_factory: Callable,
+        on_candidate: Optional[Callable] = None,
+        poll_interval: float = INGEST_POLL_SECONDS,
+        claim_size: int = INGEST_CLAIM_SIZE,
+    ):
+        self.app = app
+        self.pipeline_factory = pipeline_factory
+        self.on_candidate = on_candidate
+        self.poll_interval = poll_interval
+        self.claim_size = claim_size
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def run_once(self) -> int:
+        """Claim and process one round of items. Returns the number processed."""
+        with self.app.app_context():
+            try:
+                rows = claim_items(self.worker_id, limit=self.claim_size)
+                if rows:
+                    process_claimed(rows, self.pipeline_factory(), self.worker_id, self.on_candidate)
+                return len(rows)
+            finally:
+                db.session.remove()
+
+    def run_forever(self):
+        print(f"👷 Ingest worker {self.worker_id} started (poll every {self.poll_interval}s)")
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                import traceback
+                print(f"❌ Ingest worker round failed: {e}")
+                traceback.print_exc()
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        print(f"👷 Ingest worker {self.worker_id} stopped")
+
+    def start(self) -> "IngestWorker":
+        self._thread = threading.Thread(target=self.run_forever, name="ingest-worker", daemon=True)
+        self._thread.start()
+        return self
+
+
+_inprocess_worker: Optional[IngestWorker] = None
+_inprocess_lock = threading.Lock()
+
+
+def ensure_inprocess_worker(app, pipeline_factory: Callable, on_candidate: Optional[Callable] = None):
+    """Start the in-process worker once per process when INGEST_BROKER=inprocess."""
+    global _inprocess_worker
+    if INGEST_BROKER != "inprocess" or _inprocess_worker is not None:
+        return _inprocess_worker
+    with _inprocess_lock:
+        if _inprocess_worker is None:
+            _inprocess_worker = IngestWorker(app, pipeline_factory, on_candidate).start()
+    return _inprocess_worker
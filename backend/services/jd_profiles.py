@@ -0,0 +1,189 @@
+"""
+Precompiled JD profiles for reverse ranking (jd_profile, jd_profile_bucket).
+
+CANDIDATERANK scores one candidate against every open JD. Rather than
+loading each JD and re-parsing its `parsed` JSON / splitting the free-text
+skills column per request, a JD's scoring input is compiled once into a
+jd_profile row: raw and normalized required/bonus skills, open status and
+designation. Role-bucket membership (data_scientist / data_practice, derived
+from competency) lives in jd_profile_bucket keyed (bucket, jd_id), so a
+bucket filter is an index range scan instead of ilike over competency.
+
+  build   refresh_jd_profiles() on JD create, CSV import and edit
+  read    open_profiles() first builds any JD that has no profile yet or
+          one built for another profile/ontology version
+
+JD edits made outside the API (bulk SQL) need refresh_jd_profiles() on the
+affected ids.
+"""
+import json
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+
+from models import JD, JDProfile, JDProfileBucket, db
+from services.skill_ontology import ONTOLOGY, normalize
+
+# Bump when build_profile() changes; every profile is rebuilt on next read.
+JD_PROFILE_VERSION = 1
+JD_PROFILE_CHUNK_SIZE = 500
+CLOSED_JD_STATUSES = ("closed", "cancelled", "canceled", "lost", "filled", "fulfilled")
+
+# Competency substrings (lowercased) that put a JD in a role bucket.
+JD_BUCKETS = {
+    "data_scientist": ("data scientist",),
+    "data_practice": ("data engineer", "data practice"),
+}
+
+
+def profile_version() -> str:
+    return f"{JD_PROFILE_VERSION}-{ONTOLOGY.version}"
+
+
+def open_jds():
+    status = func.lower(func.trim(JD.sid_status))
+    return JD.query.filter(or_(JD.sid_status.is_(None), ~status.in_(CLOSED_JD_STATUSES)))
+
+
+def is_open_status(sid_status: Optional[str]) -> bool:
+    """Python side of open_jds()."""
+    return sid_status is None or sid_status.strip(" ").lower() not in CLOSED_JD_STATUSES
+
+
+def jd_buckets(competency: Optional[str]) -> List[str]:
+    text = (competency or "").lower()
+    return [bucket for bucket, needles in JD_BUCKETS.items() if any(n in text for n in needles)]
+
+
+def smart_jd_profile(jd) -> Dict:
+    """JD input for smart_screen_candidate (parsed skills, else the free-text skills column)."""
+    jd_parsed = getattr(jd, "parsed", {}) or {}
+    if isinstance(jd_parsed, str):
+        try:
+            jd_parsed = json.loads(jd_parsed)
+        except Exception:
+            jd_parsed = {}
+    if not isinstance(jd_parsed, dict):
+        jd_parsed = {}
+
+    required_skills = jd_parsed.get("required_skills") or []
+    bonus_skills = jd_parsed.get("bonus_skills") or []
+
+    # Fallback: parse free-text skills column
+    if not required_skills:
+        skills_text = (getattr(jd, "skills", None) or "").strip()
+        if skills_text:
+            required_skills = [s.strip() for s in re.split(r"[,;\n]+", skills_text) if s.strip()]
+
+    return {
+        "required_skills": required_skills,
+        "bonus_skills": bonus_skills,
+        "competency": getattr(jd, 'competency', '') or "",
+        "designation": getattr(jd, 'designation', '') or "",
+        "job_description": getattr(jd, 'job_description', '') or "",
+    }
+
+
+def _terms(skills) -> Optional[List[str]]:
+    # Shapes the batch encoder rejects stay NULL and are scored per pair.
+    if not isinstance(skills, (list, tuple)) or not all(isinstance(s, str) for s in skills):
+        return None
+    return sorted({normalize(s) for s in skills})
+
+
+def build_profile(jd) -> Dict:
+    """Every jd_profile column for one JD, plus its buckets (JSON-serializable)."""
+    smart = smart_jd_profile(jd)
+    return {
+        "is_open": is_open_status(jd.sid_status),
+        "designation": smart["designation"],
+        "required_skills": smart["required_skills"],
+        "bonus_skills": smart["bonus_skills"],
+        "required_terms": _terms(smart["required_skills"]),
+        "bonus_terms": _terms(smart["bonus_skills"]),
+        "buckets": jd_buckets(smart["competency"]),
+    }
+
+
+def _store(jds, version: str, built_at: datetime):
+    """Build and upsert profiles and bucket rows for loaded JDs (no commit)."""
+    ids = [jd.id for jd in jds]
+    existing = {p.jd_id: p for p in JDProfile.query.filter(JDProfile.jd_id.in_(ids))}
+    JDProfileBucket.query.filter(JDProfileBucket.jd_id.in_(ids)).delete(synchronize_session=False)
+    for jd in jds:
+        profile = build_profile(jd)
+        buckets = profile.pop("buckets")
+        record = existing.get(jd.id)
+        if record is None:
+            record = JDProfile(jd_id=jd.id)
+            db.session.add(record)
+        for key, value in profile.items():
+            setattr(record, key, value)
+        record.profile_version = version
+        record.built_at = built_at
+        for bucket in buckets:
+            db.session.add(JDProfileBucket(bucket=bucket, jd_id=jd.id))
+
+
+# ------------------------- HOOKS ------------------------- #
+
+def refresh_jd_profiles(jd_ids: Sequence[int]) -> int:
+    """Rebuild and store profiles; ids that no longer exist are dropped. Returns JDs built."""
+    ids = sorted({int(i) for i in jd_ids if i is not None})
+    version = profile_version()
+    built = 0
+    for start in range(0, len(ids), JD_PROFILE_CHUNK_SIZE):
+        chunk = ids[start:start + JD_PROFILE_CHUNK_SIZE]
+        built_at = datetime.utcnow()
+        jds = JD.query.filter(JD.id.in_(chunk)).all()
+        gone = set(chunk) - {jd.id for jd in jds}
+        if gone:
+            JDProfile.query.filter(JDProfile.jd_id.in_(gone)).delete(synchronize_session=False)
+            JDProfileBucket.query.filter(JDProfileBucket.jd_id.in_(gone)).delete(synchronize_session=False)
+        try:
+            _store(jds, version, built_at)
+            db.session.commit()
+        except IntegrityError:
+            # Another worker built the same JDs first; write over its rows.
+            db.session.rollback()
+            _store(jds, version, built_at)
+            db.session.commit()
+        built += len(jds)
+    return built
+
+
+# ------------------------- READS ------------------------- #
+
+def open_profiles(bucket: Optional[str] = None) -> List[Dict]:
+    """
+    Profiles of every open JD (in `bucket`'s JDs only, when given), in JD id
+    order. Each carries jd_id, sid, designation and the required/bonus skills
+    and terms batch_screening scores from.
+    """
+    version = profile_version()
+    missing = (
+        db.session.query(JD.id)
+        .outerjoin(JDProfile, JDProfile.jd_id == JD.id)
+        .filter(or_(JDProfile.jd_id.is_(None), JDProfile.profile_version != version))
+        .all()
+    )
+    if missing:
+        refresh_jd_profiles([jd_id for jd_id, in missing])
+
+    query = (
+        db.session.query(JDProfile, JD.sid)
+        .join(JD, JD.id == JDProfile.jd_id)
+        .filter(JDProfile.is_open.is_(True))
+    )
+    if bucket is not None:
+        query = query.join(
+            JDProfileBucket,
+            (JDProfileBucket.jd_id == JDProfile.jd_id) & (JDProfileBucket.bucket == bucket),
+        )
+    return [
+        {**profile.to_dict(), "sid": sid}
+        for profile, sid in query.order_by(JDProfile.jd_id).all()
+    ]
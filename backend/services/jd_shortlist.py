@@ -0,0 +1,341 @@
+"""
+Materialized JD x candidate ranking scores (jd_candidate_score).
+
+Each row holds, for one JD and one candidate, the smart-screen score with its
+components and reasoning (AIRANK) and the /api/llm-rank score, plus the JD
+fingerprint it was computed for. Ranking endpoints read a JD's rows through
+the (jd_id, score) indexes instead of scoring every candidate per request.
+
+Candidates are scored from their candidate_features records, never from
+the raw JSON. Rows are kept current two ways:
+
+  hooks     refresh_candidates() after a candidate is ingested, merged or
+            edited (recomputes its features first), forget_candidates() when
+            one is deleted, refresh_jd() when a JD's skills change;
+            candidate hooks cover open JDs
+  on read   shortlist() first rescores whatever is stale for that JD: no row
+            yet, candidate updated_at newer than computed_at, or a row
+            computed for other JD skills / scorer / feature version. Paths
+            that skip the hooks (closed JDs reopened, bulk SQL followed by a
+            bump) are caught here. That check joins every candidate, so each
+            worker remembers the data version and JD fingerprint it last ran
+            at per JD and skips it while neither moved: the candidate and JD
+            hooks bump the version, so a write reruns it once per JD.
+
+The candidate hooks also bump the ranking data version (services/rank_cache)
+so cached ranking pages are recomputed.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from models import JD, Candidate, JDCandidateScore, db
+from services.batch_screening import CandidatePool
+from services.candidate_features import (
+    feature_version, features_for, forget_all_features, forget_features, refresh_features,
+)
+from services.jd_profiles import open_jds, smart_jd_profile
+from services.llm_rank import LLMRankScorer, jd_skills
+from services.rank_cache import bump_data_version, data_version
+
+# Bump when either scorer's formula changes; every row becomes stale.
+SHORTLIST_SCORE_VERSION = 1
+SHORTLIST_CHUNK_SIZE = 500
+
+ORDERINGS = {
+    "smart": JDCandidateScore.final_score,
+    "llm": JDCandidateScore.llm_score,
+}
+
+_scorer_lock = threading.Lock()
+_scorer_cache: "OrderedDict[Tuple[int, str], _JDScorers]" = OrderedDict()
+_SCORER_CACHE_SIZE = 256
+
+# jd id -> (data version, JD fingerprint) at which this worker last found its rows current.
+_refresh_lock = threading.Lock()
+_refreshed: Dict[int, Tuple[int, str]] = {}
+
+
+# ------------------------- PROFILES ------------------------- #
+
+def score_columns():
+    """Candidate columns scoring reads besides the feature record."""
+    return (Candidate.id, Candidate.full_name, Candidate.on_bench, Candidate.updated_at)
+
+
+def smart_candidate_profile(row, features: Dict) -> Dict:
+    """Candidate input for smart_screen_candidate / CandidatePool."""
+    return {
+        "id": row.id,
+        "full_name": row.full_name,
+        "skills": features["skills"],
+        "roles": features["roles"],
+        "features": features,
+    }
+
+
+class _JDScorers:
+    def __init__(self, jd, fingerprint: str):
+        self.jd_id = jd.id
+        self.fingerprint = fingerprint
+        self.smart = smart_jd_profile(jd)
+        self.llm = LLMRankScorer(*jd_skills(jd))
+
+
+def jd_fingerprint(jd) -> str:
+    """Changes whenever anything the stored scores depend on for this JD changes."""
+    smart = smart_jd_profile(jd)
+    payload = json.dumps({
+        "smart": [smart["required_skills"], smart["bonus_skills"]],
+        "llm": list(jd_skills(jd)),
+        "version": SHORTLIST_SCORE_VERSION,
+        "features": feature_version(),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _scorers_for(jd) -> _JDScorers:
+    """Per-JD scorers (compiled skill automaton included), reused until the JD changes."""
+    key = (jd.id, jd_fingerprint(jd))
+    with _scorer_lock:
+        cached = _scorer_cache.get(key)
+        if cached is not None:
+            _scorer_cache.move_to_end(key)
+            return cached
+    scorers = _JDScorers(jd, key[1])
+    with _scorer_lock:
+        _scorer_cache[key] = scorers
+        while len(_scorer_cache) > _SCORER_CACHE_SIZE:
+            _scorer_cache.popitem(last=False)
+    return scorers
+
+
+# ------------------------- SCORING ------------------------- #
+
+def _score_rows(rows: Sequence, features: Dict[int, Dict], scorers: Sequence[_JDScorers],
+                computed_at: datetime) -> int:
+    """Score score_columns() rows against JDs and upsert the results (no commit)."""
+    rows = [r for r in rows if r.id in features]
+    if not rows or not scorers:
+        return 0
+
+    # Encodings hold recency and tenure resolved for this year (resolve_features).
+    year = datetime.now().year
+    smart = CandidatePool(
+        [smart_candidate_profile(r, features[r.id]) for r in rows],
+        cache_keys=[(r.id, features[r.id]["feature_version"], features[r.id]["computed_at"], year) for r in rows],
+    ).score([s.smart for s in scorers])
+
+    llm_inputs = [
+        {**features[r.id]["llm"], "bench_status": "bench" if r.on_bench else "active"}
+        if features[r.id]["llm"] is not None else None
+        for r in rows
+    ]
+    existing = {
+        (row.jd_id, row.candidate_id): row
+        for row in JDCandidateScore.query.filter(
+            JDCandidateScore.jd_id.in_([s.jd_id for s in scorers]),
+            JDCandidateScore.candidate_id.in_([r.id for r in rows]),
+        )
+    }
+
+    for j, jd_scorers in enumerate(scorers):
+        for i, row in enumerate(rows):
+            pair = smart.pair(i, j)
+            llm_score, llm_reasoning = None, None
+            if llm_inputs[i] is not None:
+                try:
+                    llm_score, llm_reasoning = jd_scorers.llm.score(llm_inputs[i])
+                    llm_score = round(llm_score, 1)
+                except Exception as e:
+                    print(f"⚠️ Error scoring candidate {row.id} for JD {jd_scorers.jd_id}: {e}")
+                    llm_score, llm_reasoning = None, None
+
+            score = existing.get((jd_scorers.jd_id, row.id))
+            if score is None:
+                score = JDCandidateScore(jd_id=jd_scorers.jd_id, candidate_id=row.id)
+                db.session.add(score)
+            score.final_score = pair["final_score"] if pair else None
+            score.tech_score = pair["tech_score"] if pair else None
+            score.experience_score = pair["experience_score"] if pair else None
+            score.matrix_score = pair["matrix_score"] if pair else None
+            score.reasoning = (
+                f"Tech: {pair['tech_score']}%, Exp: {pair['experience_score']}%, Matrix: {pair['matrix_score']}%"
+                if pair else None
+            )
+            score.llm_score = llm_score
+            score.llm_reasoning = llm_reasoning
+            score.jd_fingerprint = jd_scorers.fingerprint
+            score.computed_at = computed_at
+    return len(rows) * len(scorers)
+
+
+def _commit_scores(rows, scorers, computed_at, features: Optional[Dict[int, Dict]] = None) -> int:
+    if features is None:
+        features = features_for([r.id for r in rows])
+    try:
+        written = _score_rows(rows, features, scorers, computed_at)
+        db.session.commit()
+        return written
+    except IntegrityError:
+        # Another worker inserted the same pairs first; score over its rows.
+        db.session.rollback()
+        written = _score_rows(rows, features, scorers, computed_at)
+        db.session.commit()
+        return written
+
+
+# ------------------------- HOOKS ------------------------- #
+
+def refresh_candidates(candidate_ids: Sequence[int]) -> int:
+    """
+    Recompute candidates' features and rescore them against every open JD;
+    ids that no longer exist are dropped.
+    """
+    ids = sorted({int(cid) for cid in candidate_ids if cid is not None})
+    if not ids:
+        return 0
+    scorers = [_scorers_for(jd) for jd in open_jds().all()]
+    written = 0
+    for start in range(0, len(ids), SHORTLIST_CHUNK_SIZE):
+        chunk = ids[start:start + SHORTLIST_CHUNK_SIZE]
+        computed_at = datetime.utcnow()
+        features = refresh_features(chunk)
+        rows = Candidate.query.with_entities(*score_columns()).filter(Candidate.id.in_(chunk)).all()
+        gone = set(chunk) - {row.id for row in rows}
+        if gone:
+            forget_candidates(gone, commit=False)
+        written += _commit_scores(rows, scorers, computed_at, features)
+    bump_data_version()
+    return written
+
+
+def forget_candidates(candidate_ids, commit: bool = True):
+    ids = [int(cid) for cid in candidate_ids if cid is not None]
+    for start in range(0, len(ids), SHORTLIST_CHUNK_SIZE):
+        JDCandidateScore.query.filter(
+            JDCandidateScore.candidate_id.in_(ids[start:start + SHORTLIST_CHUNK_SIZE])
+        ).delete(synchronize_session=False)
+    forget_features(ids, commit=False)
+    if commit:
+        db.session.commit()
+        bump_data_version()
+
+
+def forget_all():
+    JDCandidateScore.query.delete(synchronize_session=False)
+    forget_all_features()
+    bump_data_version()
+
+
+def _refresh_if_changed(jd):
+    """refresh_jd(jd), unless the data version and JD fingerprint are where this worker last ran it."""
+    try:
+        version = data_version()
+    except Exception as e:
+        print(f"⚠️ Shortlist could not read the data version (non-critical): {e}")
+        refresh_jd(jd)
+        return
+    # Taken before refreshing: a bump landing meanwhile leaves the mark behind.
+    mark = (version, jd_fingerprint(jd))
+    with _refresh_lock:
+        if _refreshed.get(jd.id) == mark:
+            return
+    refresh_jd(jd)
+    with _refresh_lock:
+        _refreshed[jd.id] = mark
+
+
+def refresh_jd(jd, full: bool = False) -> int:
+    """
+    Rescore the candidates whose stored score for `jd` is missing or stale
+    (every candidate with full=True). Returns the number of pairs written.
+    """
+    scorers = _scorers_for(jd)
+    stored = JDCandidateScore
+    dirty = Candidate.query.with_entities(*score_columns()).outerjoin(
+        stored, and_(stored.candidate_id == Candidate.id, stored.jd_id == jd.id)
+    )
+    if not full:
+        dirty = dirty.filter(or_(
+            stored.candidate_id.is_(None),
+            stored.jd_fingerprint != scorers.fingerprint,
+            Candidate.updated_at > stored.computed_at,
+        ))
+
+    written = 0
+    last_id = 0
+    while True:
+        # Taken before reading rows: edits landing mid-round stay dirty.
+        computed_at = datetime.utcnow()
+        rows = dirty.filter(Candidate.id > last_id).order_by(Candidate.id).limit(SHORTLIST_CHUNK_SIZE).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        written += _commit_scores(rows, [scorers], computed_at)
+
+    if written:
+        print(f"🔄 Refreshed {written} stored scores for JD {jd.sid}")
+    return written
+
+
+def start_background_refresh(app, jd_id: int) -> threading.Thread:
+    """Run refresh_jd() for one JD on a daemon thread."""
+    def _run():
+        try:
+            with app.app_context():
+                jd = db.session.get(JD, jd_id)
+                if jd is not None:
+                    refresh_jd(jd)
+        except Exception as e:
+            import traceback
+            print(f"❌ Shortlist refresh for JD {jd_id} failed: {e}")
+            traceback.print_exc()
+
+    thread = threading.Thread(target=_run, name=f"jd-shortlist-{jd_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+# ------------------------- READS ------------------------- #
+
+def shortlist(jd, order: str = "smart", bucket: Optional[str] = None, on_bench: Optional[bool] = None,
+              limit: int = 10, offset: int = 0) -> Tuple[List[Dict], int]:
+    """
+    Best candidates for `jd` by stored score ("smart" or "llm"), after
+    bringing its stale rows up to date (when anything changed since this
+    worker last did). Returns (rows, total matching). Equal scores keep
+    candidate id order.
+    """
+    _refresh_if_changed(jd)
+
+    score_col = ORDERINGS[order]
+    query = (
+        db.session.query(JDCandidateScore, Candidate.full_name)
+        .join(Candidate, Candidate.id == JDCandidateScore.candidate_id)
+        .filter(JDCandidateScore.jd_id == jd.id, score_col.isnot(None))
+    )
+    if bucket:
+        query = query.filter(Candidate.role_bucket == bucket)
+    if on_bench is not None:
+        query = query.filter(Candidate.on_bench == on_bench)
+
+    total = query.count()
+    page = (
+        query.order_by(score_col.desc(), JDCandidateScore.candidate_id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    rows = []
+    for score, full_name in page:
+        row = score.to_dict()
+        row["candidate_name"] = full_name
+        rows.append(row)
+    return rows, total
@@ -0,0 +1,215 @@
+"""
+Heuristic scorer behind /api/llm-rank.
+
+Points for required/bonus skills, for projects and roles that use the JD's
+skills, for years of experience and for being on the bench. The candidate
+side (candidate_data) is JD-independent and stored per candidate in
+candidate_features; LLMRankScorer only matches a JD's skills against it.
+"""
+from typing import Tuple
+
+from services.skill_matcher import SkillMatcher
+
+
+def jd_skills(jd) -> Tuple[list, list]:
+    """(required, bonus) skills of a JD, lowercased, as /api/llm-rank scores them."""
+    jd_parsed = jd.parsed or {}
+    required_skills = [s.lower().strip() for s in (jd_parsed.get("required_skills", []) or [])]
+    bonus_skills = [s.lower().strip() for s in (jd_parsed.get("bonus_skills", []) or [])]
+    return required_skills, bonus_skills
+
+
+def match_sections(projects, work_experiences) -> Tuple[list, list]:
+    """
+    The texts JD skills are matched against: per project its techs,
+    description and name, per role its techs, description and title
+    (lowercased). A skill counts for a section when it is a substring of
+    any of the section's strings.
+    """
+    project_sections = []
+    for proj in projects:
+        if not proj:
+            continue
+        
+        # Check if project uses JD skills
+        proj_techs = []
+        if isinstance(proj, dict):
+            proj_techs.extend(proj.get("technologies_used", []) or [])
+            proj_techs.extend(proj.get("technical_tools", []) or [])
+            proj_desc = (proj.get("description", "") or "").lower()
+            proj_name = (proj.get("name", "") or "").lower()
+        else:
+            continue
+        
+        # Normalize project techs
+        proj_techs = [t.lower().strip() for t in proj_techs if t]
+        project_sections.append({
+            "name": proj.get("name", "Unknown"),
+            "texts": proj_techs + [proj_desc, proj_name],
+        })
+    
+    work_sections = []
+    for work in work_experiences:
+        if not work or not isinstance(work, dict):
+            continue
+        
+        work_techs = []
+        work_techs.extend(work.get("technologies_used", []) or [])
+        work_techs.extend(work.get("technical_tools", []) or [])
+        work_techs.extend(work.get("skills", []) or [])
+        work_techs = [t.lower().strip() for t in work_techs if t]
+        
+        work_desc = (work.get("description", "") or "").lower()
+        work_title = (work.get("job_title", "") or work.get("title", "") or "").lower()
+        work_sections.append({
+            "company": work.get("company_name", "Unknown"),
+            "title": work.get("job_title", "Unknown"),
+            "texts": work_techs + [work_desc, work_title],
+        })
+    
+    return project_sections, work_sections
+
+
+def candidate_data(c, parsed: dict) -> dict:
+    """JD-independent scoring input for a Candidate and its parsed dict."""
+    # Extract ALL skills from multiple sources
+    skills_list = []
+    if parsed.get("technical_skills"):
+        skills_list.extend(parsed["technical_skills"])
+    if parsed.get("skills"):
+        skills_list.extend(parsed["skills"])
+    if c.skills:
+        skills_list.extend(c.skills if isinstance(c.skills, list) else [])
+    # Deduplicate and normalize
+    skills_list = sorted({s.lower().strip() for s in skills_list if s})
+
+    # Extract ALL projects with full details
+    projects = parsed.get("projects") or []
+    if not projects and c.projects:
+        projects = c.projects if isinstance(c.projects, list) else []
+
+    # Extract ALL work experiences with full details
+    work_experiences = parsed.get("work_experiences") or []
+    if not work_experiences and c.work_experiences:
+        work_experiences = c.work_experiences if isinstance(c.work_experiences, list) else []
+
+    # Total experience
+    total_exp = (
+        parsed.get("total_experience_years")
+        or parsed.get("total_exp")
+        or c.total_experience_years
+        or 0.0
+    )
+
+    project_sections, work_sections = match_sections(projects, work_experiences)
+    return {
+        "skills": skills_list,
+        "projects": project_sections,
+        "work_experiences": work_sections,
+        "total_experience_years": float(total_exp),
+        "primary_role": c.primary_role or parsed.get("primary_role") or "",
+    }
+
+
+class LLMRankScorer:
+    """One JD's scorer; the skill automaton is compiled once and reused for every candidate."""
+
+    def __init__(self, required_skills, bonus_skills):
+        self.required_skills = list(required_skills)
+        self.bonus_skills = list(bonus_skills)
+        all_jd_skills = self.required_skills + self.bonus_skills
+        # Indices point into all_jd_skills.
+        self.matcher = SkillMatcher(all_jd_skills)
+        self.required_idx = frozenset(range(len(self.required_skills)))
+        self.bonus_idx = frozenset(range(len(self.required_skills), len(all_jd_skills)))
+
+    def score(self, cand_data: dict) -> Tuple[float, str]:
+        """
+        Advanced scoring prioritizing:
+        1. Skills match (primary, ~50%)
+        2. Relevant project experience where skills were used (~30%, counts more)
+        3. Work experience (~15%)
+        4. Bench status and other factors (~5%)
+        """
+        cand_skills = cand_data["skills"]
+        projects = cand_data["projects"]
+        works = cand_data["work_experiences"]
+        total_exp = cand_data["total_experience_years"]
+        
+        # Find every section's hits in one automaton pass.
+        hits = self.matcher.scan(
+            [cand_skills] + [p["texts"] for p in projects] + [w["texts"] for w in works]
+        )
+        skill_hits, project_hits, work_hits = hits[0], hits[1:1 + len(projects)], hits[1 + len(projects):]
+        
+        # 1. SKILLS MATCH (Primary - 50 points max)
+        required_matches = len(skill_hits & self.required_idx)
+        bonus_matches = len(skill_hits & self.bonus_idx)
+        
+        # Weight required skills more than bonus
+        skills_score = min(50.0, (required_matches * 8.0) + (bonus_matches * 2.0))
+        skills_pct = (required_matches / len(self.required_skills)) * 100 if self.required_skills else 0
+        
+        # 2. RELEVANT PROJECT EXPERIENCE (30 points max - counts more!)
+        project_score = 0.0
+        relevant_projects = []
+        
+        for proj, matched in zip(projects, project_hits):
+            # Count how many JD skills appear in this project
+            project_skill_matches = len(matched)
+            
+            if project_skill_matches > 0:
+                # More matches = higher score, recent projects weighted more
+                project_value = min(10.0, project_skill_matches * 2.5)
+                project_score += project_value
+                relevant_projects.append({
+                    "name": proj["name"],
+                    "matches": project_skill_matches,
+                    "value": project_value
+                })
+        
+        project_score = min(30.0, project_score)  # Cap at 30
+        
+        # 3. WORK EXPERIENCE (15 points max)
+        work_exp_score = 0.0
+        relevant_work = []
+        
+        for work, matched in zip(works, work_hits):
+            # Count JD skill matches in work experience
+            work_skill_matches = len(matched)
+            
+            if work_skill_matches > 0:
+                work_value = min(5.0, work_skill_matches * 1.5)
+                work_exp_score += work_value
+                relevant_work.append({
+                    "company": work["company"],
+                    "title": work["title"],
+                    "matches": work_skill_matches
+                })
+        
+        work_exp_score = min(15.0, work_exp_score)  # Cap at 15
+        
+        # 4. EXPERIENCE YEARS BONUS (5 points max)
+        exp_bonus = min(5.0, total_exp * 0.5) if total_exp > 0 else 0.0
+        
+        # 5. BENCH STATUS (5 points)
+        bench_bonus = 5.0 if cand_data["bench_status"] == "bench" else 2.0
+        
+        # TOTAL SCORE
+        total_score = skills_score + project_score + work_exp_score + exp_bonus + bench_bonus
+        
+        # Build detailed reasoning
+        reason_parts = []
+        if required_matches > 0:
+            reason_parts.append(f"{required_matches}/{len(self.required_skills)} required skills ({skills_pct:.0f}%)")
+        if relevant_projects:
+            reason_parts.append(f"{len(relevant_projects)} relevant projects")
+        if relevant_work:
+            reason_parts.append(f"{len(relevant_work)} relevant work experiences")
+        if total_exp > 0:
+            reason_parts.append(f"{total_exp:.1f} yrs exp")
+        reason_parts.append(f"bench={cand_data['bench_status']}")
+        
+        reasoning = " | ".join(reason_parts) if reason_parts else "Limited match"
+        
+        return total_score, reasoning
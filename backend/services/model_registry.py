@@ -0,0 +1,145 @@
+"""
+Process-wide registry for heavyweight models and clients.
+
+Everything here is created lazily on first use, exactly once per process,
+behind a per-resource lock (so a slow model load does not block unrelated
+lookups). Call warm_up() to pay the load cost up front, e.g. from the
+gunicorn post_fork hook in gunicorn.conf.py.
+
+    get_embedding_model()        SentenceTransformer (EMBEDDING_MODEL)
+    get_chroma_client(path)      chromadb.PersistentClient per path
+    get_chroma_collection(...)   collection handle per (path, name)
+    get_groq_client()            raw Groq client
+    get_instructor_client()      instructor-wrapped Groq client
+    get_pipeline()               shared RAGResumePipeline
+
+registry_metrics() reports load time, load timestamp and lookup count per
+resource.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config.local_config import EMBEDDING_MODEL, GROQ_API_KEY
+
+_instances: Dict[str, Any] = {}
+_locks: Dict[str, threading.Lock] = {}
+_metrics: Dict[str, Dict[str, Any]] = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    inst = _instances.get(name)
+    if inst is None:
+        with _registry_lock:
+            lock = _locks.setdefault(name, threading.Lock())
+        with lock:
+            inst = _instances.get(name)
+            if inst is None:
+                print(f"⏳ Loading {name}...")
+                start = time.perf_counter()
+                inst = factory()
+                elapsed = time.perf_counter() - start
+                with _registry_lock:
+                    _metrics[name] = {
+                        "load_seconds": round(elapsed, 3),
+                        "loaded_at": time.time(),
+                        "lookups": 0,
+                    }
+                _instances[name] = inst
+                print(f"✓ Loaded {name} in {elapsed:.2f}s")
+    # += is a read-modify-write; unlocked, concurrent lookups lose counts.
+    with _registry_lock:
+        stats = _metrics.get(name)
+        if stats is not None:
+            stats["lookups"] += 1
+    return inst
+
+
+# ------------------------- RESOURCES ------------------------- #
+
+def get_embedding_model(model_name: str = EMBEDDING_MODEL):
+    def _load():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+
+    return _get_or_create(f"embedding:{model_name}", _load)
+
+
+def get_chroma_client(path: str):
+    def _load():
+        import chromadb
+        from chromadb.config import Settings
+        return chromadb.PersistentClient(path=path, settings=Settings(anonymized_telemetry=False))
+
+    return _get_or_create(f"chroma:{path}", _load)
+
+
+def get_chroma_collection(path: str, name: str, metadata: Optional[dict] = None):
+    client = get_chroma_client(path)
+    return _get_or_create(
+        f"chroma:{path}:{name}",
+        lambda: client.get_or_create_collection(name=name, metadata=metadata),
+    )
+
+
+def reset_chroma_collection(path: str, name: str):
+    """Forget a cached collection handle (after it was dropped/recreated)."""
+    with _registry_lock:
+        _instances.pop(f"chroma:{path}:{name}", None)
+        _metrics.pop(f"chroma:{path}:{name}", None)
+
+
+def get_groq_client():
+    def _load():
+        from groq import Groq
+        return Groq(api_key=GROQ_API_KEY)
+
+    return _get_or_create("groq", _load)
+
+
+def get_instructor_client():
+    def _load():
+        import instructor
+        return instructor.from_groq(get_groq_client())
+
+    return _get_or_create("instructor", _load)
+
+
+def get_pipeline():
+    def _load():
+        from services.rag_pipeline import RAGResumePipeline
+        return RAGResumePipeline()
+
+    return _get_or_create("pipeline", _load)
+
+
+# ------------------------- WARM-UP / METRICS ------------------------- #
+
+def warm_up(include=("embedding", "chroma", "groq")) -> Dict[str, Any]:
+    """Eagerly load the given resources; failures are reported, not raised."""
+    loaders = {
+        "embedding": lambda: get_embedding_model().encode("warm up"),
+        "chroma": lambda: get_pipeline().vector_db.collection,
+        "groq": lambda: (get_groq_client(), get_instructor_client()),
+    }
+    start = time.perf_counter()
+    errors = {}
+    for key in include:
+        try:
+            loaders[key]()
+        except Exception as e:
+            print(f"⚠️ Warm-up of {key} failed: {e}")
+            errors[key] = str(e)
+    elapsed = time.perf_counter() - start
+    print(f"🔥 Model registry warm-up finished in {elapsed:.2f}s")
+    return {"seconds": round(elapsed, 3), "errors": errors}
+
+
+def registry_metrics() -> Dict[str, Any]:
+    with _registry_lock:
+        resources = {name: dict(stats) for name, stats in _metrics.items()}
+    return {
+        "resources": resources,
+        "total_load_seconds": round(sum(r["load_seconds"] for r in resources.values()), 3),
+    }
@@ -0,0 +1,296 @@
+"""
+Fuzzy candidate lookup by name or email (trigram index).
+
+Name lookups (general queries, chat direct lookups, EDIT) used to cascade
+ilike scans: full_name, then email, then per-token full_name, loading every
+row of each stage to test for emptiness. find_candidates_by_name() answers
+all stages in one lookup and returns each candidate once, ranked:
+
+  exact   the text is a substring of the name (field "name") or email ("email")
+  token   a word of the text (3+ chars) is a substring of the name
+  fuzzy   trigram similarity to the name or email local part reaches threshold
+
+then by similarity score and newest first. Similarity is pg_trgm's: words
+padded as "  word ", Jaccard over their trigram sets, taken against the
+best-matching run of consecutive words (word_similarity), so "meril" still
+finds "Merril Almeida".
+
+  Postgres  one query over pg_trgm GIN indexes on lower(full_name),
+            lower(email) and the email local part (migration 8f4a1c6d2e93)
+  SQLite    an in-process trigram posting index per worker, synced like the
+            filter index (services/filter_index): when the ranking data
+            version moves and at least every NAME_INDEX_RECHECK_SECONDS
+"""
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from models import Candidate, db
+
+NAME_SIMILARITY_THRESHOLD = 0.3
+NAME_INDEX_RECHECK_SECONDS = 300.0
+MATCH_KINDS = ("exact", "token", "fuzzy")
+# Text words shorter than this are too short for a per-word substring match.
+TOKEN_MIN_LEN = 3
+
+
+def normalize_name(s: Optional[str]) -> str:
+    """Lowercase, accents stripped, punctuation as word breaks."""
+    s = unicodedata.normalize("NFKD", str(s or "").lower())
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(re.findall(r"[^\W_]+", s))
+
+
+def email_local(email: Optional[str]) -> str:
+    return normalize_name(str(email or "").split("@", 1)[0])
+
+
+def word_trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigrams(s: str) -> Set[str]:
+    out: Set[str] = set()
+    for word in s.split():
+        out |= word_trigrams(word)
+    return out
+
+
+def word_similarity(query_grams: Set[str], query_words: int, word_grams: List[Set[str]]) -> float:
+    """Best similarity of the query to a run of up to query_words consecutive words."""
+    best = 0.0
+    size = len(query_grams)
+    for start in range(len(word_grams)):
+        run: Set[str] = set()
+        for grams in word_grams[start:start + query_words]:
+            run = run | grams if run else grams
+            shared = len(query_grams & run)
+            if shared:
+                best = max(best, shared / (size + len(run) - shared))
+    return best
+
+
+def _rank(match: Dict) -> Tuple:
+    return (MATCH_KINDS.index(match["match"]), -match["score"], -match["_created"], -match["candidate_id"])
+
+
+def _finish(matches: List[Dict], limit: Optional[int]) -> List[Dict]:
+    matches.sort(key=_rank)
+    if limit is not None:
+        matches = matches[:limit]
+    for m in matches:
+        m.pop("_created")
+    return matches
+
+
+def _classify(q: str, words: List[str], name: str, email: str, score: float,
+              threshold: float) -> Optional[Tuple[str, str]]:
+    """(match kind, field) of one candidate, or None when it does not match."""
+    name_l = name.lower()
+    if q in name_l:
+        return "exact", "name"
+    if q in email.lower():
+        return "exact", "email"
+    if any(len(w) >= TOKEN_MIN_LEN and w in name_l for w in words):
+        return "token", "name"
+    if score >= threshold:
+        return "fuzzy", None
+    return None
+
+
+class NameIndex:
+    """Trigram postings over normalized names and email local parts."""
+
+    def __init__(self):
+        # candidate id -> (full_name, email, created ts, name word grams, email local word grams)
+        self.docs: Dict[int, Tuple[str, str, float, List[Set[str]], List[Set[str]]]] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self._lock = threading.RLock()
+        self._version: Optional[int] = None
+        self._checked: Optional[float] = None
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ------------------------- MAINTENANCE ------------------------- #
+
+    def _grams(self, cid: int) -> Set[str]:
+        # Posted: name and whole-email trigrams (email substrings may be in the domain).
+        _, email, _, name_grams, _ = self.docs[cid]
+        return set().union(*name_grams) | trigrams(normalize_name(email))
+
+    def _remove(self, cid: int):
+        if cid not in self.docs:
+            return
+        for g in self._grams(cid):
+            ids = self.postings.get(g)
+            if ids is not None:
+                ids.discard(cid)
+                if not ids:
+                    del self.postings[g]
+        del self.docs[cid]
+
+    def _add(self, cid: int, full_name: str, email: str, created: float):
+        self._remove(cid)
+        name_grams = [word_trigrams(w) for w in normalize_name(full_name).split()]
+        email_grams = [word_trigrams(w) for w in email_local(email).split()]
+        self.docs[cid] = (full_name, email, created, name_grams, email_grams)
+        for g in self._grams(cid):
+            self.postings.setdefault(g, set()).add(cid)
+
+    def sync(self):
+        from services.rank_cache import data_version
+
+        try:
+            version = data_version()
+        except Exception as e:
+            print(f"⚠️ Name index could not read the data version (non-critical): {e}")
+            version = None
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._checked is not None and now - self._checked < NAME_INDEX_RECHECK_SECONDS
+            if fresh and version is not None and version == self._version:
+                return
+            seen = set()
+            changed = 0
+            rows = db.session.query(Candidate.id, Candidate.full_name, Candidate.email, Candidate.created_at)
+            for cid, full_name, email, created_at in rows:
+                seen.add(cid)
+                full_name, email = full_name or "", email or ""
+                doc = self.docs.get(cid)
+                if doc is None or doc[0] != full_name or doc[1] != email:
+                    created = created_at.timestamp() if created_at else 0.0
+                    self._add(cid, full_name, email, created)
+                    changed += 1
+            gone = set(self.docs) - seen
+            for cid in gone:
+                self._remove(cid)
+            if changed or gone:
+                print(f"🔤 Name index synced: {len(self.docs)} candidates ({changed} reindexed, {len(gone)} removed)")
+            self._version = version
+            self._checked = now
+
+    # ------------------------- LOOKUPS ------------------------- #
+
+    def _prospects(self, q: str, q_grams: Set[str], words: List[str], threshold: float) -> Set[int]:
+        # A similarity match shares at least threshold * |q_grams| trigrams.
+        need = math.ceil(threshold * len(q_grams))
+        overlap = Counter()
+        for g in q_grams:
+            overlap.update(self.postings.get(g, ()))
+        out = {cid for cid, n in overlap.items() if n >= need}
+        # Substring and per-word matches hold every trigram interior to some
+        # text word; texts of short words only need a substring scan.
+        long_words = [w for w in words if len(w) >= TOKEN_MIN_LEN]
+        if not long_words:
+            out.update(cid for cid, doc in self.docs.items() if q in doc[0].lower() or q in doc[1].lower())
+        for w in long_words:
+            postings = sorted((self.postings.get(w[i:i + 3], set()) for i in range(len(w) - 2)), key=len)
+            out.update(set.intersection(*postings))
+        return out
+
+    def find(self, text_: str, limit: Optional[int], threshold: float) -> List[Dict]:
+        q = str(text_ or "").strip().lower()
+        if not q:
+            return []
+        norm = normalize_name(q)
+        words = norm.split()
+        q_grams = trigrams(norm)
+        out = []
+        with self._lock:
+            for cid in self._prospects(q, q_grams, words, threshold):
+                full_name, email, created, name_grams, email_grams = self.docs[cid]
+                name_score = word_similarity(q_grams, len(words), name_grams)
+                email_score = word_similarity(q_grams, len(words), email_grams)
+                kind = _classify(q, words, full_name, email, max(name_score, email_score), threshold)
+                if kind is None:
+                    continue
+                match, field = kind
+                if field is None:
+                    field = "name" if name_score >= email_score else "email"
+                out.append({
+                    "candidate_id": cid, "full_name": full_name, "email": email or None,
+                    "match": match, "field": field, "score": round(max(name_score, email_score), 4),
+                    "_created": created,
+                })
+        return _finish(out, limit)
+
+
+_index = NameIndex()
+
+
+def name_index() -> NameIndex:
+    """The process-wide index, synced."""
+    _index.sync()
+    return _index
+
+
+def _escape_like(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _find_postgres(text_: str, limit: Optional[int], threshold: float) -> List[Dict]:
+    q = str(text_ or "").strip().lower()
+    if not q:
+        return []
+    words = normalize_name(q).split()
+    params = {"norm": normalize_name(q), "like": f"%{_escape_like(q)}%"}
+    token_likes = []
+    for i, w in enumerate(w for w in words if len(w) >= TOKEN_MIN_LEN):
+        params[f"tok{i}"] = f"%{_escape_like(w)}%"
+        token_likes.append(f"lower(full_name) LIKE :tok{i}")
+    local = "lower(split_part(email, '@', 1))"
+    where = [
+        "lower(full_name) LIKE :like", "lower(email) LIKE :like",
+        ":norm <% lower(full_name)", f":norm <% {local}",
+    ] + token_likes
+    # Scoped to this transaction; <% uses it against the trigram indexes.
+    db.session.execute(
+        text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+        {"threshold": str(threshold)},
+    )
+    rows = db.session.execute(text(
+        f"SELECT id, full_name, email, created_at, word_similarity(:norm, lower(full_name)) AS name_score, "
+        f"word_similarity(:norm, {local}) AS email_score "
+        f"FROM candidate WHERE {' OR '.join(where)}"
+    ), params)
+    out = []
+    for cid, full_name, email, created_at, name_score, email_score in rows:
+        kind = _classify(q, words, full_name or "", email or "", max(name_score, email_score), threshold)
+        if kind is None:
+            continue
+        match, field = kind
+        out.append({
+            "candidate_id": cid, "full_name": full_name, "email": email,
+            "match": match, "field": field or ("name" if name_score >= email_score else "email"),
+            "score": round(float(max(name_score, email_score)), 4),
+            "_created": created_at.timestamp() if created_at else 0.0,
+        })
+    return _finish(out, limit)
+
+
+def find_candidates_by_name(text_: str, limit: Optional[int] = 10,
+                            threshold: float = NAME_SIMILARITY_THRESHOLD) -> List[Dict]:
+    """
+    Candidates whose name or email matches `text_`, best first (see module
+    docstring). Each match carries candidate_id, full_name, email, match
+    (exact / token / fuzzy), field (name / email) and score (0..1).
+    """
+    if db.engine.dialect.name == "postgresql":
+        return _find_postgres(text_, limit, threshold)
+    return name_index().find(text_, limit, threshold)
+
+
+def best_matches(matches: List[Dict]) -> List[Dict]:
+    """The matches of the best kind present (exact before token before fuzzy)."""
+    if not matches:
+        return []
+    kind = matches[0]["match"]
+    return [m for m in matches if m["match"] == kind]
@@ -2,12 +2,12 @@ import os
 import uuid
 from typing import List, Dict
 from docx import Document
-from groq import Groq
 from services.pdf_extractor import extract_text_from_pdf
 from services.groq_parser import parse_resume_with_groq, validate_parsed_data
 from services.local_storage import LocalStorageManager
-from services.vector_db import VectorDatabase
+from services.vector_db import VectorDatabase, embedding_fingerprint
 from services.embeddings import EmbeddingGenerator
+from services.model_registry import get_groq_client
 from models import db, Candidate
 from models.resume_schema import ResumeData
 import re
@@ -265,11 +265,13 @@ class RAGResumePipeline:
     """
 
     def __init__(self):
+        # Cheap to construct: models and clients come from the shared
+        # registry. Prefer model_registry.get_pipeline() over new instances.
         self.storage = LocalStorageManager()
         self.vector_db = VectorDatabase()
         self.embedder = EmbeddingGenerator()
-        self.client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
-        self.llm_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.client = get_groq_client()
+        self.llm_client = self.client
 
     # ------------------------- MAIN PROCESSING ------------------------- #
 
@@ -287,190 +289,20 @@ class RAGResumePipeline:
         try:
             # 1) Save file
             print("1. Saving file to local storage...")
-            file_path = self.storage.upload_resume(file_obj, candidate_id)
+            file_path = self.save_file(file_obj, candidate_id)
             print(f"   ✓ Saved to: {file_path}")
 
-            # 2) Extract text
-            print("2. Extracting text from file...")
-            resume_text = extract_resume_text(file_path)
-            print(f"   ✓ Extracted {len(resume_text)} characters")
-
-            # 3) Always use Groq parsing for maximum extraction quality
-            print("3. Parsing resume with Groq Llama 3.3 70B...")
-            parsed_data = parse_resume_with_groq(resume_text)
-            print("   ✓ Parsed successfully")
-
-            import json
-            parsed_dict = parsed_data.dict()
-
-            print("===== PARSED RESUME (DEBUG) =====")
-            print(json.dumps(parsed_dict, indent=2)[:4000])
-            print("=================================")
-
-            # 4) Validation stats
-            stats = validate_parsed_data(parsed_data)
-            
-            # ✅ FIXED: Safe stats printing with all new fields
-            print("\n   Parsing Statistics:")
-            print(f"   - Candidate: {stats.get('candidate_name', 'Unknown')}")
-            print(f"   - Email: {stats.get('email', 'Not found')}")
-            print(f"   - Phone: {stats.get('phone', 'Not found')}")
-            print(f"   - Primary Role: {stats.get('primary_role', 'Not found')}")
-            print(f"   - Experience Summary: {'✓' if stats.get('has_experience_summary') else '✗'}")
-            print(f"   - Primary Skills: {stats.get('primary_skills_count', 0)}")
-            print(f"   - Technical Skills: {stats.get('technical_skills_count', 0)}")
-            print(f"   - Skill Categories: {stats.get('skill_categories_count', 0)}")
-            print(f"   - Total Jobs: {stats.get('total_jobs', 0)}")
-            print(f"   - Total Projects: {stats.get('total_projects', 0)}")
-            print(f"   - Projects with Description: {stats.get('projects_with_description', 0)}")
-            print(f"   - Projects with Role: {stats.get('projects_with_role', 0)}")
-            print(f"   - Projects with Responsibilities: {stats.get('projects_with_responsibilities', 0)}")
-            print(f"   - Certifications: {stats.get('certifications_count', 0)}")
-            print(f"   - Total Responsibilities: {stats.get('total_responsibilities', 0)}")
-            print(f"   - Total Experience: {stats.get('total_experience_years', 0.0)} years")
-            print(f"   - Education Entries: {stats.get('education_count', 0)}")
-            
-            # Print job breakdown if exists
-            for job in stats.get("jobs_breakdown", []):
-                print(
-                    f"     • {job.get('company', 'Unknown')} - {job.get('title', 'Unknown')}: "
-                    f"{job.get('responsibilities_count', 0)} responsibilities"
-                )
-            
-            # Print project breakdown if exists
-            for proj in stats.get("project_breakdown", []):
-                print(
-                    f"     • Project '{proj.get('name', 'Unknown')}': "
-                    f"{proj.get('responsibilities_count', 0)} responsibilities, "
-                    f"{proj.get('technical_tools_count', 0)} tools"
-                )
+            # 2-4) Extract, parse, validate
+            resume_text, parsed_data, stats = self.parse_file(file_path)
 
             # 5) Generate embeddings
             print("\n4. Generating embeddings...")
-            summary_text = self._create_summary_text(parsed_data)
-            summary_embedding = self.embedder.generate_embedding(summary_text)
-
-            experience_texts = [
-                self._create_experience_text(exp)
-                for exp in (parsed_data.work_experiences or [])
-            ]
-            experience_embeddings = self.embedder.generate_batch_embeddings(
-                experience_texts
-            ) if experience_texts else []
-
-            print(f"   ✓ Generated {len(experience_embeddings) + 1} embeddings")
+            embeddings = self.embed_parsed_batch([parsed_data])[0]
+            print(f"   ✓ Generated {len(embeddings['experiences']) + 1} embeddings")
 
             # 6) Store in SQL
             print("5. Saving candidate record in SQL...")
-            from datetime import datetime
-
-            raw_text = resume_text
-            parsed = parsed_dict or {}
-            sections = parsed.get("sections") or {}
-
-            # ✅ IMPROVED: Better field extraction
-            projects = (
-                parsed.get("projects") or 
-                sections.get("projects") or 
-                []
-            )
-            
-            contact = parsed.get("contact") or parsed.get("contact_info") or {}
-            phone = (
-                parsed.get("phone") or
-                contact.get("phone") or
-                contact.get("mobile") or
-                ""
-            )
-
-            roles = (
-                parsed.get("work_experiences") or
-                parsed.get("roles") or
-                parsed.get("experience") or
-                sections.get("experience") or
-                []
-            )
-
-            skills = (
-                parsed.get("technical_skills") or
-                parsed.get("skills") or
-                sections.get("skills") or
-                []
-            )
-
-            education = (
-                parsed.get("education") or
-                sections.get("education") or
-                []
-            )
-
-            certifications = parsed.get("certifications") or []
-            languages = parsed.get("languages") or []
-
-            # ✅ IMPROVED: Better primary_role extraction
-            primary_role = parsed.get("primary_role")
-            if not primary_role and roles:
-                first_role = roles[0] if roles else {}
-                if isinstance(first_role, dict):
-                    primary_role = first_role.get("job_title") or ""
-                    
-            # ✅ NEW: Also try from latest project role
-            if not primary_role and projects:
-                first_project = projects[0] if projects else {}
-                if isinstance(first_project, dict):
-                    primary_role = first_project.get("role") or ""
-
-            # ✅ SMART EXPERIENCE CALCULATION
-            # Experience calculation priority (explicit):
-            # 1) Parsed LLM output (total_experience_years)
-            # 2) Regex extraction from summary text
-            # 3) Duration-based calculation from work history
-            # Final experience is the MAX across sources.
-            llm_experience = float(parsed.get("total_experience_years") or 0.0)
-            
-            # 2) From experience summary text extraction
-            summary_experience = extract_experience_from_summary(parsed)
-            
-            # 3) From work_experiences duration calculation
-            jobs_experience = calculate_experience_from_jobs(roles)
-            
-            # Use the highest value (most accurate)
-            final_experience = max(llm_experience, summary_experience, jobs_experience)
-            
-            print(f"\n   📊 Experience Sources:")
-            print(f"      - LLM parsed: {llm_experience} years")
-            print(f"      - Summary extraction: {summary_experience} years")
-            print(f"      - Jobs calculation: {jobs_experience} years")
-            print(f"      - ✅ Final: {final_experience} years")
-
-            cand = Candidate(
-                full_name=parsed.get("candidate_name") or "",
-                email=parsed.get("email") or "",
-                phone=phone,
-                raw_text=raw_text,
-                parsed=parsed,
-                pdf_path=file_path,
-                skills=skills,
-                education=education,
-                work_experiences=roles,
-                certifications=certifications,
-                languages=languages,
-                projects=projects,
-                total_experience_years=final_experience,  # ✅ NEW: Smart calculation
-                primary_role=primary_role,
-                primary_domain=parsed.get("primary_domain"),
-                source="upload",
-                created_at=datetime.utcnow(),
-            )
-
-            # ✅ Safe bucket classification
-            try:
-                from services.chatbot import classify_candidate_bucket
-                cand.role_bucket = classify_candidate_bucket(parsed, primary_role)
-            except Exception as e:
-                print(f"   Warning: Bucket classification failed: {e}")
-                cand.role_bucket = "general"
-
+            cand = self.build_candidate(file_path, resume_text, parsed_data)
             db.session.add(cand)
             db.session.commit()
 
@@ -478,15 +310,8 @@ class RAGResumePipeline:
 
             # 7) Store in vector DB
             print("6. Storing in vector database...")
-            self.vector_db.add_candidate(
-                candidate_id=cand.id,
-                parsed_data=parsed_dict,
-                embeddings={
-                    "summary": summary_embedding,
-                    "experiences": experience_embeddings,
-                },
-                pdf_path=file_path,
-            )
+            parsed_dict = cand.parsed
+            self.store_vectors(cand, parsed_dict, embeddings)
             print("   ✓ Stored in vector DB")
 
             print(f"\n{'=' * 60}")
@@ -512,6 +337,246 @@ class RAGResumePipeline:
                 "candidate_id": candidate_id,
             }
 
+    # ------------------------- PIPELINE STAGES ------------------------- #
+    # process_resume() runs these back to back for a single file. The bulk
+    # ingestion engine (services/bulk_ingest.py) runs parse_file() across a
+    # worker pool and the remaining stages in batches.
+
+    def save_file(self, file_obj, candidate_id: str) -> str:
+        """Persist the uploaded file and return its local path."""
+        return self.storage.upload_resume(file_obj, candidate_id)
+
+    def parse_file(self, file_path: str):
+        """
+        Extract text and parse it with Groq (I/O bound, safe to call from threads).
+        Returns (resume_text, parsed_data, stats).
+        """
+        print("2. Extracting text from file...")
+        resume_text = extract_resume_text(file_path)
+        print(f"   ✓ Extracted {len(resume_text)} characters")
+
+        # Always use Groq parsing for maximum extraction quality
+        print("3. Parsing resume with Groq Llama 3.3 70B...")
+        parsed_data = parse_resume_with_groq(resume_text)
+        print("   ✓ Parsed successfully")
+
+        import json
+        print("===== PARSED RESUME (DEBUG) =====")
+        print(json.dumps(parsed_data.dict(), indent=2)[:4000])
+        print("=================================")
+
+        # Validation stats
+        stats = validate_parsed_data(parsed_data)
+        self._print_stats(stats)
+        return resume_text, parsed_data, stats
+
+    def _print_stats(self, stats: Dict):
+        # ✅ FIXED: Safe stats printing with all new fields
+        print("\n   Parsing Statistics:")
+        print(f"   - Candidate: {stats.get('candidate_name', 'Unknown')}")
+        print(f"   - Email: {stats.get('email', 'Not found')}")
+        print(f"   - Phone: {stats.get('phone', 'Not found')}")
+        print(f"   - Primary Role: {stats.get('primary_role', 'Not found')}")
+        print(f"   - Experience Summary: {'✓' if stats.get('has_experience_summary') else '✗'}")
+        print(f"   - Primary Skills: {stats.get('primary_skills_count', 0)}")
+        print(f"   - Technical Skills: {stats.get('technical_skills_count', 0)}")
+        print(f"   - Skill Categories: {stats.get('skill_categories_count', 0)}")
+        print(f"   - Total Jobs: {stats.get('total_jobs', 0)}")
+        print(f"   - Total Projects: {stats.get('total_projects', 0)}")
+        print(f"   - Projects with Description: {stats.get('projects_with_description', 0)}")
+        print(f"   - Projects with Role: {stats.get('projects_with_role', 0)}")
+        print(f"   - Projects with Responsibilities: {stats.get('projects_with_responsibilities', 0)}")
+        print(f"   - Certifications: {stats.get('certifications_count', 0)}")
+        print(f"   - Total Responsibilities: {stats.get('total_responsibilities', 0)}")
+        print(f"   - Total Experience: {stats.get('total_experience_years', 0.0)} years")
+        print(f"   - Education Entries: {stats.get('education_count', 0)}")
+
+        # Print job breakdown if exists
+        for job in stats.get("jobs_breakdown", []):
+            print(
+                f"     • {job.get('company', 'Unknown')} - {job.get('title', 'Unknown')}: "
+                f"{job.get('responsibilities_count', 0)} responsibilities"
+            )
+
+        # Print project breakdown if exists
+        for proj in stats.get("project_breakdown", []):
+            print(
+                f"     • Project '{proj.get('name', 'Unknown')}': "
+                f"{proj.get('responsibilities_count', 0)} responsibilities, "
+                f"{proj.get('technical_tools_count', 0)} tools"
+            )
+
+    def embed_parsed_batch(self, parsed_list: List) -> List[Dict]:
+        """
+        Embed summary + experience texts for many parsed resumes in one
+        batched encode (see EmbeddingGenerator.generate_batch_embeddings) and
+        scatter the vectors back per resume.
+
+        Accepts ResumeData objects (fresh parses) or stored `parsed` dicts
+        (re-indexing from SQL); both go through the same text builders, so a
+        fresh parse and a re-index of its stored row embed identical text.
+        Returns [{"summary": [...], "experiences": [[...], ...], "fingerprint": str}, ...]
+        """
+        texts: List[str] = []
+        spans = []
+        for parsed_data in parsed_list:
+            if not isinstance(parsed_data, dict):
+                parsed_data = parsed_data.dict()
+            start = len(texts)
+            texts.extend(self.vector_db.candidate_texts(parsed_data))
+            spans.append((start, len(texts)))
+
+        vectors = self.embedder.generate_batch_embeddings(texts) if texts else []
+
+        return [
+            {
+                "summary": vectors[start],
+                "experiences": vectors[start + 1:stop],
+                "fingerprint": embedding_fingerprint(texts[start:stop]),
+            }
+            for start, stop in spans
+        ]
+
+    def build_candidate(self, file_path: str, resume_text: str, parsed_data: ResumeData) -> Candidate:
+        """Build (but do not commit) the Candidate row for a parsed resume."""
+        from datetime import datetime
+
+        raw_text = resume_text
+        parsed = parsed_data.dict() or {}
+        sections = parsed.get("sections") or {}
+
+        # ✅ IMPROVED: Better field extraction
+        projects = (
+            parsed.get("projects") or
+            sections.get("projects") or
+            []
+        )
+
+        contact = parsed.get("contact") or parsed.get("contact_info") or {}
+        phone = (
+            parsed.get("phone") or
+            contact.get("phone") or
+            contact.get("mobile") or
+            ""
+        )
+
+        roles = (
+            parsed.get("work_experiences") or
+            parsed.get("roles") or
+            parsed.get("experience") or
+            sections.get("experience") or
+            []
+        )
+
+        skills = (
+            parsed.get("technical_skills") or
+            parsed.get("skills") or
+            sections.get("skills") or
+            []
+        )
+
+        education = (
+            parsed.get("education") or
+            sections.get("education") or
+            []
+        )
+
+        certifications = parsed.get("certifications") or []
+        languages = parsed.get("languages") or []
+
+        # ✅ IMPROVED: Better primary_role extraction
+        primary_role = parsed.get("primary_role")
+        if not primary_role and roles:
+            first_role = roles[0] if roles else {}
+            if isinstance(first_role, dict):
+                primary_role = first_role.get("job_title") or ""
+
+        # ✅ NEW: Also try from latest project role
+        if not primary_role and projects:
+            first_project = projects[0] if projects else {}
+            if isinstance(first_project, dict):
+                primary_role = first_project.get("role") or ""
+
+        # ✅ SMART EXPERIENCE CALCULATION
+        # Experience calculation priority (explicit):
+        # 1) Parsed LLM output (total_experience_years)
+        # 2) Regex extraction from summary text
+        # 3) Duration-based calculation from work history
+        # Final experience is the MAX across sources.
+        llm_experience = float(parsed.get("total_experience_years") or 0.0)
+
+        # 2) From experience summary text extraction
+        summary_experience = extract_experience_from_summary(parsed)
+
+        # 3) From work_experiences duration calculation
+        jobs_experience = calculate_experience_from_jobs(roles)
+
+        # Use the highest value (most accurate)
+        final_experience = max(llm_experience, summary_experience, jobs_experience)
+
+        print(f"\n   📊 Experience Sources:")
+        print(f"      - LLM parsed: {llm_experience} years")
+        print(f"      - Summary extraction: {summary_experience} years")
+        print(f"      - Jobs calculation: {jobs_experience} years")
+        print(f"      - ✅ Final: {final_experience} years")
+
+        cand = Candidate(
+            full_name=parsed.get("candidate_name") or "",
+            email=parsed.get("email") or "",
+            phone=phone,
+            raw_text=raw_text,
+            parsed=parsed,
+            pdf_path=file_path,
+            skills=skills,
+            education=education,
+            work_experiences=roles,
+            certifications=certifications,
+            languages=languages,
+            projects=projects,
+            total_experience_years=final_experience,  # ✅ NEW: Smart calculation
+            primary_role=primary_role,
+            primary_domain=parsed.get("primary_domain"),
+            source="upload",
+            created_at=datetime.utcnow(),
+        )
+
+        # ✅ Safe bucket classification
+        try:
+            from services.chatbot import classify_candidate_bucket
+            cand.role_bucket = classify_candidate_bucket(parsed, primary_role)
+        except Exception as e:
+            print(f"   Warning: Bucket classification failed: {e}")
+            cand.role_bucket = "general"
+
+        return cand
+
+    def store_vectors(self, cand: Candidate, parsed_dict: dict, embeddings: Dict):
+        """Write a committed candidate's embeddings to the vector DB."""
+        self.store_vectors_batch([(cand, parsed_dict, embeddings)])
+
+    def store_vectors_batch(self, rows) -> int:
+        """
+        Write [(candidate, parsed_dict, embeddings), ...] with one bulk upsert
+        and record their fingerprints, so the incremental indexer skips them.
+        """
+        from services.incremental_indexer import record_indexed
+
+        written = self.vector_db.upsert_candidates([
+            {
+                "candidate_id": cand.id,
+                "parsed_data": parsed_dict,
+                "embeddings": embeddings,
+                "pdf_path": cand.pdf_path,
+            }
+            for cand, parsed_dict, embeddings in rows
+        ])
+        record_indexed([
+            (cand.id, embeddings.get("fingerprint"), 1 + len(embeddings.get("experiences") or []))
+            for cand, _, embeddings in rows
+            if embeddings.get("fingerprint")
+        ])
+        return written
+
     # ------------------------- BATCH ------------------------- #
     def batch_process_resumes(self, files: List) -> Dict:
         results = []
@@ -568,6 +633,10 @@ class RAGResumePipeline:
             print(f"Vector DB add failed (non-critical): {e}")
 
     # ------------------------- SEARCH ------------------------- #
+    # Vector hits include experience docs, so several hits can belong to one
+    # candidate; over-fetch so top_k distinct candidates usually survive.
+    SEARCH_OVERFETCH = 3
+
     def search_candidates(
         self,
         job_description: str,
@@ -587,7 +656,7 @@ class RAGResumePipeline:
         jd_embedding = self.embedder.generate_embedding(job_description)
         hits = self.vector_db.semantic_search(
             query_embedding=jd_embedding,
-            top_k=top_k,
+            top_k=top_k * self.SEARCH_OVERFETCH,
             candidate_ids=candidate_ids,  # ✅ PASS TO VECTOR DB
         )
         print(f"✓ Raw vector hits: {len(hits)}")
@@ -596,43 +665,43 @@ class RAGResumePipeline:
             print("No vector hits; falling back to latest candidates from SQL.")
             
             # ✅ Apply candidate_ids filter to fallback query too
-            query = Candidate.query.order_by(Candidate.created_at.desc())
+            query = self._ranking_rows_query().order_by(Candidate.created_at.desc())
             if candidate_ids:
                 query = query.filter(Candidate.id.in_(candidate_ids))
             rows = query.limit(top_k).all()
-            
+
             enriched = []
             for cand_row in rows:
                 years = cand_row.total_experience_years or 0.0
                 if min_experience_years is not None and years < min_experience_years:
                     continue
-
-                parsed = cand_row.parsed or {}
-                skills = parsed.get("technical_skills") or parsed.get("skills") or []
-                roles = parsed.get("work_experiences") or parsed.get("roles") or []
-
-                enriched.append({
-                    "candidate_id": cand_row.id,
-                    "candidate_name": cand_row.full_name or "Unknown",
-                    "similarity_score": 0.5,
-                    "total_experience_years": float(years),
-                    "skills": skills,
-                    "roles": roles,
-                    "primary_role": cand_row.primary_role,
-                    "primary_domain": cand_row.primary_domain,
-                    "match_reason": "Recent candidate (fallback)",
-                })
+                enriched.append(self._ranking_row_dict(
+                    cand_row, 0.5, "Recent candidate (fallback)",
+                ))
             return enriched
 
-        enriched: List[Dict] = []
+        # Collapse summary/experience hits per candidate, keeping the best
+        # similarity; first-seen order is preserved for equal scores.
+        best: Dict[int, float] = {}
+        allowed = set(candidate_ids) if candidate_ids else None
         for h in hits:
             cand_id = h["candidate_id"]
-            
             # ✅ Skip if not in allowed IDs
-            if candidate_ids and cand_id not in candidate_ids:
+            if allowed is not None and cand_id not in allowed:
                 continue
-            
-            cand_row: Candidate | None = Candidate.query.get(cand_id)
+            if h["similarity"] > best.get(cand_id, -1.0):
+                best[cand_id] = h["similarity"]
+        ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+
+        # One IN query for every hit instead of a row fetch per hit.
+        rows = {
+            row.id: row
+            for row in self._ranking_rows_query().filter(Candidate.id.in_(list(best))).all()
+        } if best else {}
+
+        enriched: List[Dict] = []
+        for cand_id, similarity in ranked:
+            cand_row = rows.get(cand_id)
             if not cand_row:
                 continue
 
@@ -640,24 +709,52 @@ class RAGResumePipeline:
             if min_experience_years is not None and years < min_experience_years:
                 continue
 
-            parsed = cand_row.parsed or {}
-            skills = parsed.get("technical_skills") or parsed.get("skills") or []
-            roles = parsed.get("work_experiences") or parsed.get("roles") or []
-
-            enriched.append({
-                "candidate_id": cand_row.id,
-                "candidate_name": cand_row.full_name or "Unknown",
-                "similarity_score": 1.0 - float(h["score"]),
-                "total_experience_years": float(years),
-                "skills": skills,
-                "roles": roles,
-                "primary_role": cand_row.primary_role,
-                "primary_domain": cand_row.primary_domain,
-                "match_reason": f"Skills match: {', '.join(skills[:5])}" if skills else "Semantic match",
-            })
+            enriched.append(self._ranking_row_dict(cand_row, similarity))
+            if len(enriched) >= top_k:
+                break
 
         return enriched
 
+    @staticmethod
+    def _ranking_rows_query():
+        """
+        Candidate columns needed for ranking only. Skills and roles are the
+        `parsed` keys the hits have always shown, extracted in SQL so the
+        raw_text / parsed blobs stay in the database; the Candidate.skills /
+        work_experiences columns are not kept in step by every edit path
+        (merges, normalize-resumes).
+        """
+        from models import Candidate
+
+        return Candidate.query.with_entities(
+            Candidate.id,
+            Candidate.full_name,
+            Candidate.total_experience_years,
+            Candidate.parsed["technical_skills"].label("technical_skills"),
+            Candidate.parsed["skills"].label("parsed_skills"),
+            Candidate.parsed["work_experiences"].label("work_experiences"),
+            Candidate.parsed["roles"].label("roles"),
+            Candidate.primary_role,
+            Candidate.primary_domain,
+        )
+
+    @staticmethod
+    def _ranking_row_dict(cand_row, similarity: float, match_reason: str | None = None) -> Dict:
+        skills = cand_row.technical_skills or cand_row.parsed_skills or []
+        roles = cand_row.work_experiences or cand_row.roles or []
+        if match_reason is None:
+            match_reason = f"Skills match: {', '.join(skills[:5])}" if skills else "Semantic match"
+        return {
+            "candidate_id": cand_row.id,
+            "candidate_name": cand_row.full_name or "Unknown",
+            "similarity_score": similarity,
+            "total_experience_years": float(cand_row.total_experience_years or 0.0),
+            "skills": skills,
+            "roles": roles,
+            "primary_role": cand_row.primary_role,
+            "primary_domain": cand_row.primary_domain,
+            "match_reason": match_reason,
+        }
 
     # ------------------------- UTILITIES ------------------------- #
     def get_candidate_details(self, candidate_id: str) -> Dict:
@@ -672,46 +769,3 @@ class RAGResumePipeline:
             "pdf_path": rec["pdf_path"],
             "parsed": rec["parsed_data"],
         }
-
-    def _create_summary_text(self, parsed_data) -> str:
-        """Create rich summary text for embedding."""
-        parts = []
-        
-        # Name
-        if parsed_data.candidate_name:
-            parts.append(parsed_data.candidate_name)
-        
-        # Experience summary
-        if parsed_data.experience_summary:
-            parts.append(parsed_data.experience_summary[:500])
-        elif parsed_data.professional_summary:
-            parts.append(parsed_data.professional_summary[:500])
-        
-        # Primary skills
-        if parsed_data.primary_skills:
-            parts.append(f"Skills: {', '.join(parsed_data.primary_skills[:15])}")
-        
-        # Technical skills
-        if parsed_data.technical_skills:
-            parts.append(f"Technical: {', '.join(parsed_data.technical_skills[:15])}")
-        
-        # Primary role
-        if parsed_data.primary_role:
-            parts.append(f"Role: {parsed_data.primary_role}")
-        
-        return " ".join(parts)
-
-    def _create_experience_text(self, experience) -> str:
-        """Create text from work experience for embedding."""
-        parts = []
-        
-        if experience.job_title:
-            parts.append(experience.job_title)
-        
-        if experience.company_name:
-            parts.append(f"at {experience.company_name}")
-        
-        if experience.responsibilities:
-            parts.append(" ".join(experience.responsibilities[:5]))
-        
-        return " ".join(parts) if parts else "Experience"
@@ -0,0 +1,115 @@
+"""
+Ranking result cache for the chat AIRANK ranking and /api/llm-rank.
+
+shortlist() pages are cached in the shared SQLite cache file (CACHE_DB_PATH)
+under a key built from the request parameters and the ranking data version:
+a counter in the same file that is bumped after candidates are ingested,
+edited, deleted, re-bucketed or benched and after JD edits. A bump makes
+every older key unreachable; those entries then age out through LRU/TTL
+eviction. The TTL also bounds staleness after writes that skip the bump
+(bulk SQL). Every gunicorn worker shares the file, so a result computed or
+a bump made in one worker is seen by all.
+
+The data version is kept even with the cache disabled: the per-worker filter
+index (services/filter_index) syncs when it moves.
+"""
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config.local_config import (
+    CACHE_DB_PATH,
+    RANK_CACHE_ENABLED,
+    RANK_CACHE_MAX_ENTRIES,
+    RANK_CACHE_TTL_SECONDS,
+)
+
+_DATA_VERSION = "ranking_data_version"
+
+_rank_cache = None
+_counters = None
+_init_lock = threading.Lock()
+
+
+def get_rank_cache():
+    """Process-wide ranking cache (None when disabled)."""
+    global _rank_cache
+    if not RANK_CACHE_ENABLED:
+        return None
+    if _rank_cache is None:
+        with _init_lock:
+            if _rank_cache is None:
+                from services.sqlite_cache import SQLiteLRUCache
+                _rank_cache = SQLiteLRUCache(
+                    CACHE_DB_PATH,
+                    table="rank_cache",
+                    max_entries=RANK_CACHE_MAX_ENTRIES,
+                    ttl_seconds=RANK_CACHE_TTL_SECONDS,
+                )
+    return _rank_cache
+
+
+def _get_counters():
+    global _counters
+    if _counters is None:
+        with _init_lock:
+            if _counters is None:
+                from services.sqlite_cache import SQLiteCounter
+                _counters = SQLiteCounter(CACHE_DB_PATH)
+    return _counters
+
+
+def data_version() -> int:
+    return _get_counters().get(_DATA_VERSION)
+
+
+def bump_data_version() -> Optional[int]:
+    """Invalidate every cached ranking and filter index; call after committing a candidate or JD change."""
+    try:
+        return _get_counters().incr(_DATA_VERSION)
+    except Exception as e:
+        print(f"⚠️ Ranking data version bump failed (non-critical): {e}")
+        return None
+
+
+def shortlist_cache_key(version: int, jd, order: str, bucket: Optional[str], on_bench: Optional[bool],
+                        limit: int, offset: int) -> str:
+    params = json.dumps([jd.id, jd.sid, order, bucket, on_bench, limit, offset])
+    return f"shortlist:v{version}:{params}"
+
+
+def cached_shortlist(jd, order: str = "smart", bucket: Optional[str] = None, on_bench: Optional[bool] = None,
+                     limit: int = 10, offset: int = 0) -> Tuple[List[Dict], int]:
+    """jd_shortlist.shortlist(), served from the ranking cache while the data version holds."""
+    from services.jd_shortlist import shortlist
+
+    cache = get_rank_cache()
+    key = None
+    if cache is not None:
+        try:
+            # Read the version before computing: a bump landing meanwhile
+            # leaves this result under the old, unreachable key.
+            key = shortlist_cache_key(data_version(), jd, order, bucket, on_bench, limit, offset)
+            cached = cache.get(key)
+            if cached is not None:
+                print(f"   ⚡ Ranking cache hit for JD {jd.sid}")
+                rows, total = cached
+                return rows, total
+        except Exception as e:
+            print(f"⚠️ Ranking cache read failed (non-critical): {e}")
+
+    rows, total = shortlist(jd, order=order, bucket=bucket, on_bench=on_bench, limit=limit, offset=offset)
+
+    if key is not None:
+        try:
+            cache.set(key, [rows, total])
+        except Exception as e:
+            print(f"⚠️ Ranking cache write failed (non-critical): {e}")
+    return rows, total
+
+
+def rank_cache_stats() -> dict:
+    cache = get_rank_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "data_version": data_version(), **cache.stats()}
@@ -1,8 +1,10 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .skill_ontology import expand_skills, normalize
 
-def compute_tech_score(resume_skills: List[str], jd_required: List[str], jd_bonus: List[str]):
-    resume_set = expand_skills(resume_skills)
+def compute_tech_score(resume_skills: List[str], jd_required: List[str], jd_bonus: List[str],
+                       expanded_skills: Optional[List[str]] = None):
+    # expanded_skills: a stored expand_skills(resume_skills) (candidate_features)
+    resume_set = set(expanded_skills) if expanded_skills is not None else expand_skills(resume_skills)
     req_set = {normalize(s) for s in jd_required}
     bonus_set = {normalize(s) for s in jd_bonus}
 
@@ -35,7 +37,7 @@ def build_candidate_result(candidate: Dict[str, Any], jd: Dict[str, Any]):
     jd_bonus = jd.get("bonus_skills", []) or []
 
     skills = candidate.get("skills") or []
-    base = compute_tech_score(skills, jd_required, jd_bonus)
+    base = compute_tech_score(skills, jd_required, jd_bonus, candidate.get("expanded_skills"))
 
     return {
         "candidate": candidate,
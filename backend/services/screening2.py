@@ -75,8 +75,11 @@ def score_role_relevance(role: Dict, jd_required: List[str], candidate_skills: L
 from datetime import datetime
 import re
 
-def parse_date_flexible(date_str):
-    """Parse various date formats into a year (int)"""
+# parse_year() result for an ongoing role; resolve_year() turns it into the current year.
+PRESENT = "present"
+
+def parse_year(date_str):
+    """Parse various date formats into a year (int), PRESENT for ongoing, else None"""
     if not date_str or not isinstance(date_str, str):
         return None
     
@@ -84,7 +87,7 @@ def parse_date_flexible(date_str):
     
     # Handle "ongoing", "present", "current", "till date"
     if any(word in date_str for word in ["ongoing", "present", "current", "till date"]):
-        return datetime.now().year
+        return PRESENT
     
     # Try to extract year (4 digits)
     year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
@@ -108,7 +111,17 @@ def parse_date_flexible(date_str):
     
     return None
 
-def parse_duration_string(duration_str):
+def resolve_year(year, current_year=None):
+    """A parse_year() result as a year: PRESENT is `current_year` (default: this year)."""
+    if year == PRESENT:
+        return current_year if current_year is not None else datetime.now().year
+    return year
+
+def parse_date_flexible(date_str):
+    """Parse various date formats into a year (int); ongoing is the current year"""
+    return resolve_year(parse_year(date_str))
+
+def parse_duration_string(duration_str, parse=parse_date_flexible):
     """Parse 'Oct 2019 - Ongoing' into (start_year, end_year)"""
     if not duration_str or not isinstance(duration_str, str):
         return (None, None)
@@ -117,56 +130,59 @@ def parse_duration_string(duration_str):
     parts = re.split(r'\s*[-–—to]\s*', duration_str, maxsplit=1)
     
     if len(parts) == 2:
-        start = parse_date_flexible(parts[0])
-        end = parse_date_flexible(parts[1])
+        start = parse(parts[0])
+        end = parse(parts[1])
         return (start, end)
     elif len(parts) == 1:
         # Single date
-        year = parse_date_flexible(parts[0])
+        year = parse(parts[0])
         return (year, year)
     
     return (None, None)
 
-def analyze_experience(roles, jd_required_skills, candidate_skills):
+def raw_role_years(role):
+    """(start_year, end_year) of one role as parse_year() values: start_date/end_date, else duration/dates/period."""
+    start_year = None
+    end_year = None
+    
+    # Try start_date/end_date fields first
+    if role.get("start_date"):
+        start_year = parse_year(str(role.get("start_date")))
+    if role.get("end_date"):
+        end_year = parse_year(str(role.get("end_date")))
+    
+    # If not found, try parsing duration or dates string
+    if start_year is None or end_year is None:
+        duration_str = role.get("duration") or role.get("dates") or role.get("period")
+        if duration_str:
+            start_year, end_year = parse_duration_string(duration_str, parse=parse_year)
+    
+    return start_year, end_year
+
+def role_years(role, current_year=None):
+    """(start_year, end_year) of one role, ongoing resolved to `current_year`."""
+    start_year, end_year = raw_role_years(role)
+    return resolve_year(start_year, current_year), resolve_year(end_year, current_year)
+
+def tenure_stats(roles):
     """
-    Analyze candidate experience with robust date parsing.
-    Handles multiple field name variations.
+    JD-independent part of analyze_experience: tenure, hops, stickiness
+    and flags.
+    """
+    spans = [role_years(role) for role in roles if isinstance(role, dict)]
+    return span_stats(spans, len(roles))
+
+def span_stats(spans, num_roles):
+    """
+    tenure_stats from the dict roles' resolved (start_year, end_year) spans
+    and the number of roles. candidate_features stores the spans unresolved
+    and calls this when scoring.
     """
-    if not roles:
-        return {
-            "total_years": 0.0,
-            "avg_tenure": 0.0,
-            "num_hops": 0,
-            "gaps": [],
-            "stickiness_score": 0.0,
-            "role_relevance": 0.0,
-            "role_flags": []
-        }
-    
     total_years = 0.0
     tenures = []
     flags = []
     
-    for role in roles:
-        if not isinstance(role, dict):
-            continue
-        
-        # Get start and end dates from various field names
-        start_year = None
-        end_year = None
-        
-        # Try start_date/end_date fields first
-        if role.get("start_date"):
-            start_year = parse_date_flexible(str(role.get("start_date")))
-        if role.get("end_date"):
-            end_year = parse_date_flexible(str(role.get("end_date")))
-        
-        # If not found, try parsing duration or dates string
-        if start_year is None or end_year is None:
-            duration_str = role.get("duration") or role.get("dates") or role.get("period")
-            if duration_str:
-                start_year, end_year = parse_duration_string(duration_str)
-        
+    for start_year, end_year in spans:
         # Calculate tenure if we have valid dates
         if start_year and end_year:
             tenure = end_year - start_year
@@ -180,7 +196,6 @@ def analyze_experience(roles, jd_required_skills, candidate_skills):
                 flags.append("short_tenure")
     
     # Calculate metrics
-    num_roles = len(roles)
     num_hops = max(0, num_roles - 1)
     avg_tenure = sum(tenures) / len(tenures) if tenures else 0.0
     
@@ -197,6 +212,37 @@ def analyze_experience(roles, jd_required_skills, candidate_skills):
         hop_penalty = min(30, (num_roles - 1) * 5)  # -5 per hop, max -30
         stickiness_score = max(0, base_score - hop_penalty)
     
+    # Flag if too many hops
+    if num_roles > 5:
+        flags.append("excessive_hopping")
+    
+    return {
+        "total_years": round(total_years, 1),
+        "avg_tenure": round(avg_tenure, 1),
+        "num_hops": num_hops,
+        "stickiness_score": round(stickiness_score, 1),
+        "role_flags": list(set(flags))  # Remove duplicates
+    }
+
+def analyze_experience(roles, jd_required_skills, candidate_skills, tenure=None):
+    """
+    Analyze candidate experience with robust date parsing.
+    Handles multiple field name variations. `tenure` is a stored
+    tenure_stats(roles) result; when given, the dates are not re-parsed.
+    """
+    if not roles:
+        return {
+            "total_years": 0.0,
+            "avg_tenure": 0.0,
+            "num_hops": 0,
+            "gaps": [],
+            "stickiness_score": 0.0,
+            "role_relevance": 0.0,
+            "role_flags": []
+        }
+    
+    stats = tenure if tenure is not None else tenure_stats(roles)
+    
     # Role relevance (0-100)
     # Check if candidate skills match JD requirements
     if not jd_required_skills or not candidate_skills:
@@ -209,16 +255,12 @@ def analyze_experience(roles, jd_required_skills, candidate_skills):
         matches = sum(1 for skill in cand_skills_lower if any(req in skill or skill in req for req in jd_skills_lower))
         role_relevance = min(100, (matches / len(jd_required_skills)) * 100)
     
-    # Flag if too many hops
-    if num_roles > 5:
-        flags.append("excessive_hopping")
-    
     return {
-        "total_years": round(total_years, 1),
-        "avg_tenure": round(avg_tenure, 1),
-        "num_hops": num_hops,
+        "total_years": stats["total_years"],
+        "avg_tenure": stats["avg_tenure"],
+        "num_hops": stats["num_hops"],
         "gaps": [],  
-        "stickiness_score": round(stickiness_score, 1),
+        "stickiness_score": stats["stickiness_score"],
         "role_relevance": round(role_relevance, 1),
-        "role_flags": list(set(flags))  # Remove duplicates
+        "role_flags": list(stats["role_flags"])
     }
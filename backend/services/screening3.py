@@ -1,19 +1,25 @@
 from typing import List, Dict, Any
 from services.skill_ontology import expand_skills, normalize
-from services.screening2 import parse_date_flexible
+from services.screening2 import parse_year, resolve_year
 from datetime import datetime
 
 def score_skill_recency(skill: str, roles: List[Dict]) -> float:
     """Score skill by recency - recent roles weigh more."""
-    if not roles:
+    return recency_from_end_years([parse_year(role.get("end_date")) for role in roles])
+
+def recency_from_end_years(end_years: List, current_year: int = None) -> float:
+    """score_skill_recency from the roles' parse_year(end_date) values, ongoing resolved to `current_year`."""
+    if not end_years:
         return 0.5  # neutral
     
-    recent_year = datetime.now().year - 1
+    current_year = current_year if current_year is not None else datetime.now().year
+    recent_year = current_year - 1
     skill_year_weight = 0.0
     
-    for role in sorted(roles, key=lambda r: parse_date_flexible(r.get("end_date", "")) or 0, reverse=True):
-        role_end = parse_date_flexible(role.get("end_date")) or recent_year
-        role_weight = max(0.1, 1.0 - (datetime.now().year - role_end) * 0.2)  # decays 20%/year
+    ends = [resolve_year(end, current_year) for end in end_years]
+    for role_end in sorted(ends, key=lambda end: end or 0, reverse=True):
+        role_end = role_end or recent_year
+        role_weight = max(0.1, 1.0 - (current_year - role_end) * 0.2)  # decays 20%/year
         
         # Assume skill appears in recent roles
         if role_end >= recent_year - 2:  # last 2 years
@@ -21,7 +27,7 @@ def score_skill_recency(skill: str, roles: List[Dict]) -> float:
         else:
             skill_year_weight += role_weight * 0.3
     
-    return min(1.0, skill_year_weight / max(len(roles), 1))
+    return min(1.0, skill_year_weight / max(len(end_years), 1))
 
 def compute_matrix_score(cand: Dict, jd: Dict) -> Dict:
     """Full JD-Resume matrix scoring."""
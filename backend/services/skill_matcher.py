@@ -0,0 +1,67 @@
+"""
+Multi-pattern substring matching of JD skills against candidate text.
+
+/api/llm-rank asks, for every JD skill, "is it a substring of any string in
+this section?" (the candidate's skills, one project's techs + description +
+name, one role's techs + description + title). Doing that with `in` costs
+JD skills x strings x text length per candidate.
+
+SkillMatcher compiles the JD's skills once into an Aho-Corasick automaton
+(pyahocorasick). scan() joins all of a candidate's sections into one string
+and walks it in a single pass, attributing every hit to its section, so the
+result is exactly what the `in` loops computed.
+"""
+from bisect import bisect_right
+from typing import Dict, FrozenSet, List, Sequence
+
+import ahocorasick
+
+_SEP = "\x00"
+
+
+class SkillMatcher:
+    def __init__(self, patterns: Sequence[str]):
+        """patterns: lowercased JD skills; duplicates are reported (and counted) separately."""
+        self.patterns = list(patterns)
+        by_text: Dict[str, List[int]] = {}
+        for i, p in enumerate(self.patterns):
+            by_text.setdefault(p, []).append(i)
+
+        # "" is in every string; a pattern with the separator could span two
+        # strings, so those few are checked the slow way.
+        self._empty = tuple(by_text.pop("", ()))
+        self._naive = {p: tuple(ix) for p, ix in by_text.items() if _SEP in p}
+        self._automaton = None
+        self._slots = [tuple(ix) for p, ix in by_text.items() if _SEP not in p]
+        if self._slots:
+            self._automaton = ahocorasick.Automaton()
+            for slot, p in enumerate(p for p in by_text if _SEP not in p):
+                self._automaton.add_word(p, slot)
+            self._automaton.make_automaton()
+
+    def scan(self, sections: Sequence[Sequence[str]]) -> List[FrozenSet[int]]:
+        """
+        For each section (a list of strings), the indices of the patterns
+        that are a substring of at least one of its strings.
+        """
+        hits = [set(self._empty) if section else set() for section in sections]
+
+        if self._automaton is not None:
+            texts = [_SEP.join(section) for section in sections]
+            starts, pos = [], 0
+            for t in texts:
+                starts.append(pos)
+                pos += len(t) + 1
+            found = {
+                (bisect_right(starts, end) - 1, slot)
+                for end, slot in self._automaton.iter(_SEP.join(texts))
+            }
+            for k, slot in found:
+                hits[k].update(self._slots[slot])
+
+        for p, ix in self._naive.items():
+            for k, section in enumerate(sections):
+                if any(p in s for s in section):
+                    hits[k].update(ix)
+
+        return [frozenset(h) for h in hits]
@@ -1,85 +1,122 @@
-SKILL_ONTOLOGY = {
-    "cloud": {
-        "aws", "amazon web services",
-        "azure",
-        "gcp", "google cloud platform", "google cloud",
-        "digitalocean"
-    },
-    "ml": {
-        "machine learning", "ml",
-        "scikit-learn", "sklearn",
-        "pytorch", "torch",
-        "tensorflow", "keras",
-        "xgboost", "lightgbm",
-        "catboost"
-    },
-    "data_science": {
-        "data science", "data scientist",
-        "statistics", "statistical modeling",
-        "hypothesis testing", "a/b testing",
-        "time series", "forecasting"
-    },
-    "python": {
-        "python", "python3",
-        "flask", "django", "fastapi",
-        "pandas", "numpy", "scipy",
-        "matplotlib", "seaborn", "plotly"
-    },
-    "databases": {
-        "sql", "nosql",
-        "mysql", "postgresql", "postgres",
-        "oracle", "sql server",
-        "mongodb", "redis", "sqlite"
-    },
-    "data_engineering": {
-        "data engineering", "etl", "elt",
-        "spark", "pyspark",
-        "hadoop", "hdfs",
-        "airflow", "luigi",
-        "kafka", "kinesis"
-    },
-    "devops": {
-        "devops",
-        "docker", "kubernetes", "k8s",
-        "ci/cd", "jenkins", "github actions", "gitlab ci",
-        "terraform", "ansible"
-    },
-    "frontend": {
-        "javascript", "typescript",
-        "react", "redux",
-        "vue", "angular",
-        "html", "css", "tailwind", "bootstrap"
-    },
-    "backend": {
-        "node", "node.js", "express",
-        "java", "spring", "spring boot",
-        "go", "golang",
-        "c#", ".net", "asp.net"
-    },
-    "analytics": {
-        "excel", "power bi", "tableau",
-        "lookerstudio", "looker",
-        "google analytics"
-    },
-}
+"""
+Compiled skill ontology (docs/ontology.json).
+
+The JSON holds four relations:
+
+  categories  category -> member skills; expand_skills adds a whole
+              category (name + members) when any of it is present
+  aliases     canonical -> true synonyms ("k8s" is "kubernetes")
+  related     canonical -> broader search terms ("mysql" for "sql")
+  compounds   one term naming several canonicals ("ai/ml")
+
+load_ontology() compiles them once into hash indexes: per-term category
+closures, alias -> canonical, and canonical -> search terms, so lookups and
+expansion cost O(number of skills). `version` changes whenever the file
+content does; derived data (cached encodings, stored features) keys on it.
+"""
+import hashlib
+import json
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
+
+from config.local_config import ONTOLOGY_PATH
+
 
 def normalize(text: str) -> str:
     return text.strip().lower()
 
+
+class Ontology:
+    def __init__(self, data: Dict, version: str):
+        self.version = version
+        self.categories: Dict[str, FrozenSet[str]] = {
+            normalize(name): frozenset(normalize(s) for s in members)
+            for name, members in (data.get("categories") or {}).items()
+        }
+
+        # term -> every term its categories pull in (itself included)
+        closure: Dict[str, Set[str]] = {}
+        for name, members in self.categories.items():
+            group = members | {name}
+            for term in group:
+                closure.setdefault(term, {term}).update(group)
+        self._closure: Dict[str, FrozenSet[str]] = {t: frozenset(g) for t, g in closure.items()}
+
+        self._alias: Dict[str, str] = {}     # true synonyms only
+        self._broader: Dict[str, str] = {}   # synonyms + related terms
+        search: Dict[str, list] = {}
+        for relation, index in (("aliases", self._alias), ("related", None)):
+            for canonical, terms in (data.get(relation) or {}).items():
+                canonical = normalize(canonical)
+                bucket = search.setdefault(canonical, [canonical])
+                for term in terms:
+                    term = normalize(term)
+                    if index is not None:
+                        index.setdefault(term, canonical)
+                    self._broader.setdefault(term, canonical)
+                    if term not in bucket:
+                        bucket.append(term)
+        self._search: Dict[str, Tuple[str, ...]] = {c: tuple(t) for c, t in search.items()}
+        self._compounds: Dict[str, Tuple[str, ...]] = {
+            normalize(term): tuple(normalize(c) for c in canonicals)
+            for term, canonicals in (data.get("compounds") or {}).items()
+        }
+
+    def closure(self, term: str) -> FrozenSet[str]:
+        """Category expansion of one normalized term (just the term if uncategorised)."""
+        return self._closure.get(term) or frozenset((term,))
+
+    def expand(self, raw_skills: Iterable) -> Set[str]:
+        """Normalized skills plus every category any of them belongs to."""
+        expanded: Set[str] = set()
+        for s in raw_skills or ():
+            if not isinstance(s, str):
+                continue
+            term = normalize(s)
+            group = self._closure.get(term)
+            if group is None:
+                expanded.add(term)
+            else:
+                expanded |= group
+        return expanded
+
+    def canonical(self, term: str, include_related: bool = False) -> str:
+        """Canonical name for a synonym (or, with include_related, a related term)."""
+        term = normalize(term)
+        index = self._broader if include_related else self._alias
+        return index.get(term, term)
+
+    def canonicals(self, term: str) -> Tuple[str, ...]:
+        """Like canonical(), but compound terms ("ai/ml") map to all they name."""
+        term = normalize(term)
+        if term in self._compounds:
+            return self._compounds[term]
+        return (self._alias.get(term, term),)
+
+    def search_terms(self, term: str) -> Tuple[str, ...]:
+        """The term, its canonical, synonyms and related terms, for substring search."""
+        term = normalize(term)
+        canonical = self._broader.get(term, term)
+        terms = self._search.get(canonical, (canonical,))
+        return terms if term in terms else (term,) + terms
+
+
+def load_ontology(path: str = ONTOLOGY_PATH) -> Ontology:
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    digest = hashlib.sha256(raw).hexdigest()[:12]
+    return Ontology(data, f"{data.get('version', 0)}-{digest}")
+
+
+ONTOLOGY = load_ontology()
+
+# Category view kept for callers that read the raw mapping.
+SKILL_ONTOLOGY = {name: set(members) for name, members in ONTOLOGY.categories.items()}
+
+
 def expand_skills(raw_skills):
     """
     raw_skills: list of strings from parsed resume
     returns: set of normalized skills + ontology expansions
     """
-    if not raw_skills:
-        return set()
-
-    base = {normalize(s) for s in raw_skills if isinstance(s, str)}
-
-    expanded = set(base)
-    for canonical, synonyms in SKILL_ONTOLOGY.items():
-        if canonical in base or any(s in base for s in synonyms):
-            expanded.add(canonical)
-            expanded.update(synonyms)
-
-    return expanded
+    return ONTOLOGY.expand(raw_skills)
@@ -8,20 +8,29 @@ def smart_screen_candidate(candidate: Dict[str, Any], jd: Dict[str, Any]) -> Dic
     """
     Combine tech match, experience quality, and recency matrix
     into one normalized 0–100 score + explanations.
+
+    With a candidate_features record under "features", its skills, role
+    timeline, expanded skills and tenure stats are used instead of
+    re-deriving them from the raw skills/roles.
     """
-    skills = candidate.get("skills") or []
-    roles = candidate.get("roles") or []
+    features = candidate.get("features") or {}
+    if features:
+        skills = features.get("skills") or []
+        roles = features.get("roles") or []
+    else:
+        skills = candidate.get("skills") or []
+        roles = candidate.get("roles") or []
 
     jd_required = jd.get("required_skills", []) or []
     jd_bonus = jd.get("bonus_skills", []) or []
 
     tech = tech_match(
-        {"skills": skills},
+        {"skills": skills, "expanded_skills": features.get("expanded_skills")},
         jd,
     )
     tech_score = tech["tech_score"]
 
-    exp = analyze_experience(roles, jd_required, skills)
+    exp = analyze_experience(roles, jd_required, skills, tenure=features.get("tenure"))
     exp_score = 0.6 * exp["stickiness_score"] + 0.4 * exp["role_relevance"]
 
     matrix = compute_matrix_score(
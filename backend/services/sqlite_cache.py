@@ -0,0 +1,182 @@
+"""
+Small persistent LRU cache on top of stdlib sqlite3.
+
+One SQLite file can hold several caches (one table each). Values are stored
+as JSON text. Entries are evicted least-recently-used once `max_entries` is
+exceeded, and optionally expire after `ttl_seconds`. Hit/miss/eviction
+counters are persisted next to the data, so every gunicorn worker (and the
+ingest worker) sharing the file sees the same numbers.
+
+SQLiteCounter keeps named, monotonically increasing integers in the same
+kind of file (e.g. a data version that cache keys embed).
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+_SAFE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SQLiteLRUCache:
+    def __init__(self, path: str, table: str, max_entries: int = 10000, ttl_seconds: Optional[float] = None):
+        if not _SAFE_NAME.match(table):
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        self._conn = _connect(path)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " expires_at REAL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_accessed_at ON {table} (accessed_at)")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        for name in ("hits", "misses", "evictions"):
+            self._conn.execute(f"INSERT OR IGNORE INTO {table}_stats (name, value) VALUES (?, 0)", (name,))
+
+    # ------------------------- ACCESS ------------------------- #
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._bump("misses")
+                return default
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._bump("hits")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = now + ttl if ttl else None
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now, expires_at),
+            )
+            self._evict(now)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and (row[0] is None or row[0] > time.time())
+
+    # ------------------------- STATS ------------------------- #
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._conn.execute(f"SELECT name, value FROM {self.table}_stats").fetchall())
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # ------------------------- INTERNALS ------------------------- #
+
+    def _bump(self, name: str, by: int = 1):
+        self._conn.execute(f"UPDATE {self.table}_stats SET value = value + ? WHERE name = ?", (by, name))
+
+    def _evict(self, now: float):
+        expired = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        evicted = 0
+        if overflow > 0:
+            evicted = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        if expired or evicted:
+            self._bump("evictions", expired + evicted)
+
+
+class SQLiteCounter:
+    def __init__(self, path: str, table: str = "counters"):
+        if not _SAFE_NAME.match(table):
+            raise ValueError(f"Invalid counter table name: {table!r}")
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+
+        self._conn = _connect(path)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            row = self._conn.execute(f"SELECT value FROM {self.table} WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, name: str, by: int = 1) -> int:
+        """Add `by` and return the new value; atomic across processes."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"INSERT OR IGNORE INTO {self.table} (name, value) VALUES (?, 0)", (name,)
+                )
+                self._conn.execute(
+                    f"UPDATE {self.table} SET value = value + ? WHERE name = ?", (by, name)
+                )
+                value = self._conn.execute(
+                    f"SELECT value FROM {self.table} WHERE name = ?", (name,)
+                ).fetchone()[0]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value
@@ -1,18 +1,114 @@
 # services/vector_db.py
-import chromadb
 from typing import List, Dict, Optional
-from config.local_config import VECTOR_DB_PATH
+from config.local_config import EMBEDDING_MODEL, VECTOR_COLLECTION, VECTOR_DB_PATH, VECTOR_DISTANCE
+from services.model_registry import get_chroma_client, get_chroma_collection
+import hashlib
 import json
 
-class VectorDatabase:
-    def __init__(self):
-        VECTOR_DB_PATH = "chroma_db_v2"
-        self.client = chromadb.PersistentClient(path=VECTOR_DB_PATH)
-        self.collection = self.client.get_or_create_collection(
-            name="resumes",
-            metadata={"description": "Resume embeddings for RAG search"},
+# Max documents per Chroma write call; well under Chroma's SQLite batch limit.
+UPSERT_CHUNK_SIZE = 1000
+
+# Bump when the document layout changes (ids, metadata keys, text builders).
+#   1: chroma_db_v2 / L2, summary + "<id>_exp_<n>" docs
+#   2: VECTOR_DB_PATH / explicit metric, same docs + exp_count on summaries
+VECTOR_SCHEMA_VERSION = 2
+
+DISTANCE_SPACES = ("cosine", "l2", "ip")
+
+
+def distance_to_similarity(distance: float, space: str = VECTOR_DISTANCE) -> float:
+    """
+    Map a Chroma distance to a similarity in [0, 1].
+
+    Embeddings are unit length (all-MiniLM-L6-v2 normalises), so every
+    space reduces to cosine similarity:
+        cosine: d = 1 - cos
+        ip:     d = 1 - a.b  (= 1 - cos)
+        l2:     d = |a - b|^2 = 2 - 2 cos
+    """
+    distance = float(distance)
+    if space == "l2":
+        similarity = 1.0 - distance / 2.0
+    else:
+        similarity = 1.0 - distance
+    return max(0.0, min(1.0, similarity))
+
+
+def embedding_fingerprint(texts: List[str], model: str = EMBEDDING_MODEL) -> str:
+    """sha256 over model, schema version and the exact texts embedded for a candidate."""
+    h = hashlib.sha256(f"{model}\x1f{VECTOR_SCHEMA_VERSION}".encode("utf-8"))
+    for text in texts:
+        h.update(b"\x1e")
+        h.update((text or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def upsert_chunked(
+    collection,
+    ids: List[str],
+    embeddings: List[List[float]],
+    metadatas: List[Dict],
+    documents: Optional[List[str]] = None,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+):
+    """Write parallel id/embedding/metadata/document lists in chunked upserts."""
+    max_batch = getattr(getattr(collection, "_client", None), "max_batch_size", None)
+    if isinstance(max_batch, int) and max_batch > 0:
+        chunk_size = min(chunk_size, max_batch)
+    for start in range(0, len(ids), chunk_size):
+        stop = start + chunk_size
+        collection.upsert(
+            ids=ids[start:stop],
+            embeddings=embeddings[start:stop],
+            metadatas=metadatas[start:stop],
+            documents=documents[start:stop] if documents is not None else None,
         )
 
+
+class VectorDatabase:
+    def __init__(
+        self,
+        path: str = VECTOR_DB_PATH,
+        collection_name: str = VECTOR_COLLECTION,
+        space: str = VECTOR_DISTANCE,
+    ):
+        if space not in DISTANCE_SPACES:
+            raise ValueError(f"Unsupported VECTOR_DISTANCE {space!r}; use one of {DISTANCE_SPACES}")
+        self.path = path
+        self.collection_name = collection_name
+        # Only applied when the collection is first created.
+        self.collection_metadata = {
+            "description": "Resume embeddings for RAG search",
+            "hnsw:space": space,
+            "schema_version": VECTOR_SCHEMA_VERSION,
+            "embedding_model": EMBEDDING_MODEL,
+        }
+
+    # Client and collection are shared process-wide (services/model_registry.py).
+    @property
+    def client(self):
+        return get_chroma_client(self.path)
+
+    @property
+    def collection(self):
+        return get_chroma_collection(self.path, self.collection_name, self.collection_metadata)
+
+    @property
+    def space(self) -> str:
+        """Distance metric the collection was actually created with (Chroma defaults to l2)."""
+        return (self.collection.metadata or {}).get("hnsw:space", "l2")
+
+    def info(self) -> Dict:
+        meta = dict(self.collection.metadata or {})
+        return {
+            "path": self.path,
+            "collection": self.collection_name,
+            "space": meta.get("hnsw:space", "l2"),
+            "schema_version": meta.get("schema_version"),
+            "embedding_model": meta.get("embedding_model"),
+            "count": self.collection.count(),
+        }
+
     def add_candidate(
         self,
         candidate_id: int,              # SQL PK
@@ -20,46 +116,87 @@ class VectorDatabase:
         embeddings: Dict[str, List[float]],
         pdf_path: str,
     ):
-        summary_meta = {
-            "candidate_pk": candidate_id,  # used for lookups
-            "candidate_name": parsed_data.get("candidate_name"),
-            "email": parsed_data.get("email"),
-            "phone": parsed_data.get("phone", ""),
+        self.upsert_candidates([{
+            "candidate_id": candidate_id,
+            "parsed_data": parsed_data,
+            "embeddings": embeddings,
             "pdf_path": pdf_path,
-            "total_experience_years": parsed_data.get("total_experience_years"),
-            "skills": json.dumps(parsed_data.get("technical_skills", [])),
-            "parsed_data": json.dumps(parsed_data),
-            "doc_type": "summary",
-        }
-        summary_meta = self._clean_metadata(summary_meta)
+        }])
 
-        self.collection.add(
-            ids=[str(candidate_id)],
-            embeddings=[embeddings["summary"]],
-            metadatas=[summary_meta],
-            documents=[self._create_summary_text(parsed_data)],
-        )
+    def upsert_candidates(self, batch: List[Dict], chunk_size: int = UPSERT_CHUNK_SIZE) -> int:
+        """
+        Bulk write many candidates: summary doc + one doc per work experience.
+
+        batch: [{"candidate_id", "parsed_data", "embeddings": {"summary", "experiences"}, "pdf_path"}]
+
+        Documents are accumulated across the whole batch and written with
+        chunked `upsert` calls, so re-ingesting a candidate overwrites instead
+        of failing on duplicate ids. Experience docs left over from a previous
+        version with more jobs are removed first. Returns the document count.
+        """
+        ids: List[str] = []
+        vectors: List[List[float]] = []
+        metadatas: List[Dict] = []
+        documents: List[str] = []
+        exp_counts: Dict[int, int] = {}
 
-        for idx, (exp, exp_embedding) in enumerate(
-            zip(parsed_data.get("work_experiences", []), embeddings["experiences"])
-        ):
-            exp_id = f"{candidate_id}_exp_{idx}"
-            exp_meta = {
-                "candidate_pk": candidate_id,
+        for rec in batch:
+            candidate_id = rec["candidate_id"]
+            parsed_data = rec.get("parsed_data") or {}
+            embeddings = rec["embeddings"]
+            experiences = [e for e in (parsed_data.get("work_experiences") or []) if isinstance(e, dict)]
+            exp_count = min(len(experiences), len(embeddings.get("experiences") or []))
+            exp_counts[candidate_id] = exp_count
+
+            summary_meta = {
+                "candidate_pk": candidate_id,  # used for lookups
                 "candidate_name": parsed_data.get("candidate_name"),
-                "company": exp.get("company_name"),
-                "job_title": exp.get("job_title"),
-                "duration_months": exp.get("duration_months"),
-                "doc_type": "experience",
+                "email": parsed_data.get("email"),
+                "phone": parsed_data.get("phone", ""),
+                "pdf_path": rec.get("pdf_path"),
+                "total_experience_years": parsed_data.get("total_experience_years"),
+                "skills": json.dumps(parsed_data.get("technical_skills", [])),
+                "parsed_data": json.dumps(parsed_data),
+                "doc_type": "summary",
+                # Lets deletes address every doc of a candidate by id.
+                "exp_count": exp_count,
             }
-            exp_meta = self._clean_metadata(exp_meta)
+            ids.append(str(candidate_id))
+            vectors.append(embeddings["summary"])
+            metadatas.append(self._clean_metadata(summary_meta))
+            documents.append(self._create_summary_text(parsed_data))
 
-            self.collection.add(
-                ids=[exp_id],
-                embeddings=[exp_embedding],
-                metadatas=[exp_meta],
-                documents=[self._create_experience_text(exp)],
-            )
+            for idx, (exp, exp_embedding) in enumerate(
+                zip(experiences, embeddings.get("experiences") or [])
+            ):
+                exp_meta = {
+                    "candidate_pk": candidate_id,
+                    "candidate_name": parsed_data.get("candidate_name"),
+                    "company": exp.get("company_name"),
+                    "job_title": exp.get("job_title"),
+                    "duration_months": exp.get("duration_months"),
+                    "doc_type": "experience",
+                }
+                ids.append(f"{candidate_id}_exp_{idx}")
+                vectors.append(exp_embedding)
+                metadatas.append(self._clean_metadata(exp_meta))
+                documents.append(self._create_experience_text(exp))
+
+        if not ids:
+            return 0
+
+        # Drop experience docs beyond the new count (resume got shorter).
+        stale_ids, unknown = self._doc_ids_for(list(exp_counts), keep=exp_counts)
+        if stale_ids:
+            self.collection.delete(ids=stale_ids)
+        for start in range(0, len(unknown), chunk_size):
+            self.collection.delete(where={"$and": [
+                {"candidate_pk": {"$in": unknown[start:start + chunk_size]}},
+                {"doc_type": "experience"},
+            ]})
+
+        upsert_chunked(self.collection, ids, vectors, metadatas, documents, chunk_size)
+        return len(ids)
 
     def semantic_search(
         self,
@@ -98,6 +235,7 @@ class VectorDatabase:
         if not metadatas or not metadatas[0]:
             return []
 
+        space = self.space
         hits = []
         for i, meta in enumerate(metadatas[0]):
             if not meta:
@@ -110,9 +248,12 @@ class VectorDatabase:
             if candidate_ids and int(cand_pk) not in candidate_ids:
                 continue
             
+            distance = float(distances[0][i])
             hits.append({
                 "candidate_id": int(cand_pk),
-                "score": float(distances[0][i]),
+                "score": distance,  # raw distance, kept for older callers
+                "distance": distance,
+                "similarity": distance_to_similarity(distance, space),
             })
         
         print(f"✓ Filtered to {len(hits)} results")
@@ -151,15 +292,76 @@ class VectorDatabase:
         }
 
     def delete_candidate(self, candidate_id: int):
-        cid = str(candidate_id)
-        self.collection.delete(ids=[cid])
-        all_docs = self.collection.get(include=[])
-        exp_ids = [
-            doc_id for doc_id in all_docs.get("ids", [])
-            if doc_id.startswith(f"{cid}_exp_")
-        ]
-        if exp_ids:
-            self.collection.delete(ids=exp_ids)
+        """Delete a candidate's summary and experience docs (ids resolved from exp_count, see delete_candidates)."""
+        self.delete_candidates([candidate_id])
+
+    def delete_candidates(self, candidate_ids: List[int], chunk_size: int = UPSERT_CHUNK_SIZE):
+        """
+        Delete all docs for many candidates.
+
+        Summary docs record how many experience docs a candidate has
+        (`exp_count`), so every doc id is known up front and the delete is a
+        by-id lookup whose cost does not depend on the collection size.
+        Candidates written before exp_count existed fall back to a
+        `candidate_pk $in [...]` metadata filter.
+        """
+        ids = [int(cid) for cid in candidate_ids if cid is not None]
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            doc_ids, unknown = self._doc_ids_for(chunk)
+            if doc_ids:
+                self.collection.delete(ids=doc_ids)
+            if unknown:
+                # Docs written by index_candidates carry "id" instead of candidate_pk.
+                self.collection.delete(where={"$or": [
+                    {"candidate_pk": {"$in": unknown}},
+                    {"id": {"$in": unknown}},
+                ]})
+
+    def _doc_ids_for(self, candidate_ids: List[int], keep: Optional[Dict[int, int]] = None):
+        """
+        Resolve doc ids for candidates from their summary docs' exp_count.
+
+        With `keep` ({candidate_id: n}), only experience ids at index >= n are
+        returned (summary and the first n experiences are kept).
+        Returns (doc_ids, candidate ids whose docs could not be resolved).
+        """
+        if not candidate_ids:
+            return [], []
+        found = self.collection.get(ids=[str(cid) for cid in candidate_ids], include=["metadatas"])
+
+        exp_counts: Dict[int, Optional[int]] = {}
+        for doc_id, meta in zip(found.get("ids") or [], found.get("metadatas") or []):
+            count = (meta or {}).get("exp_count")
+            exp_counts[int(doc_id)] = int(count) if isinstance(count, (int, float)) else None
+
+        doc_ids: List[str] = []
+        unknown: List[int] = []
+        for cid in candidate_ids:
+            if cid not in exp_counts:
+                if keep is None:
+                    unknown.append(cid)  # no summary doc: may still have stray docs
+                continue
+            count = exp_counts[cid]
+            if count is None:
+                unknown.append(cid)
+                continue
+            if keep is None:
+                doc_ids.append(str(cid))
+                doc_ids.extend(f"{cid}_exp_{idx}" for idx in range(count))
+            else:
+                doc_ids.extend(f"{cid}_exp_{idx}" for idx in range(keep.get(cid, 0), count))
+        return doc_ids, unknown
+
+    def candidate_texts(self, parsed_data: dict) -> List[str]:
+        """Texts embedded for a candidate: summary first, then one per work experience."""
+        texts = [self._create_summary_text(parsed_data)]
+        texts.extend(
+            self._create_experience_text(exp)
+            for exp in (parsed_data.get("work_experiences") or [])
+            if isinstance(exp, dict)
+        )
+        return texts
 
     def _create_summary_text(self, parsed_data: dict) -> str:
         """Create rich summary text for embedding - ✅ FIXED"""
@@ -246,8 +448,15 @@ class VectorDatabase:
                 cleaned[k] = str(v)
         return cleaned
 
-    def clear_all(self):
-        """Delete all documents from the collection"""
-        ids = self.collection.get(include=[]).get("ids", [])
-        if ids:
+    def clear_all(self, chunk_size: int = UPSERT_CHUNK_SIZE):
+        """
+        Delete all documents, a page of ids at a time (never the whole id
+        list in memory). The collection itself is kept, so collection
+        handles cached by other processes stay valid.
+        """
+        while True:
+            ids = self.collection.get(limit=chunk_size, include=[]).get("ids") or []
+            if not ids:
+                break
             self.collection.delete(ids=ids)
+        return self.collection
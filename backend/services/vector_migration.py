@@ -0,0 +1,224 @@
+"""
+Online migration of pre-unification vector stores into VECTOR_DB_PATH.
+
+Before the store was unified there were two on-disk layouts:
+
+  chroma_db_v2/resumes  "candidate_docs": summary "<id>" + "<id>_exp_<n>" docs,
+                         Chroma's default L2 space (the old VectorDatabase)
+  chroma_db/resumes     "raw_text": one "resume_<id>" doc of raw resume text,
+                         cosine (the old /api/rebuild-chroma)
+
+migrate_legacy_stores() copies candidate_docs vectors as-is (same model,
+unit-length vectors, so only the index metric changes), in pages, skipping
+candidates the unified store already has from newer writes. raw_text vectors
+embed different text and cannot be reused; any SQL candidate still missing
+afterwards is re-embedded via index_all_candidates(only_missing=True).
+
+Progress is kept in <VECTOR_DB_PATH>/store_meta.json, so an interrupted run
+resumes from the last copied page and a finished one is never repeated.
+The service keeps serving from the unified store while this runs.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from services.model_registry import get_chroma_client
+from services.vector_db import VECTOR_SCHEMA_VERSION, VectorDatabase, upsert_chunked
+
+LEGACY_STORES = (
+    # (path, collection, layout)
+    ("chroma_db_v2", "resumes", "candidate_docs"),
+    ("chroma_db", "resumes", "raw_text"),
+)
+
+MIGRATION_PAGE_SIZE = 500
+STORE_META_FILE = "store_meta.json"
+
+_meta_lock = threading.Lock()
+_migration_thread: Optional[threading.Thread] = None
+
+
+# ------------------------- STATE FILE ------------------------- #
+
+def _meta_path(vector_db: VectorDatabase) -> str:
+    return os.path.join(vector_db.path, STORE_META_FILE)
+
+
+def load_store_meta(vector_db: VectorDatabase) -> Dict:
+    try:
+        with open(_meta_path(vector_db), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_store_meta(vector_db: VectorDatabase, meta: Dict):
+    os.makedirs(vector_db.path, exist_ok=True)
+    tmp = _meta_path(vector_db) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, _meta_path(vector_db))
+
+
+def _update_store_meta(vector_db: VectorDatabase, key: str, **fields) -> Dict:
+    with _meta_lock:
+        meta = load_store_meta(vector_db)
+        meta.update({
+            "schema_version": VECTOR_SCHEMA_VERSION,
+            "collection": vector_db.collection_name,
+            "space": vector_db.space,
+        })
+        meta.setdefault("migrations", {}).setdefault(key, {}).update(fields)
+        _save_store_meta(vector_db, meta)
+        return meta
+
+
+def migration_status(vector_db: VectorDatabase) -> Dict:
+    meta = load_store_meta(vector_db)
+    return {
+        "store": vector_db.info(),
+        "migrations": meta.get("migrations", {}),
+        "running": bool(_migration_thread and _migration_thread.is_alive()),
+    }
+
+
+# ------------------------- MIGRATION ------------------------- #
+
+def _open_legacy_collection(path: str, name: str):
+    if not os.path.isdir(path):
+        return None
+    try:
+        return get_chroma_client(path).get_collection(name)
+    except Exception as e:
+        # Missing collection, or a store written by an incompatible Chroma.
+        print(f"⚠️ Legacy vector store {path}/{name} not readable: {e}")
+        return None
+
+
+def _copy_candidate_docs(vector_db: VectorDatabase, source, key: str, page_size: int) -> Dict:
+    state = load_store_meta(vector_db).get("migrations", {}).get(key, {})
+    offset = int(state.get("offset", 0))
+    copied = int(state.get("copied", 0))
+    skipped = int(state.get("skipped", 0))
+    total = source.count()
+    target = vector_db.collection
+
+    while offset < total:
+        page = source.get(
+            offset=offset,
+            limit=page_size,
+            include=["embeddings", "metadatas", "documents"],
+        )
+        ids = page.get("ids") or []
+        if not ids:
+            break
+
+        # Candidates the unified store already holds natively are newer than
+        # anything in the legacy store: leave them alone.
+        cand_ids = {
+            int(meta["candidate_pk"])
+            for meta in (page.get("metadatas") or [])
+            if meta and meta.get("candidate_pk") is not None
+        }
+        existing = target.get(ids=[str(cid) for cid in cand_ids], include=["metadatas"]) if cand_ids else {}
+        native = {
+            int(doc_id)
+            for doc_id, meta in zip(existing.get("ids") or [], existing.get("metadatas") or [])
+            if not (meta or {}).get("migrated_from")
+        }
+
+        out_ids, out_vecs, out_metas, out_docs = [], [], [], []
+        for doc_id, vec, meta, doc in zip(
+            ids, page["embeddings"], page["metadatas"], page.get("documents") or [None] * len(ids)
+        ):
+            meta = dict(meta or {})
+            cand_pk = meta.get("candidate_pk")
+            # Docs without candidate_pk come from the old index_candidates
+            # script; the backfill re-embeds those candidates properly.
+            if cand_pk is None or int(cand_pk) in native:
+                skipped += 1
+                continue
+            meta["migrated_from"] = key
+            out_ids.append(doc_id)
+            out_vecs.append(vec)
+            out_metas.append(meta)
+            out_docs.append(doc or "")
+
+        if out_ids:
+            upsert_chunked(target, out_ids, out_vecs, out_metas, out_docs)
+            copied += len(out_ids)
+
+        offset += len(ids)
+        _update_store_meta(vector_db, key, offset=offset, copied=copied, skipped=skipped, total=total)
+        print(f"  ... {key}: {offset}/{total} scanned, {copied} copied")
+
+    return {"offset": offset, "copied": copied, "skipped": skipped, "total": total}
+
+
+def migrate_legacy_stores(
+    vector_db: Optional[VectorDatabase] = None,
+    pipeline=None,
+    page_size: int = MIGRATION_PAGE_SIZE,
+    backfill: bool = True,
+) -> Dict:
+    """
+    Bring every legacy store into `vector_db` (default: the shared pipeline's).
+    Backfilling from SQL needs an app context; pass backfill=False without one.
+    """
+    if pipeline is None and (vector_db is None or backfill):
+        from services.model_registry import get_pipeline
+        pipeline = get_pipeline()
+    vector_db = vector_db or pipeline.vector_db
+    target_path = os.path.abspath(vector_db.path)
+    done = load_store_meta(vector_db).get("migrations", {})
+    report = {}
+
+    for path, name, layout in LEGACY_STORES:
+        key = f"{path}/{name}"
+        if os.path.abspath(path) == target_path or done.get(key, {}).get("finished_at"):
+            continue
+        source = _open_legacy_collection(path, name)
+        if source is None:
+            continue
+
+        print(f"🚚 Migrating legacy vector store {key} ({layout})")
+        if layout == "candidate_docs":
+            result = _copy_candidate_docs(vector_db, source, key, page_size)
+        else:
+            result = {"copied": 0, "skipped": source.count(), "note": "re-embedded from SQL"}
+        _update_store_meta(vector_db, key, layout=layout, finished_at=time.time(), **result)
+        report[key] = result
+
+    # Re-run the backfill only when something changed since it last finished.
+    if backfill and (report or not done.get("sql_backfill", {}).get("finished_at")):
+        from services.index_candidates import index_all_candidates
+
+        written = index_all_candidates(pipeline=pipeline, only_missing=True)
+        _update_store_meta(vector_db, "sql_backfill", written=written, finished_at=time.time())
+        report["sql_backfill"] = {"written": written}
+
+    print(f"✅ Vector store migration finished: {report}")
+    return report
+
+
+def start_background_migration(app, pipeline_factory) -> Optional[threading.Thread]:
+    """Run migrate_legacy_stores once per process on a daemon thread."""
+    global _migration_thread
+    with _meta_lock:
+        if _migration_thread is not None:
+            return _migration_thread
+
+        def _run():
+            try:
+                with app.app_context():
+                    migrate_legacy_stores(pipeline=pipeline_factory())
+            except Exception as e:
+                import traceback
+                print(f"❌ Vector store migration failed: {e}")
+                traceback.print_exc()
+
+        _migration_thread = threading.Thread(target=_run, name="vector-migration", daemon=True)
+        _migration_thread.start()
+    return _migration_thread
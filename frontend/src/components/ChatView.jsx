@@ -3,6 +3,7 @@ import TeamManagementPanel from "./TeamManagementPanel"
 import RankingTable from "./RankingTable"
 import SkillsCategorizedDisplay from "./SkillsCategorizedDisplay"
 import FilterHelper from "./FilterHelper"
+import { waitForUploadJob } from "../services/api"
 
 import LLM_RankingPanel from "./LLM_RankingPanel"
 
@@ -550,8 +551,9 @@ export default function ChatView({
                       body: formData,
                     },
                   )
-                  const data = await res.json()
-                  if (!res.ok) throw new Error(data.error || "Upload failed")
+                  const job = await res.json()
+                  if (!res.ok) throw new Error(job.error || "Upload failed")
+                  const data = await waitForUploadJob(job)
 
                   const successful = data.successful ?? files.length
                   const failed = data.failed ?? 0
@@ -147,25 +147,23 @@ export default function FilterHelper({ setMessages }) {
   const [certifications, setCertifications] = useState([])
   const [buckets, setBuckets] = useState([])
   const [roles, setRoles] = useState([])
+  const [matchCount, setMatchCount] = useState(null)
 
   useEffect(() => {
     if (!open) return
 
     const load = async () => {
       try {
-        const [p, s, c, b, r] = await Promise.all([
-          fetch("http://localhost:5050/api/filter-options/projects").then((x) => x.json()),
-          fetch("http://localhost:5050/api/filter-options/skills").then((x) => x.json()),
-          fetch("http://localhost:5050/api/filter-options/certifications").then((x) => x.json()),
-          fetch("http://localhost:5050/api/filter-options/buckets").then((x) => x.json()),
-          fetch("http://localhost:5050/api/filter-options/roles").then((x) => x.json()),
-        ])
-
-        setProjects(Array.isArray(p) ? p : [])
-        setSkills(Array.isArray(s) ? s : [])
-        setCertifications(Array.isArray(c) ? c : [])
-        setBuckets(Array.isArray(b) ? b : [])
-        setRoles(Array.isArray(r) ? r : [])
+        // One request for every list; unchanged lists come back as 304 from the browser cache.
+        const res = await fetch("http://localhost:5050/api/filter-options").then((x) => x.json())
+        const facets = res?.facets || {}
+        const values = (name) => (Array.isArray(facets[name]) ? facets[name].map((o) => o.value) : [])
+
+        setProjects(values("project"))
+        setSkills(values("skill"))
+        setCertifications(values("certification"))
+        setBuckets(values("bucket"))
+        setRoles(values("role"))
       } catch (e) {
         setProjects([])
         setSkills([])
@@ -180,6 +178,35 @@ export default function FilterHelper({ setMessages }) {
 
   const builtA = useMemo(() => buildFilter(rowA), [rowA])
   const builtB = useMemo(() => buildFilter(rowB), [rowB])
+  // Live matched count for the current selection (facet-count API), debounced while typing.
+  useEffect(() => {
+    const filters = [builtA, builtB].filter(Boolean)
+    if (!open || !filters.length) {
+      setMatchCount(null)
+      return
+    }
+
+    let cancelled = false
+    const timer = setTimeout(async () => {
+      try {
+        const res = await fetch("http://localhost:5050/api/candidates/filter/facets", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ op, filters, limit: 1 }),
+        })
+        const data = await res.json()
+        if (!cancelled) setMatchCount(res.ok && typeof data.matched === "number" ? data.matched : null)
+      } catch (e) {
+        if (!cancelled) setMatchCount(null)
+      }
+    }, 300)
+
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
+    }
+  }, [open, op, builtA, builtB])
+
   const canRun = useMemo(() => {
     const filters = [builtA, builtB].filter(Boolean)
     return filters.length > 0 && !loading
@@ -500,7 +527,12 @@ export default function FilterHelper({ setMessages }) {
               />
             </div>
 
-            <div className="flex justify-end gap-3">
+            <div className="flex justify-end items-center gap-3">
+              {matchCount !== null && (
+                <span className="mr-auto text-sm font-semibold text-emerald-800">
+                  {matchCount} candidate{matchCount === 1 ? "" : "s"} match
+                </span>
+              )}
               <button
                 onClick={clearAll}
                 className="px-5 py-2.5 rounded-xl border-2 border-emerald-200 text-emerald-800 hover:bg-emerald-50 font-semibold text-sm transition-all hover:scale-105 active:scale-95 hover:border-emerald-300"
@@ -10,6 +10,7 @@ import CandidatesPage from "../components/CandidatesPage"
 import ProjectsPage from "../components/ProjectsPage"
 import ProjectTreeModal from "../components/ProjectTreeModal"
 import JDUpload from "./JDUpload"
+import { waitForUploadJob } from "../services/api"
 
 export default function Chat() {
   const location = useLocation()
@@ -299,8 +300,13 @@ export default function Chat() {
         method: "POST",
         body: formData,
       })
-      const data = await res.json()
-      if (!res.ok) throw new Error(data.error || "Upload failed")
+      const job = await res.json()
+      if (!res.ok) throw new Error(job.error || "Upload failed")
+      setUploadStatus(`⏳ Processing ${selectedFiles.length} resumes...`)
+      const data = await waitForUploadJob(job, {
+        onProgress: (p) =>
+          setUploadStatus(`⏳ Processing resumes: ${p.successful + p.failed}/${p.total} done...`),
+      })
       setUploadStatus(
         `✅ Uploaded ${selectedFiles.length} resumes. Parsed ${
           data.successful || 0
@@ -213,6 +213,25 @@ export async function batchUploadResumes(files) {
   return res.json();
 }
 
+// /api/upload-resumes answers 202 with a job handle; poll it until the
+// background ingestion finishes and return the final job summary.
+export async function waitForUploadJob(job, { intervalMs = 2000, onProgress } = {}) {
+  let current = job;
+  while (current && current.job_id && !["completed", "failed"].includes(current.status)) {
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    const res = await fetch(`${API_BASE}/api/ingest/jobs/${current.job_id}`, {
+      credentials: 'include',
+    });
+    if (!res.ok) {
+      const err = await res.json().catch(() => ({}));
+      throw new Error(err.error || "Failed to fetch upload status");
+    }
+    current = await res.json();
+    if (onProgress) onProgress(current);
+  }
+  return current;
+}
+
 export async function semanticSearch(jobDescription, options = {}) {
   const body = {
     job_description: jobDescription,
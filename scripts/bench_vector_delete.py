@@ -0,0 +1,102 @@
+"""
+Benchmark VectorDatabase.delete_candidate as the collection grows.
+
+Fills a throwaway Chroma store with N candidates (1 summary + EXP experience
+docs each), then times deleting a handful of candidates with:
+
+  - legacy: list every id in the collection and prefix-filter (old behaviour)
+  - indexed: VectorDatabase.delete_candidate (doc ids resolved from exp_count)
+
+Usage (from the repo root):
+    python scripts/bench_vector_delete.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from services.vector_db import VectorDatabase  # noqa: E402
+
+DIM = 32
+EXP_PER_CANDIDATE = 3
+
+
+def _fill(vdb, n_docs: int):
+    n_candidates = max(1, n_docs // (1 + EXP_PER_CANDIDATE))
+    batch = []
+    for cid in range(1, n_candidates + 1):
+        batch.append({
+            "candidate_id": cid,
+            "parsed_data": {
+                "candidate_name": f"Candidate {cid}",
+                "work_experiences": [{"job_title": f"Job {i}"} for i in range(EXP_PER_CANDIDATE)],
+            },
+            "embeddings": {
+                "summary": [random.random() for _ in range(DIM)],
+                "experiences": [[random.random() for _ in range(DIM)] for _ in range(EXP_PER_CANDIDATE)],
+            },
+            "pdf_path": "",
+        })
+        if len(batch) == 1000:
+            vdb.upsert_candidates(batch, chunk_size=5000)
+            batch = []
+    if batch:
+        vdb.upsert_candidates(batch, chunk_size=5000)
+    return n_candidates
+
+
+def _legacy_delete(collection, candidate_id: int):
+    cid = str(candidate_id)
+    collection.delete(ids=[cid])
+    all_docs = collection.get(include=[])
+    exp_ids = [doc_id for doc_id in all_docs.get("ids", []) if doc_id.startswith(f"{cid}_exp_")]
+    if exp_ids:
+        collection.delete(ids=exp_ids)
+
+
+def bench(size: int, deletes: int):
+    tmp = tempfile.mkdtemp(prefix="bench_chroma_")
+    try:
+        vdb = VectorDatabase(path=tmp)
+        collection = vdb.collection
+        n_candidates = _fill(vdb, size)
+
+        victims = random.sample(range(1, n_candidates + 1), min(2 * deletes, n_candidates))
+        legacy_ids, indexed_ids = victims[:deletes], victims[deletes:]
+
+        start = time.perf_counter()
+        for cid in legacy_ids:
+            _legacy_delete(collection, cid)
+        legacy_ms = (time.perf_counter() - start) * 1000 / max(1, len(legacy_ids))
+
+        start = time.perf_counter()
+        for cid in indexed_ids:
+            vdb.delete_candidate(cid)
+        indexed_ms = (time.perf_counter() - start) * 1000 / max(1, len(indexed_ids))
+
+        left = collection.get(where={"candidate_pk": {"$in": victims}}, include=[])["ids"]
+        assert not left, f"documents left behind: {left[:5]}"
+
+        print(f"{collection.count() + len(victims) * (1 + EXP_PER_CANDIDATE):>8} docs | "
+              f"legacy {legacy_ms:8.2f} ms/delete | indexed {indexed_ms:8.2f} ms/delete")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--deletes", type=int, default=10, help="deletes timed per method")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        bench(size, args.deletes)
+
+
+if __name__ == "__main__":
+    main()